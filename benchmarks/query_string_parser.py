@@ -0,0 +1,98 @@
+"""Microbenchmark of parsing of query string of `paginate` to SQLAlchemy statement.
+
+Compares validation by `PaginateSchema` and `SQLJSONSchema` with the compiled `QueryStringParser`.
+
+Usage:
+    python benchmarks/query_string_parser.py --repeat 20000
+"""
+
+import argparse
+from time import perf_counter
+from uuid import UUID
+from uuid import uuid4
+
+from db_first.base_model import ModelMixin
+from db_first.dbal.query_parser import QueryStringParser
+from db_first.schemas import PaginateSchema
+from db_first.statement_maker import StatementMaker
+from sqlalchemy.orm import declarative_base
+from sqlalchemy.orm import Mapped
+from sqlalchemy.orm import mapped_column
+
+Base = declarative_base()
+
+
+class Items(ModelMixin, Base):
+    __tablename__ = 'bench_items'
+
+    title: Mapped[str] = mapped_column()
+    price: Mapped[int] = mapped_column()
+    owner_id: Mapped[UUID] = mapped_column()
+
+
+QUERY_STRING = {
+    'page': '2',
+    'per_page': '50',
+    'ge__price': '10',
+    'le__price': '1000',
+    'eq__owner_id': str(uuid4()),
+    'contain__title': 'book',
+    'sort__created_at': 'desc',
+}
+
+
+def schema_path(params: dict[str, str]) -> None:
+    data = PaginateSchema().load(params)
+    page, per_page = data.pop('page'), data.pop('per_page')
+    order_by, filters = [], []
+    for name, value in data.items():
+        prefix, col = name.split('__', 1)
+        if prefix == 'sort':
+            order_by.append({'col': col, 'opr': value})
+        else:
+            opr = 'ilike' if prefix == 'contain' else prefix
+            filters.append({'col': col, 'opr': opr, 'value': value})
+
+    StatementMaker(
+        Items, where={'and': filters}, order_by=order_by, limit=per_page, offset=page * per_page
+    ).make_stmt()
+
+
+def compiled_path(parser: QueryStringParser, params: dict[str, str]) -> None:
+    params = dict(params)
+    page, per_page = int(params.pop('page')), int(params.pop('per_page'))
+    order_by, filters = parser.parse(params)
+
+    StatementMaker(
+        Items,
+        where={'and': filters},
+        order_by=order_by,
+        limit=per_page,
+        offset=page * per_page,
+        validate=False,
+    ).make_stmt()
+
+
+def measure(fn, repeat: int) -> float:
+    started_at = perf_counter()
+    for _ in range(repeat):
+        fn()
+    return (perf_counter() - started_at) / repeat * 1_000_000
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--repeat', type=int, default=10_000)
+    args = parser.parse_args()
+
+    query_parser = QueryStringParser(Items)
+    results = {
+        'schemas': measure(lambda: schema_path(QUERY_STRING), args.repeat),
+        'compiled parser': measure(lambda: compiled_path(query_parser, QUERY_STRING), args.repeat),
+    }
+    for name, us in results.items():
+        print(f'{name}: {us:,.1f} us per query string')
+
+
+if __name__ == '__main__':
+    main()
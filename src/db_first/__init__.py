@@ -1,5 +1,22 @@
-from db_first.base_model import ModelMixin
-from db_first.dbal import SqlaDBAL
-from db_first.statement_maker import StatementMaker
+from typing import TYPE_CHECKING
 
-__all__ = ['ModelMixin', 'SqlaDBAL', 'StatementMaker']
+from db_first._lazy import lazy_attributes
+
+if TYPE_CHECKING:
+    from db_first.base_model import ModelMixin
+    from db_first.base_model import SoftDeleteMixin
+    from db_first.base_model import VersionMixin
+    from db_first.dbal import SqlaDBAL
+    from db_first.statement_maker import StatementMaker
+
+__all__ = ['ModelMixin', 'SoftDeleteMixin', 'SqlaDBAL', 'StatementMaker', 'VersionMixin']
+
+_lazy_imports = {
+    'ModelMixin': 'db_first.base_model',
+    'SoftDeleteMixin': 'db_first.base_model',
+    'SqlaDBAL': 'db_first.dbal',
+    'StatementMaker': 'db_first.statement_maker',
+    'VersionMixin': 'db_first.base_model',
+}
+
+__getattr__, __dir__ = lazy_attributes(globals(), _lazy_imports)
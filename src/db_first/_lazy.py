@@ -0,0 +1,29 @@
+from collections.abc import Callable
+from importlib import import_module
+from typing import Any
+
+
+def lazy_attributes(
+    namespace: dict[str, Any], lazy_imports: dict[str, str]
+) -> tuple[Callable[[str], Any], Callable[[], list[str]]]:
+    """Make module `__getattr__` and `__dir__` importing public names on first access.
+
+    :param namespace: Globals of package.
+    :param lazy_imports: Modules of public names by name.
+    :return: Functions `__getattr__` and `__dir__` of package.
+    """
+
+    def __getattr__(name: str) -> Any:
+        try:
+            module = lazy_imports[name]
+        except KeyError:
+            raise AttributeError(f'module {namespace["__name__"]!r} has no attribute {name!r}')
+
+        value = getattr(import_module(module), name)
+        namespace[name] = value
+        return value
+
+    def __dir__() -> list[str]:
+        return sorted({*namespace, *namespace['__all__']})
+
+    return __getattr__, __dir__
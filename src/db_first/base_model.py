@@ -1,8 +1,15 @@
 import uuid
+from collections.abc import Callable
 from datetime import datetime
 from datetime import timezone
+from os import urandom
+from threading import Lock
+from time import time_ns
 
 from sqlalchemy import DateTime
+from sqlalchemy import Index
+from sqlalchemy import text
+from sqlalchemy.orm import declared_attr
 from sqlalchemy.orm import Mapped
 from sqlalchemy.orm import mapped_column
 from sqlalchemy.orm import validates
@@ -12,16 +19,92 @@ def make_uuid4() -> uuid.UUID:
     return uuid.uuid4()
 
 
+class _UUID7Generator:
+    """Generator of monotonic UUIDv7 (RFC 9562).
+
+    48 bits of Unix time in milliseconds are followed by 12 bits of counter and 62 random bits. The
+    counter starts from random value every millisecond and is incremented for UUIDs generated in the
+    same millisecond, so UUIDs are sorted in order of generation within process.
+    """
+
+    _version_and_variant = (0x7 << 76) | (0b10 << 62)
+    _rand_b_mask = (1 << 62) - 1
+
+    def __init__(self) -> None:
+        self._lock = Lock()
+        self._last_ms = 0
+        self._counter = 0
+
+    def __call__(self) -> uuid.UUID:
+        random_bits = int.from_bytes(urandom(10))
+        timestamp_ms = time_ns() // 1_000_000
+
+        with self._lock:
+            if timestamp_ms > self._last_ms:
+                self._counter = random_bits >> 69
+            else:
+                timestamp_ms = self._last_ms
+                self._counter += 1
+                if self._counter > 0xFFF:
+                    timestamp_ms += 1
+                    self._counter = 0
+            self._last_ms = timestamp_ms
+            counter = self._counter
+
+        value = (
+            (timestamp_ms << 80)
+            | (counter << 64)
+            | (random_bits & self._rand_b_mask)
+            | self._version_and_variant
+        )
+        return uuid.UUID(int=value)
+
+
+make_uuid7 = _UUID7Generator()
+
+
+def uuid7_from_datetime(value: datetime) -> uuid.UUID:
+    """Make the smallest UUIDv7 for time, is used as bound for filtering by id instead of time.
+
+    :param value: Datetime with timezone.
+    :return: UUIDv7 with zero counter and random bits.
+    """
+
+    timestamp_ms = int(value.timestamp() * 1000)
+    return uuid.UUID(int=(timestamp_ms << 80) | _UUID7Generator._version_and_variant)
+
+
+def uuid7_to_datetime(value: uuid.UUID) -> datetime:
+    """Extract time of generation from UUIDv7.
+
+    :param value: UUIDv7.
+    :return: Datetime with UTC timezone and precision to milliseconds.
+    """
+
+    if value.version != 7:
+        raise ValueError(f'UUID <{value}> must be version 7.')
+
+    return datetime.fromtimestamp((value.int >> 80) / 1000, tz=timezone.utc)
+
+
 def make_datetime_with_utc() -> datetime:
     return datetime.now(timezone.utc)
 
 
 class ModelMixin:
-    """Mixin for table model."""
+    """Mixin for table model.
+
+    Generator of `id` is set in `_id_generator`, use `make_uuid7` for time-ordered keys.
+    """
+
+    _id_generator: Callable[[], uuid.UUID] = make_uuid4
+
+    @declared_attr
+    def id(cls) -> Mapped[uuid.UUID]:
+        return mapped_column(
+            primary_key=True, nullable=False, default=cls._id_generator, comment='UUID'
+        )
 
-    id: Mapped[uuid.UUID] = mapped_column(
-        primary_key=True, nullable=False, default=make_uuid4, comment='UUID'
-    )
     created_at: Mapped[datetime] = mapped_column(
         DateTime(timezone=True),
         nullable=False,
@@ -46,3 +129,54 @@ class ModelMixin:
     @validates('created_at', 'updated_at')
     def validate_timezone(self, key, value) -> datetime:
         return self.validate_utc_timezone(key, value)
+
+    @staticmethod
+    def change_feed_index(name: str, **kwargs) -> Index:
+        """Make index for change feed of DBAL, use it in `__table_args__` of model.
+
+        :param name: Name of index.
+        :param kwargs: Other arguments of `sqlalchemy.Index`.
+        :return: Index by `coalesce(updated_at, created_at)` and `id`.
+        """
+
+        return Index(name, text('coalesce(updated_at, created_at)'), 'id', **kwargs)
+
+
+class SoftDeleteMixin:
+    """Mixin for table model with soft deletion.
+
+    Deleted rows have filled `deleted_at` and are hidden by DBAL read methods and pagination.
+    """
+
+    deleted_at: Mapped[datetime | None] = mapped_column(
+        DateTime(timezone=True), comment='Date and time deleted'
+    )
+
+    @staticmethod
+    def live_index(name: str, *columns: str, **kwargs) -> Index:
+        """Make partial index only for live rows, use it in `__table_args__` of model.
+
+        :param name: Name of index.
+        :param columns: Names of indexed columns.
+        :param kwargs: Other arguments of `sqlalchemy.Index`.
+        :return: Index with condition `deleted_at IS NULL`.
+        """
+
+        where = text('deleted_at IS NULL')
+        return Index(name, *columns, postgresql_where=where, sqlite_where=where, **kwargs)
+
+    @validates('deleted_at')
+    def validate_deleted_at(self, key, value) -> datetime | None:
+        if value is None:
+            return value
+
+        return ModelMixin.validate_utc_timezone(key, value)
+
+
+class VersionMixin:
+    """Mixin for table model with optimistic concurrency control.
+
+    DBAL update methods increment `version` and check it if version is passed.
+    """
+
+    version: Mapped[int] = mapped_column(nullable=False, default=1, comment='Version of row')
@@ -1,3 +1,12 @@
-from db_first.dbal.sqla import SqlaDBAL
+from typing import TYPE_CHECKING
+
+from db_first._lazy import lazy_attributes
+
+if TYPE_CHECKING:
+    from db_first.dbal.sqla import SqlaDBAL
 
 __all__ = ['SqlaDBAL']
+
+_lazy_imports = {'SqlaDBAL': 'db_first.dbal.sqla'}
+
+__getattr__, __dir__ = lazy_attributes(globals(), _lazy_imports)
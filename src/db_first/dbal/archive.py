@@ -0,0 +1,92 @@
+from collections.abc import Iterator
+from datetime import datetime
+from functools import partial
+from typing import Any
+
+from db_first.base_model import make_datetime_with_utc
+from db_first.base_model import SoftDeleteMixin
+from db_first.expressions import in_list
+from sqlalchemy import Delete
+from sqlalchemy import delete
+from sqlalchemy import insert
+from sqlalchemy import Select
+from sqlalchemy import select
+from sqlalchemy import Update
+from sqlalchemy import update
+
+
+class ArchiveMixin:
+    """Soft deletion and batched archival of rows.
+
+    Soft deletion is enabled for models with `SoftDeleteMixin`.
+    """
+
+    def _is_soft_delete(self) -> bool:
+        return issubclass(self._model, SoftDeleteMixin)
+
+    def _live_filters(self) -> list[Any]:
+        if self._is_soft_delete():
+            return [self._model.deleted_at.is_(None)]
+
+        return []
+
+    def _make_delete_stmt(self) -> Delete | Update:
+        if self._is_soft_delete():
+            return (
+                update(self._model)
+                .where(self._model.deleted_at.is_(None))
+                .values(deleted_at=make_datetime_with_utc())
+            )
+
+        return delete(self._model)
+
+    def purge(
+        self,
+        older_than: datetime | None = None,
+        batch_size: int = 1000,
+        archive_model: type | None = None,
+        pause: float = 0.0,
+    ) -> int:
+        """Delete soft deleted rows by batches, every batch is committed in own short transaction.
+
+        :param older_than: Delete only rows deleted before this time.
+        :param batch_size: Count of rows in one batch.
+        :param archive_model: Model for copying rows before deletion, must have the same columns.
+        :param pause: Pause between batches in seconds.
+        :return: Count of deleted rows.
+        """
+
+        if not self._is_soft_delete():
+            raise NotImplementedError(f'Model <{self._model.__name__}> has no soft deletion.')
+
+        stmt = select(self._model.id).where(self._model.deleted_at.is_not(None))
+        if older_than is not None:
+            stmt = stmt.where(self._model.deleted_at < older_than)
+        stmt = stmt.order_by(self._model.deleted_at).limit(batch_size)
+
+        before_delete = None
+        if archive_model is not None:
+            before_delete = partial(self._archive_rows, archive_model)
+
+        result = self._delete_batches(
+            self._iter_purge_batches(stmt, batch_size),
+            delete(self._model),
+            pause,
+            return_ids=False,
+            count_rows=False,
+            before_delete=before_delete,
+        )
+        return result['count']
+
+    def _iter_purge_batches(self, stmt: Select, batch_size: int) -> Iterator[list[Any]]:
+        while ids := self._session.scalars(stmt).all():
+            yield ids
+            if len(ids) < batch_size:
+                return
+
+    def _archive_rows(self, archive_model: type, ids: list[Any]) -> None:
+        columns = [c for c in self._model.__table__.columns if c.name in archive_model.__table__.c]
+        stmt = select(*columns).where(in_list(self._model.id, ids))
+        self._session.execute(
+            insert(archive_model.__table__).from_select([c.name for c in columns], stmt)
+        )
@@ -0,0 +1,189 @@
+from collections.abc import Callable
+from collections.abc import Iterable
+from collections.abc import Iterator
+from contextlib import contextmanager
+from time import sleep
+from typing import Any
+from uuid import uuid4
+
+from db_first.dbal.prepared import temporary_ddl_option
+from db_first.expressions import in_list
+from db_first.statement_maker import StatementMaker
+from sqlalchemy import Column
+from sqlalchemy import Delete
+from sqlalchemy import insert
+from sqlalchemy import MetaData
+from sqlalchemy import select
+from sqlalchemy import Table
+from sqlalchemy import Update
+from sqlalchemy.schema import CreateTable
+from sqlalchemy.schema import DropTable
+
+
+class BulkMixin:
+    """Strategies for statements with large list of ids.
+
+    The strategy is chosen by count of ids:
+
+    * up to `_in_batch_size` ids - one statement with `IN` (`= ANY(:array)` on PostgreSQL);
+    * up to `_in_temp_table_threshold` ids - batches of `IN` statements, one statement with
+      `= ANY(:array)` on PostgreSQL;
+    * more ids - ids are inserted into temporary table and joined with table of model.
+    """
+
+    _in_batch_size = 500
+    _in_temp_table_threshold = 10_000
+
+    def _is_postgresql(self) -> bool:
+        return self._session.get_bind().dialect.name == 'postgresql'
+
+    def _iter_id_batches(self, ids: list[Any]) -> Iterator[list[Any]]:
+        if len(ids) <= self._in_batch_size or self._is_postgresql():
+            yield ids
+        else:
+            for start in range(0, len(ids), self._in_batch_size):
+                end = start + self._in_batch_size
+                yield ids[start:end]
+
+    @contextmanager
+    def _ids_temp_table(self, ids: list[Any]) -> Iterator[Table]:
+        table = Table(
+            f'_db_first_ids_{uuid4().hex}',
+            MetaData(),
+            Column('id', self._model.id.type, primary_key=True),
+            prefixes=['TEMPORARY'],
+        )
+        connection = self._session.connection()
+        options = {temporary_ddl_option: True}
+        connection.execute(CreateTable(table), execution_options=options)
+        try:
+            connection.execute(insert(table), [{'id': id_} for id_ in ids])
+            yield table
+        finally:
+            connection.execute(DropTable(table), execution_options=options)
+
+    def _read_by_ids(self, ids: list[Any], *where: Any) -> list[Any]:
+        unique_ids = list(dict.fromkeys(ids))
+
+        if len(unique_ids) > self._in_temp_table_threshold:
+            with self._ids_temp_table(unique_ids) as table:
+                stmt = select(self._model).join(table, self._model.id == table.c.id).where(*where)
+                objects = self._session.scalars(stmt).all()
+        else:
+            objects = []
+            for batch in self._iter_id_batches(unique_ids):
+                stmt = select(self._model).where(in_list(self._model.id, batch), *where)
+                objects.extend(self._session.scalars(stmt).all())
+                self._memory_checkpoint()
+
+        objects_by_id = {obj.id: obj for obj in objects}
+        return [objects_by_id[id_] for id_ in unique_ids if id_ in objects_by_id]
+
+    def _delete_by_ids(self, ids: list[Any]) -> None:
+        unique_ids = list(dict.fromkeys(ids))
+
+        if len(unique_ids) > self._in_temp_table_threshold:
+            with self._ids_temp_table(unique_ids) as table:
+                stmt = self._make_delete_stmt().where(self._model.id.in_(select(table.c.id)))
+                self._count_deleted(stmt)
+        else:
+            for batch in self._iter_id_batches(unique_ids):
+                stmt = self._make_delete_stmt().where(in_list(self._model.id, batch))
+                self._count_deleted(stmt)
+
+    def _count_deleted(self, stmt: Any) -> None:
+        if self._counter_cache is None:
+            self._session.execute(stmt)
+            return
+
+        rows = self._session.execute(
+            stmt.returning(self._model.id, *self._counter_returning())
+        ).all()
+        self._change_counters([row._mapping for row in rows], -1)
+
+    def delete_chunked(
+        self,
+        ids: list[Any] | None = None,
+        where: dict[str, Any] | None = None,
+        batch_size: int = 1000,
+        pause: float = 0.0,
+        return_ids: bool = True,
+    ) -> dict[str, Any]:
+        """Delete objects by batches, every batch is committed in own short transaction.
+
+        :param ids: Delete objects with these ids.
+        :param where: Delete objects by filter of `StatementMaker`, e.g.
+         `{'and': [{'col': 'created_at', 'opr': 'lt', 'value': since}]}`.
+        :param batch_size: Count of objects in one batch.
+        :param pause: Pause between batches in seconds.
+        :param return_ids: Collect ids of deleted objects.
+        :return: Ids of deleted objects, count of deleted objects and count of batches.
+        """
+
+        if (ids is None) == (where is None):
+            raise ValueError('One of parameters <ids> or <where> is required.')
+
+        batches = self._iter_delete_batches(ids, where, batch_size)
+        return self._delete_batches(batches, self._make_delete_stmt(), pause, return_ids)
+
+    def _delete_batches(
+        self,
+        batches: Iterable[list[Any]],
+        stmt: Delete | Update,
+        pause: float = 0.0,
+        return_ids: bool = True,
+        count_rows: bool = True,
+        before_delete: Callable[[list[Any]], None] | None = None,
+    ) -> dict[str, Any]:
+        """Run delete statement for batches of ids, every batch is committed in own transaction.
+
+        :param count_rows: Change counters of `CounterCacheMixin` by deleted rows.
+        :param before_delete: Called with ids of batch before deletion, e.g. for archival.
+        """
+
+        returning = [self._model.id]
+        if count_rows:
+            returning.extend(self._counter_returning())
+
+        result = {'ids': [], 'count': 0, 'batches': 0}
+        for batch in batches:
+            if result['batches'] and pause:
+                sleep(pause)
+
+            if before_delete is not None:
+                before_delete(batch)
+
+            batch_stmt = stmt.where(in_list(self._model.id, batch)).returning(*returning)
+            rows = self._session.execute(batch_stmt).all()
+            if count_rows:
+                self._change_counters([row._mapping for row in rows], -1)
+            self._commit()
+            self._invalidate_cache()
+
+            result['batches'] += 1
+            result['count'] += len(rows)
+            if return_ids:
+                result['ids'].extend(row.id for row in rows)
+
+        return result
+
+    def _iter_delete_batches(
+        self, ids: list[Any] | None, where: dict[str, Any] | None, batch_size: int
+    ) -> Iterator[list[Any]]:
+        if ids is not None:
+            unique_ids = list(dict.fromkeys(ids))
+            for start in range(0, len(unique_ids), batch_size):
+                end = start + batch_size
+                yield unique_ids[start:end]
+            return
+
+        stmt = (
+            StatementMaker(self._model, where=where, limit=batch_size)
+            .make_stmt()
+            .with_only_columns(self._model.id)
+            .where(*self._live_filters())
+        )
+        while batch := self._session.scalars(stmt).all():
+            yield batch
+            if len(batch) < batch_size:
+                return
@@ -0,0 +1,286 @@
+import hashlib
+import json
+import os
+import pickle
+import struct
+import tempfile
+from collections import OrderedDict
+from itertools import count
+from pathlib import Path
+from threading import Lock
+from time import monotonic
+from time import time
+from typing import Any
+from uuid import uuid4
+
+from sqlalchemy import event
+from sqlalchemy import inspect
+from sqlalchemy.orm import make_transient_to_detached
+from sqlalchemy.orm import Session
+from sqlalchemy.orm import SessionTransaction
+from sqlalchemy.orm.attributes import set_committed_value
+
+_expires_at = struct.Struct('>d')
+
+_pending_key = 'db_first_cache_pending'
+_written_key = 'db_first_cache_written'
+_listening_key = 'db_first_cache_listening'
+
+
+class LRUCacheBackend:
+    """In-process cache with LRU eviction, it is shared by all threads of process.
+
+    :param max_size: Maximal count of entries.
+    """
+
+    def __init__(self, max_size: int = 1024) -> None:
+        self._max_size = max_size
+        self._entries: OrderedDict[str, tuple[float, bytes]] = OrderedDict()
+        self._generations: dict[str, int] = {}
+        self._counter = count(1)
+        self._lock = Lock()
+
+    def get(self, key: str) -> bytes | None:
+        with self._lock:
+            if (entry := self._entries.get(key)) is None:
+                return None
+
+            expires_at, value = entry
+            if expires_at < monotonic():
+                del self._entries[key]
+                return None
+
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key: str, value: bytes, ttl: float) -> None:
+        with self._lock:
+            self._entries[key] = (monotonic() + ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self._max_size:
+                self._entries.popitem(last=False)
+
+    def get_generation(self, name: str) -> str:
+        with self._lock:
+            return str(self._generations.get(name, 0))
+
+    def bump_generation(self, name: str) -> None:
+        with self._lock:
+            self._generations[name] = next(self._counter)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+class FileCacheBackend:
+    """Cache in files of directory, it is shared by processes of one host.
+
+    Files are replaced atomically, generation is a random token, so concurrent writers never see
+    partially written entries and never lose invalidation.
+
+    Cached pages are unpickled by `CacheMixin`, so the directory must be private: it is created with
+    mode `0o700` and existing directory must be owned by user of process and not be accessible by
+    other users.
+
+    :param directory: Directory for files of cache, it is created if it does not exist.
+    :raise PermissionError: Directory is accessible by other users.
+    """
+
+    def __init__(self, directory: str | Path) -> None:
+        self._directory = Path(directory)
+        self._directory.mkdir(mode=0o700, parents=True, exist_ok=True)
+        self._check_private()
+
+    def _check_private(self) -> None:
+        stat = self._directory.stat()
+        if stat.st_mode & 0o077 or hasattr(os, 'getuid') and stat.st_uid != os.getuid():
+            raise PermissionError(f'Directory of cache <{self._directory}> is not private.')
+
+    def _path(self, key: str) -> Path:
+        return self._directory / hashlib.sha256(key.encode()).hexdigest()
+
+    def _write(self, path: Path, data: bytes) -> None:
+        fd, tmp_path = tempfile.mkstemp(dir=self._directory)
+        with os.fdopen(fd, 'wb') as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+
+    def get(self, key: str) -> bytes | None:
+        path = self._path(key)
+        try:
+            data = path.read_bytes()
+        except FileNotFoundError:
+            return None
+
+        size = _expires_at.size
+        if len(data) < size:
+            return None
+
+        (expires_at,) = _expires_at.unpack_from(data)
+        value = data[size:]
+
+        if expires_at < time():
+            path.unlink(missing_ok=True)
+            return None
+
+        return value
+
+    def set(self, key: str, value: bytes, ttl: float) -> None:
+        self._write(self._path(key), _expires_at.pack(time() + ttl) + value)
+
+    def get_generation(self, name: str) -> str:
+        try:
+            return self._path(f'generation:{name}').read_text()
+        except FileNotFoundError:
+            return '0'
+
+    def bump_generation(self, name: str) -> None:
+        self._write(self._path(f'generation:{name}'), uuid4().hex.encode())
+
+    def clear(self) -> None:
+        for path in self._directory.iterdir():
+            path.unlink(missing_ok=True)
+
+
+def _dump_object(obj: Any, memo: dict[int, int]) -> dict[str, Any]:
+    if id(obj) in memo:
+        return {'ref': memo[id(obj)]}
+    memo[id(obj)] = len(memo)
+
+    state = inspect(obj)
+    column_attrs, relationships = state.mapper.column_attrs, state.mapper.relationships
+    columns, related = {}, {}
+    for key, value in state.dict.items():
+        if key in column_attrs:
+            columns[key] = value
+        elif key not in relationships:
+            continue
+        elif isinstance(value, list):
+            related[key] = [_dump_object(item, memo) for item in value]
+        else:
+            related[key] = None if value is None else _dump_object(value, memo)
+
+    return {'columns': columns, 'related': related}
+
+
+def _load_object(model: type, data: dict[str, Any], objects: list[Any]) -> Any:
+    if 'ref' in data:
+        return objects[data['ref']]
+
+    mapper = inspect(model)
+    obj = mapper.class_manager.new_instance()
+    objects.append(obj)
+    for key, value in data['columns'].items():
+        set_committed_value(obj, key, value)
+    make_transient_to_detached(obj)
+
+    for key, value in data['related'].items():
+        related_model = mapper.relationships[key].mapper.class_
+        if isinstance(value, list):
+            value = [_load_object(related_model, item, objects) for item in value]
+        elif value is not None:
+            value = _load_object(related_model, value, objects)
+        set_committed_value(obj, key, value)
+
+    return obj
+
+
+def dump_result(result: dict[str, Any]) -> dict[str, Any]:
+    """Convert objects in `items` of result to plain data, it can be loaded into other session."""
+
+    memo = {}
+    return {**result, 'items': [_dump_object(obj, memo) for obj in result['items']]}
+
+
+def _on_after_flush(session: Session, flush_context: Any) -> None:
+    session.info[_written_key] = True
+
+
+def _on_after_commit(session: Session) -> None:
+    for name, backend in session.info.pop(_pending_key, {}).items():
+        backend.bump_generation(name)
+
+
+def _on_after_transaction_end(session: Session, transaction: SessionTransaction) -> None:
+    if transaction.parent is None:
+        session.info.pop(_pending_key, None)
+        session.info.pop(_written_key, None)
+
+
+class CacheMixin:
+    """Cache of results of `paginate`.
+
+    Cache is enabled by setting `_cache_backend`. Key of result is name of model, generation of
+    model and SQL as JSON. Every mutator bumps generation of model after commit of transaction, so
+    results cached before mutation are not read anymore and expire by `_cache_ttl`. Cache is not
+    used while session has changes which are not committed, so listeners of session are attached
+    when DBAL with cache or single-flight is made.
+
+    Loaded attributes of objects and their loaded relationships are cached as plain data, on reading
+    objects are merged into session without queries.
+    """
+
+    _cache_backend: LRUCacheBackend | FileCacheBackend | None = None
+    _cache_ttl: float = 60.0
+
+    def _cache_name(self) -> str:
+        return f'{self._model.__module__}.{self._model.__qualname__}'
+
+    def _listen_cache_events(self) -> None:
+        session = self._session
+        if not session.info.get(_listening_key):
+            event.listen(session, 'after_flush', _on_after_flush)
+            event.listen(session, 'after_commit', _on_after_commit)
+            event.listen(session, 'after_transaction_end', _on_after_transaction_end)
+            session.info[_listening_key] = True
+
+    def _has_uncommitted_changes(self) -> bool:
+        """Session has pending changes or changes written in transaction which is not committed."""
+
+        self._listen_cache_events()
+        session = self._session
+        return bool(
+            session.info.get(_written_key) or session.new or session.dirty or session.deleted
+        )
+
+    def _is_cache_usable(self) -> bool:
+        return self._cache_backend is not None and not self._has_uncommitted_changes()
+
+    def _cache_key(self, sql_as_json: dict[str, Any], include_metadata: bool) -> str:
+        name = self._cache_name()
+        query = json.dumps(sql_as_json, sort_keys=True, default=str)
+        generation = self._cache_backend.get_generation(name)
+        return f'{name}:{generation}:{int(include_metadata)}:{query}'
+
+    def _load_result(self, data: dict[str, Any]) -> dict[str, Any]:
+        objects = []
+        items = [_load_object(self._model, item, objects) for item in data['items']]
+        return {**data, 'items': [self._session.merge(obj, load=False) for obj in items]}
+
+    def _cache_get(self, key: str) -> dict[str, Any] | None:
+        if (value := self._cache_backend.get(key)) is None:
+            return None
+
+        # Values are written only by this process or by processes with private directory of cache.
+        return self._load_result(pickle.loads(value))  # nosec B301
+
+    def _cache_set(self, key: str, result: dict[str, Any]) -> None:
+        self._cache_backend.set(key, pickle.dumps(dump_result(result)), self._cache_ttl)
+
+    def _invalidate_cache(self) -> None:
+        """Bump generation of model, inside of transaction it is bumped after commit.
+
+        Writes are tracked only in sessions which are used by DBAL with cache or single-flight.
+        """
+
+        if not self._session.info.get(_listening_key):
+            return
+
+        if self._session.in_transaction():
+            self._session.info[_written_key] = True
+            if self._cache_backend is not None:
+                pending = self._session.info.setdefault(_pending_key, {})
+                pending[self._cache_name()] = self._cache_backend
+        elif self._cache_backend is not None:
+            self._cache_backend.bump_generation(self._cache_name())
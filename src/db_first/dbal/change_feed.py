@@ -0,0 +1,81 @@
+from collections.abc import Iterator
+from datetime import datetime
+from datetime import timedelta
+from typing import Any
+from typing import NamedTuple
+
+from db_first.base_model import make_datetime_with_utc
+from sqlalchemy import func
+from sqlalchemy import select
+from sqlalchemy import tuple_
+
+
+class Watermark(NamedTuple):
+    """Position in change feed: time of change and id of the last read object."""
+
+    timestamp: datetime
+    id: Any
+
+
+class ChangeFeedMixin:
+    """Feed of created and updated objects ordered by `coalesce(updated_at, created_at)` and `id`.
+
+    Keyset ordering makes feed stable and resumable by `Watermark`. Use index from
+    `ModelMixin.change_feed_index` for reading the delta without full scan.
+    """
+
+    def _changed_at(self) -> Any:
+        return func.coalesce(self._model.updated_at, self._model.created_at)
+
+    def read_changes(
+        self,
+        since: Watermark | None = None,
+        batch_size: int = 1000,
+        lag: timedelta | None = None,
+    ) -> tuple[list[Any], Watermark | None]:
+        """Read batch of objects changed after watermark.
+
+        :param since: Watermark of the previous batch, `None` reads from the beginning.
+        :param batch_size: Maximal count of objects in batch.
+        :param lag: Skip objects changed later than `now - lag`, transactions running at reading
+         could commit objects with earlier time of change.
+        :return: Objects and watermark for the next batch, watermark is `since` if batch is empty.
+        """
+
+        changed_at = self._changed_at()
+        stmt = (
+            select(self._model, changed_at).order_by(changed_at, self._model.id).limit(batch_size)
+        )
+        if since is not None:
+            stmt = stmt.where(tuple_(changed_at, self._model.id) > tuple_(*since))
+        if lag:
+            stmt = stmt.where(changed_at <= make_datetime_with_utc() - lag)
+
+        rows = self._session.execute(stmt).all()
+        if not rows:
+            return [], since
+
+        obj, timestamp = rows[-1]
+        return [row[0] for row in rows], Watermark(timestamp, obj.id)
+
+    def iter_changes(
+        self,
+        since: Watermark | None = None,
+        batch_size: int = 1000,
+        lag: timedelta | None = None,
+    ) -> Iterator[tuple[list[Any], Watermark]]:
+        """Stream batches of changed objects, parameters are the same as in `read_changes`.
+
+        :return: Iterator of objects and watermark after them, save the last watermark for the next
+         pass.
+        """
+
+        while True:
+            objects, since = self.read_changes(since, batch_size, lag)
+            if not objects:
+                return
+
+            yield objects, since
+
+            if len(objects) < batch_size:
+                return
@@ -0,0 +1,184 @@
+from collections import Counter
+from collections.abc import Iterable
+from collections.abc import Mapping
+from typing import Any
+
+from db_first.expressions import in_list
+from sqlalchemy import BigInteger
+from sqlalchemy import Column
+from sqlalchemy import delete
+from sqlalchemy import func
+from sqlalchemy import insert
+from sqlalchemy import MetaData
+from sqlalchemy import select
+from sqlalchemy import String
+from sqlalchemy import Table
+from sqlalchemy.dialects.postgresql import insert as postgresql_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.orm import Session
+
+
+class CounterCache:
+    """Side table of counts of rows of models.
+
+    Key `''` is count of all live rows of model, key `<column>=<value>` is count of live rows with
+    this value of column.
+
+    :param metadata: Metadata for table of counters, e.g. metadata of models, so table is created
+     with tables of models.
+    :param table_name: Name of table of counters.
+    """
+
+    _map_insert = {'sqlite': sqlite_insert, 'postgresql': postgresql_insert}
+
+    def __init__(self, metadata: MetaData | None = None, table_name: str = 'db_first_counters'):
+        self.table = Table(
+            table_name,
+            metadata if metadata is not None else MetaData(),
+            Column('name', String(255), primary_key=True),
+            Column('key', String(255), primary_key=True),
+            Column('count', BigInteger, nullable=False),
+        )
+
+    def add(self, session: Session, name: str, deltas: Mapping[str, int]) -> None:
+        """Add deltas to counters in transaction of session."""
+
+        rows = [
+            {'name': name, 'key': key, 'count': delta} for key, delta in deltas.items() if delta
+        ]
+        if not rows:
+            return
+
+        dialect = session.get_bind().dialect.name
+        try:
+            make_insert = self._map_insert[dialect]
+        except KeyError:
+            raise NotImplementedError(f'DB <{dialect}> not implemented.')
+
+        stmt = make_insert(self.table)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[self.table.c.name, self.table.c.key],
+            set_={'count': self.table.c.count + stmt.excluded['count']},
+        )
+        session.execute(stmt, rows)
+
+    def get(self, session: Session, name: str, key: str) -> int | None:
+        """Read counter, `None` if counter is unknown."""
+
+        stmt = select(self.table.c.count).where(self.table.c.name == name, self.table.c.key == key)
+        return session.scalar(stmt)
+
+    def replace(self, session: Session, name: str, counts: Mapping[str, int]) -> dict[str, int]:
+        """Replace all counters of model in transaction of session.
+
+        :return: Drift of counters, difference between new and old value of changed counters.
+        """
+
+        stmt = select(self.table.c.key, self.table.c.count).where(self.table.c.name == name)
+        cached = dict(session.execute(stmt).all())
+
+        drift = {}
+        for key in counts.keys() | cached.keys():
+            if (difference := counts.get(key, 0) - cached.get(key, 0)) != 0:
+                drift[key] = difference
+
+        session.execute(delete(self.table).where(self.table.c.name == name))
+        if counts:
+            session.execute(
+                insert(self.table),
+                [{'name': name, 'key': key, 'count': count} for key, count in counts.items()],
+            )
+
+        return drift
+
+
+class CounterCacheMixin:
+    """Counts of rows kept in `CounterCache` by `create`, `bulk_create`, `delete`, `bulk_delete`,
+    `delete_chunked` and buffers of write-behind in the same transaction.
+
+    Counters of values are kept for columns from `_counter_columns`, values are read from database
+    after insertion, so defaults and coerced values are counted as stored. `paginate` reads total
+    from counter when it is filtered only by `eq` on one of these columns or it is not filtered.
+    Other changes of rows, e.g. `update` of counted column, are corrected by `reconcile_counters`.
+    """
+
+    _counter_cache: CounterCache | None = None
+    _counter_columns: tuple[str, ...] = ()
+
+    @staticmethod
+    def _counter_key(col: str, value: Any) -> str:
+        return f'{col}={value}'
+
+    def _counter_name(self) -> str:
+        return self._model.__table__.name
+
+    def _counter_returning(self) -> list[Any]:
+        return [getattr(self._model, col) for col in self._counter_columns]
+
+    def _change_counters(self, rows: Iterable[Mapping[str, Any]], sign: int) -> None:
+        """Change counters by rows read from database, so values are keyed as they are stored."""
+
+        if self._counter_cache is None:
+            return
+
+        deltas: Counter[str] = Counter()
+        for row in rows:
+            deltas[''] += sign
+            for col in self._counter_columns:
+                deltas[self._counter_key(col, row[col])] += sign
+
+        self._counter_cache.add(self._session, self._counter_name(), deltas)
+
+    def _count_created(self, objects: list[Any]) -> None:
+        if self._counter_cache is None:
+            return
+
+        self._session.flush()
+        ids = [obj.id for obj in objects]
+        stmt = select(self._model.id, *self._counter_returning()).where(
+            in_list(self._model.id, ids)
+        )
+        self._change_counters([row._mapping for row in self._session.execute(stmt)], 1)
+
+    def _counter_key_of_filters(self, filters: list[dict[str, Any]]) -> str | None:
+        if self._counter_cache is None:
+            return None
+
+        if not filters:
+            return ''
+
+        if len(filters) == 1:
+            col, opr, value = filters[0]['col'], filters[0]['opr'], filters[0]['value']
+            if opr == 'eq' and col in self._counter_columns:
+                return self._counter_key(col, value)
+
+        return None
+
+    def _read_counter(self, key: str | None) -> int | None:
+        if key is None:
+            return None
+
+        return self._counter_cache.get(self._session, self._counter_name(), key)
+
+    def reconcile_counters(self) -> dict[str, int]:
+        """Recount rows and replace counters in one transaction, run it when writes are rare.
+
+        :return: Drift of counters, e.g. `{'': -2, 'status=new': -2}`.
+        """
+
+        live_filters = self._live_filters()
+        counts = {
+            '': self._session.scalar(
+                select(func.count()).select_from(self._model).where(*live_filters)
+            )
+        }
+        for col in self._counter_columns:
+            column = getattr(self._model, col)
+            stmt = select(column, func.count()).where(*live_filters).group_by(column)
+            for value, count in self._session.execute(stmt).all():
+                counts[self._counter_key(col, value)] = count
+
+        drift = self._counter_cache.replace(self._session, self._counter_name(), counts)
+        self._commit()
+        self._invalidate_cache()
+        return drift
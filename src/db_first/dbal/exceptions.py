@@ -33,5 +33,21 @@ class DBALUpdateException(DBALException):
     """Exception for update methods."""
 
 
+class DBALVersionConflictException(DBALUpdateException):
+    """Exception if row was changed by another transaction."""
+
+
 class DBALPaginateException(DBALException):
     """Exception for paginate mixin."""
+
+
+class DBALTransactionException(DBALException):
+    """Exception for commit of transaction."""
+
+
+class DBALWriteBehindOverflowException(DBALCreateException):
+    """Exception if buffer of write-behind is full."""
+
+
+class DBALPlanRegressionException(DBALException):
+    """Exception if plan of query uses full scan instead of index."""
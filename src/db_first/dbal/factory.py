@@ -0,0 +1,198 @@
+from collections.abc import Callable
+from collections.abc import Iterator
+from contextlib import contextmanager
+from threading import Lock
+from time import monotonic
+from time import perf_counter
+from typing import Any
+
+from sqlalchemy import create_engine
+from sqlalchemy import Engine
+from sqlalchemy import event
+from sqlalchemy import make_url
+from sqlalchemy.exc import TimeoutError
+from sqlalchemy.orm import scoped_session
+from sqlalchemy.orm import Session
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import QueuePool
+
+
+class _Summary:
+    __slots__ = ('count', 'total', 'max')
+
+    def __init__(self) -> None:
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def add(self, value: float) -> None:
+        self.count += 1
+        self.total += value
+        self.max = max(self.max, value)
+
+    def as_dict(self) -> dict[str, float]:
+        return {
+            'count': self.count,
+            'avg': self.total / self.count if self.count else 0.0,
+            'max': self.max,
+        }
+
+
+class PoolMetrics:
+    """Metrics of pool of connections: waiting for checkout and lifetime of connections."""
+
+    def __init__(self) -> None:
+        self._checkout_wait = _Summary()
+        self._lifetime = _Summary()
+        self._timeouts = 0
+        self._lock = Lock()
+
+    def add_checkout_wait(self, seconds: float, timeout: bool = False) -> None:
+        with self._lock:
+            self._checkout_wait.add(seconds)
+            self._timeouts += timeout
+
+    def add_lifetime(self, seconds: float) -> None:
+        with self._lock:
+            self._lifetime.add(seconds)
+
+    def as_dict(self) -> dict[str, Any]:
+        with self._lock:
+            return {
+                'checkout_wait': self._checkout_wait.as_dict(),
+                'checkout_timeouts': self._timeouts,
+                'connection_lifetime': self._lifetime.as_dict(),
+            }
+
+
+class MeteredQueuePool(QueuePool):
+    """`QueuePool` measuring time of waiting for connection in `_metrics`."""
+
+    _metrics: PoolMetrics
+
+    def _do_get(self) -> Any:
+        started_at = perf_counter()
+        try:
+            connection = super()._do_get()
+        except TimeoutError:
+            self._metrics.add_checkout_wait(perf_counter() - started_at, timeout=True)
+            raise
+
+        self._metrics.add_checkout_wait(perf_counter() - started_at)
+        return connection
+
+
+class DBALFactory:
+    """Owner of engine and sessions, makes DBAL objects bound to session of thread or request.
+
+    Session is scoped by thread, or by `scopefunc`, e.g. identity of request. Call `remove` or use
+    `scope()` at the end of request for returning connection to pool.
+
+    In-memory SQLite keeps default pool of dialect, its connections are not metered and parameters
+    of pool are ignored.
+
+    :param url: URL of database.
+    :param pool_size: Count of kept connections.
+    :param max_overflow: Count of connections opened over `pool_size` at load.
+    :param pool_timeout: Maximal waiting for connection in seconds.
+    :param pool_recycle: Maximal age of connection in seconds, older connection is reopened.
+    :param pool_pre_ping: Check connection before checkout.
+    :param scopefunc: Function returning key of scope of session, thread by default.
+    :param engine_kwargs: Other arguments of `sqlalchemy.create_engine`.
+    """
+
+    _lifetime_key = 'db_first_connected_at'
+
+    def __init__(
+        self,
+        url: str,
+        pool_size: int = 5,
+        max_overflow: int = 10,
+        pool_timeout: float = 30.0,
+        pool_recycle: int = 1800,
+        pool_pre_ping: bool = True,
+        scopefunc: Callable[[], Any] | None = None,
+        **engine_kwargs: Any,
+    ) -> None:
+        self._metrics = PoolMetrics()
+        self._max_overflow = max_overflow
+
+        if self._is_sqlite_memory(url):
+            self.engine: Engine = create_engine(url, **engine_kwargs)
+        else:
+            poolclass = type('MeteredQueuePool', (MeteredQueuePool,), {'_metrics': self._metrics})
+            self.engine = create_engine(
+                url,
+                poolclass=poolclass,
+                pool_size=pool_size,
+                max_overflow=max_overflow,
+                pool_timeout=pool_timeout,
+                pool_recycle=pool_recycle,
+                pool_pre_ping=pool_pre_ping,
+                **engine_kwargs,
+            )
+        event.listen(self.engine, 'connect', self._on_connect)
+        event.listen(self.engine, 'close', self._on_close)
+        event.listen(self.engine, 'close_detached', self._on_close)
+
+        self.session = scoped_session(sessionmaker(self.engine), scopefunc=scopefunc)
+
+    @staticmethod
+    def _is_sqlite_memory(url: str) -> bool:
+        url = make_url(url)
+        return url.get_backend_name() == 'sqlite' and (
+            url.database in (None, '', ':memory:') or url.query.get('mode') == 'memory'
+        )
+
+    def _on_connect(self, dbapi_connection: Any, connection_record: Any) -> None:
+        connection_record.info[self._lifetime_key] = monotonic()
+
+    def _on_close(self, dbapi_connection: Any, connection_record: Any = None) -> None:
+        info = getattr(connection_record, 'info', None) or {}
+        if (connected_at := info.pop(self._lifetime_key, None)) is not None:
+            self._metrics.add_lifetime(monotonic() - connected_at)
+
+    def __call__[D](self, dbal: type[D]) -> D:
+        """Make DBAL bound to session of current scope."""
+
+        return dbal(self.session())
+
+    def remove(self) -> None:
+        """Close session of current scope and return its connection to pool."""
+
+        self.session.remove()
+
+    @contextmanager
+    def scope(self) -> Iterator[Session]:
+        """Session for one request, it is closed on exit."""
+
+        try:
+            yield self.session()
+        finally:
+            self.remove()
+
+    def metrics(self) -> dict[str, Any]:
+        """Metrics of pool.
+
+        :return: Size of pool, checked out connections, saturation as share of checked out
+         connections from maximal count, waiting for checkout and lifetime of connections. Only
+         waiting and lifetime are returned for pool which is not `QueuePool`.
+        """
+
+        pool = self.engine.pool
+        if not isinstance(pool, QueuePool):
+            return self._metrics.as_dict()
+
+        capacity = pool.size() + max(self._max_overflow, 0)
+        checked_out = pool.checkedout()
+        return {
+            'pool_size': pool.size(),
+            'checked_out': checked_out,
+            'overflow': pool.overflow(),
+            'saturation': checked_out / capacity if capacity else 0.0,
+            **self._metrics.as_dict(),
+        }
+
+    def dispose(self) -> None:
+        self.session.remove()
+        self.engine.dispose()
@@ -0,0 +1,28 @@
+from db_first.dbal.exceptions import DBALColumnNonExistException
+from db_first.dbal.exceptions import DBALForeignKeyConstraintFailedException
+from db_first.dbal.exceptions import DBALNotNullConstraintFailedException
+from sqlalchemy.exc import CompileError
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+
+def compile_error_handler(e: CompileError) -> None:
+    if e.args[0].startswith('Unconsumed column names:'):
+        raise DBALColumnNonExistException(e)
+
+
+def integrity_error_handler(e: IntegrityError, s: Session) -> None:
+    db_type = s.get_bind().name
+
+    if db_type == 'sqlite':
+        if e.orig.sqlite_errorname == 'SQLITE_CONSTRAINT_NOTNULL':
+            raise DBALNotNullConstraintFailedException(e.orig.args[0])
+        if e.orig.sqlite_errorname == 'SQLITE_CONSTRAINT_FOREIGNKEY':
+            raise DBALForeignKeyConstraintFailedException(e.orig.args[0])
+
+    elif db_type == 'postgresql':
+        if 'is not present in table' in e.orig.diag.message_detail:
+            raise DBALForeignKeyConstraintFailedException(e.orig.diag.message_detail)
+
+    else:
+        raise NotImplementedError(f'DB <{db_type}> not implemented.')
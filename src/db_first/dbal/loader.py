@@ -0,0 +1,120 @@
+import asyncio
+from collections.abc import Iterator
+from concurrent.futures import Future
+from contextlib import contextmanager
+from typing import Any
+from typing import Self
+
+from db_first.dbal.exceptions import DBALObjectNotFoundException
+
+
+class ReadLoader:
+    """Request-scoped loader, collects reading of objects by id and reads them by one query.
+
+    Calls of `load` inside `batch()` are resolved on exit of the outer batch, calls of `load_async`
+    made in the same tick of event loop are resolved together. Ids are de-duplicated and read
+    objects are cached in loader, so loader must live no longer than request.
+
+    :param dbal: DBAL for reading objects by `bulk_read`.
+    """
+
+    def __init__(self, dbal: Any) -> None:
+        self._dbal = dbal
+        self._cache: dict[Any, Any] = {}
+        self._pending: dict[Any, list[Any]] = {}
+        self._batch_depth = 0
+        self._scheduled = False
+
+    @contextmanager
+    def batch(self) -> Iterator[Self]:
+        self._batch_depth += 1
+        try:
+            yield self
+        finally:
+            self._batch_depth -= 1
+            if not self._batch_depth:
+                self.dispatch()
+
+    def load(self, id: Any) -> Future:
+        """Read object by id, outside of batch object is read immediately.
+
+        :param id: Id of object.
+        :return: Future of object, it is resolved on exit of batch.
+        """
+
+        future = Future()
+        self._add(id, future)
+
+        if not self._batch_depth:
+            self.dispatch()
+
+        return future
+
+    def load_many(self, ids: list[Any]) -> list[Future]:
+        with self.batch():
+            return [self.load(id_) for id_ in ids]
+
+    async def load_async(self, id: Any) -> Any:
+        return (await self.load_many_async([id]))[0]
+
+    async def load_many_async(self, ids: list[Any]) -> list[Any]:
+        loop = asyncio.get_running_loop()
+
+        futures = []
+        for id_ in ids:
+            future = loop.create_future()
+            self._add(id_, future)
+            futures.append(future)
+
+        if not self._scheduled and self._pending:
+            self._scheduled = True
+            loop.call_soon(self.dispatch)
+
+        return list(await asyncio.gather(*futures))
+
+    def clear(self) -> None:
+        self._cache.clear()
+
+    def _add(self, id: Any, future: Any) -> None:
+        if id in self._cache:
+            future.set_result(self._cache[id])
+        else:
+            self._pending.setdefault(id, []).append(future)
+
+    def dispatch(self) -> None:
+        """Read all pending objects by one query and resolve their futures."""
+
+        pending, self._pending = self._pending, {}
+        self._scheduled = False
+
+        if not pending:
+            return
+
+        try:
+            objects = self._dbal.bulk_read(list(pending))
+        except Exception as e:
+            for futures in pending.values():
+                self._resolve(futures, exception=e)
+            return
+
+        self._cache.update((obj.id, obj) for obj in objects)
+
+        for id_, futures in pending.items():
+            if id_ in self._cache:
+                self._resolve(futures, result=self._cache[id_])
+            else:
+                exception = DBALObjectNotFoundException(f'Object <{id_}> not found.')
+                self._resolve(futures, exception=exception)
+
+    @staticmethod
+    def _resolve(
+        futures: list[Any], result: Any = None, exception: BaseException | None = None
+    ) -> None:
+        for future in futures:
+            if future.done():
+                continue
+
+            if exception is None:
+                future.set_result(result)
+            else:
+                future.set_exception(exception)
@@ -1,15 +1,30 @@
 from math import ceil
+from time import perf_counter
 from typing import Any
 
 from db_first.dbal.exceptions import DBALPaginateException
+from db_first.dbal.query_parser import default_filter_prefixes
+from db_first.dbal.query_parser import QueryStringParser
+from db_first.index_advisor import QueryShape
+from db_first.index_advisor import ShapeRecorder
+from db_first.profiling import profiled
 from db_first.statement_maker import StatementMaker
 from sqlalchemy import func
+from sqlalchemy import Row
+from sqlalchemy import Select
 
 
 class PageMixin:
-    """Read objects from database as page."""
+    """Read objects from database as page.
 
-    _filter_prefixes = ['lt', 'le', 'eq', 'ne', 'ge', 'gt', 'in']
+    Mixin is part of `SqlaDBAL`, it requires `_model`, `_session` and mixins `ArchiveMixin`,
+    `CacheMixin`, `SingleFlightMixin`, `ProfilingMixin` and `CounterCacheMixin`.
+
+    If `_shape_recorder` is set, shapes of statements of `paginate` and `aggregate` are recorded in
+    it with latency of execution.
+    """
+
+    _filter_prefixes = list(default_filter_prefixes)
 
     _search_prefixes = ['contain']
 
@@ -17,11 +32,17 @@ class PageMixin:
     _asc_value = 'asc'
     _desc_value = 'desc'
 
+    _having_prefixes = ['having']
+
+    _max_join_depth = 2
+
+    _shape_recorder: ShapeRecorder | None = None
+
     def _extract_expressions(self, params: dict[str, Any]):
         order_by = []
         filters = []
         for name, value in params.items():
-            prefix, param = name.split('__')
+            prefix, param = name.split('__', 1)
             if prefix in self._filter_prefixes:
                 filters.append({'col': param, 'opr': prefix, 'value': value})
             elif prefix in self._sort_prefixes:
@@ -33,19 +54,58 @@ class PageMixin:
 
         return order_by, filters
 
+    @classmethod
+    def _get_query_parser(cls) -> QueryStringParser:
+        """Parser is compiled once for class of DBAL."""
+
+        if (parser := cls.__dict__.get('_query_parser')) is None:
+            parser = QueryStringParser(
+                cls._model,
+                filter_prefixes=cls._filter_prefixes,
+                search_prefixes=cls._search_prefixes,
+                sort_prefixes=cls._sort_prefixes,
+                sort_values=(cls._asc_value, cls._desc_value),
+                max_join_depth=cls._max_join_depth,
+            )
+            cls._query_parser = parser
+
+        return parser
+
+    @staticmethod
+    def _extract_aggregates(select: list[str]) -> list[dict[str, str]]:
+        aggregates = []
+        for item in select:
+            func_, _, col = item.partition('__')
+            aggregates.append({'func': func_, 'col': col})
+
+        return aggregates
+
+    def _extract_having(self, params: dict[str, Any]) -> list[dict[str, Any]]:
+        having = []
+        for name in [name for name in params if name.split('__', 1)[0] in self._having_prefixes]:
+            _, opr, label = name.split('__', 2)
+            having.append({'col': label, 'opr': opr, 'value': params.pop(name)})
+
+        return having
+
     def query_string_to_sql_json(
         self,
         page: int,
         per_page: int,
         ids: list[str] | None = None,
+        load: list[str] | None = None,
         **params: dict[str, Any],
     ) -> dict[str, Any]:
+        parser = self._get_query_parser()
         sql_as_json = {'limit': per_page, 'offset': (page - 1) * per_page}
 
-        order_by, filters = self._extract_expressions(params)
+        if load:
+            sql_as_json['join'] = parser.parse_joins(load)
+
+        order_by, filters = parser.parse(params)
 
         if ids:
-            filters.append({'col': 'id', 'opr': 'in', 'value': ids})
+            filters.extend(parser.parse({'in__id': ids})[1])
 
         if filters:
             sql_as_json['where'] = {'and': filters}
@@ -55,29 +115,40 @@ class PageMixin:
 
         return sql_as_json
 
-    def paginate(
-        self,
-        ids: list[str] | None = None,
-        page: int = 1,
-        per_page: int = 20,
-        include_metadata: bool = False,
-        **data: dict[str, Any],
-    ) -> dict[str, Any]:
+    def _make_page_statement(self, sql_as_json: dict[str, Any]) -> Select:
+        statement = StatementMaker(
+            self._model, max_join_depth=self._max_join_depth, validate=False, **sql_as_json
+        ).make_stmt()
+        return statement.where(*self._live_filters())
 
-        if page < 1:
-            raise DBALPaginateException(f'Page <{page}> must be greater <1>.')
+    def _record_shape(
+        self, where: dict[str, Any] | None, order_by: list[dict[str, Any]] | None
+    ) -> QueryShape | None:
+        if self._shape_recorder is None:
+            return None
 
-        if per_page < 1:
-            raise DBALPaginateException(f'Page <{per_page}> must be greater <1>.')
+        return self._shape_recorder.record(self._model, where, order_by)
 
-        sql_as_json = self.query_string_to_sql_json(ids=ids, page=page, per_page=per_page, **data)
+    def _observe_shape(self, shape: QueryShape | None, started_at: float) -> None:
+        if shape is not None:
+            self._shape_recorder.observe(shape, perf_counter() - started_at)
 
-        statement = StatementMaker(self._model, **sql_as_json).make_stmt()
-        items = self._session.scalars(statement).all()
+    def _read_page(
+        self,
+        statement: Select,
+        page: int,
+        per_page: int,
+        include_metadata: bool,
+        counter_key: str | None = None,
+        unique: bool = False,
+    ) -> dict[str, Any]:
+        scalars = self._session.scalars(statement)
+        items = (scalars.unique() if unique else scalars).all()
+        self._memory_checkpoint()
 
         result = {'items': items}
 
-        if include_metadata:
+        if include_metadata and (total := self._read_counter(counter_key)) is None:
             total = self._session.scalar(
                 statement.with_only_columns(func.count())
                 .select_from(self._model)
@@ -86,6 +157,7 @@ class PageMixin:
                 .offset(None)
             )
 
+        if include_metadata:
             pages = ceil(total / per_page)
 
             result['_metadata'] = {
@@ -93,3 +165,116 @@ class PageMixin:
             }
 
         return result
+
+    @profiled
+    def paginate(
+        self,
+        ids: list[str] | None = None,
+        page: int = 1,
+        per_page: int = 20,
+        include_metadata: bool = False,
+        load: list[str] | None = None,
+        **data: dict[str, Any],
+    ) -> dict[str, Any]:
+        """Read page of objects.
+
+        :param ids: Read only objects with these ids.
+        :param page: Number of page from 1.
+        :param per_page: Count of objects on page.
+        :param include_metadata: Add metadata of pagination to result.
+        :param load: Relationships for eager loading, e.g. `['father', 'children.parent:joined']`,
+         by default relationship is loaded by `selectin` strategy.
+        :param data: Filters `<operator>__<column>` and sorting `sort__<column>`, column of related
+         model is set as `<relationship>.<column>`.
+        :return: Objects and metadata of pagination, it is read from cache if `_cache_backend` is
+         set. Total is read from `_counter_cache` if filters match counter.
+        """
+
+        if page < 1:
+            raise DBALPaginateException(f'Page <{page}> must be greater <1>.')
+
+        if per_page < 1:
+            raise DBALPaginateException(f'Page <{per_page}> must be greater <1>.')
+
+        sql_as_json = self.query_string_to_sql_json(
+            ids=ids, page=page, per_page=per_page, load=load, **data
+        )
+
+        if use_cache := self._is_cache_usable():
+            cache_key = self._cache_key(sql_as_json, include_metadata)
+            if (result := self._cache_get(cache_key)) is not None:
+                return result
+
+        statement = self._make_page_statement(sql_as_json)
+        shape = self._record_shape(sql_as_json.get('where'), sql_as_json.get('order_by'))
+        counter_key = self._counter_key_of_filters(sql_as_json.get('where', {}).get('and', []))
+        unique = any(join['load'] == 'joined' for join in sql_as_json.get('join', []))
+
+        def _read() -> dict[str, Any]:
+            return self._read_page(statement, page, per_page, include_metadata, counter_key, unique)
+
+        started_at = perf_counter()
+        if not self._is_single_flight_usable():
+            result = _read()
+        else:
+            key = self._single_flight_key(statement, include_metadata, sql_as_json.get('join'))
+            result = self._run_single_flight(key, _read)
+        self._observe_shape(shape, started_at)
+
+        if use_cache:
+            self._cache_set(cache_key, result)
+
+        return result
+
+    @profiled
+    def aggregate(
+        self,
+        select: list[str] | None = None,
+        group_by: list[str] | None = None,
+        ids: list[str] | None = None,
+        limit: int | None = None,
+        offset: int = 0,
+        **data: dict[str, Any],
+    ) -> list[dict[str, Any]]:
+        """Read aggregates of objects, reduction is made by database.
+
+        :param select: Aggregates `<function>__<column>`, function is one of `count`,
+         `count_distinct`, `sum`, `avg`, `min`, `max`, e.g. `['count__id', 'sum__amount']`.
+        :param group_by: Columns for grouping, they are added to result.
+        :param ids: Aggregate only objects with these ids.
+        :param limit: Maximal count of rows, all rows by default.
+        :param offset: Count of skipped rows.
+        :param data: Filters `<operator>__<column>`, filters of aggregates
+         `having__<operator>__<function>__<column>` and sorting `sort__<column>` or
+         `sort__<function>__<column>`.
+        :return: Rows of aggregates as dicts, key of aggregate is `<function>__<column>`.
+        """
+
+        if not select and not group_by:
+            raise DBALPaginateException('Aggregates or columns for grouping are required.')
+
+        having = self._extract_having(data)
+        order_by, filters = self._extract_expressions(data)
+
+        if ids:
+            filters.append({'col': 'id', 'opr': 'in', 'value': ids})
+
+        where = {'and': filters} if filters else None
+        maker = StatementMaker(
+            self._model,
+            where=where,
+            order_by=order_by or None,
+            select=self._extract_aggregates(select or []),
+            group_by=group_by,
+            having={'and': having} if having else None,
+            limit=limit,
+            offset=offset,
+            max_join_depth=self._max_join_depth,
+        )
+        statement = maker.make_stmt().where(*self._live_filters())
+        shape = self._record_shape(where, order_by)
+
+        started_at = perf_counter()
+        rows: list[Row] = self._session.execute(statement).all()
+        self._observe_shape(shape, started_at)
+        return [dict(row._mapping) for row in rows]
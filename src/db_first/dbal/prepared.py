@@ -0,0 +1,182 @@
+import json
+from collections import Counter
+from collections import OrderedDict
+from threading import Lock
+from typing import Any
+
+from sqlalchemy import Connection
+from sqlalchemy import Engine
+from sqlalchemy import event
+from sqlalchemy.exc import DisconnectionError
+
+temporary_ddl_option = 'db_first_temporary_ddl'
+
+
+class PreparedStatements:
+    """Server-side prepared statements of PostgreSQL for hot statements, driver `psycopg` (3).
+
+    Psycopg prepares statement on connection after `prepare_threshold` executions and keeps
+    `prepared_max` statements per connection, the least recently used is deallocated. Statements of
+    `read`, `read_filtered` and `paginate` have the same text for the same shape, so hot shapes are
+    planned by PostgreSQL once per connection.
+
+    DDL executed by engine makes prepared statements outdated: connections with outdated statements
+    are replaced by pool on checkout. DDL of temporary tables executed with execution option
+    `temporary_ddl_option` is skipped. After migrations made by other processes call `invalidate`.
+
+    :param prepare_threshold: Count of executions of statement before preparing it.
+    :param prepared_max: Maximal count of prepared statements per connection.
+    :param max_shapes: Maximal count of statements in statistics.
+    """
+
+    _info_key = 'db_first_prepared'
+
+    def __init__(
+        self, prepare_threshold: int = 2, prepared_max: int = 100, max_shapes: int = 1000
+    ) -> None:
+        self._prepare_threshold = prepare_threshold
+        self._prepared_max = prepared_max
+        self._max_shapes = max_shapes
+        self._generation = 0
+        self._executions = 0
+        self._prepared_executions: Counter[str] = Counter()
+        self._parameters: dict[str, Any] = {}
+        self._lock = Lock()
+
+    def install(self, engine: Engine) -> None:
+        if engine.dialect.name != 'postgresql' or engine.dialect.driver != 'psycopg':
+            raise NotImplementedError(
+                f'DB <{engine.dialect.name}+{engine.dialect.driver}> not implemented.'
+            )
+
+        event.listen(engine, 'connect', self._on_connect)
+        event.listen(engine, 'checkout', self._on_checkout)
+        event.listen(engine, 'before_cursor_execute', self._on_before_cursor_execute)
+        event.listen(engine, 'after_cursor_execute', self._on_after_cursor_execute)
+
+    def invalidate(self) -> None:
+        """Make prepared statements of all connections outdated, e.g. after migration."""
+
+        with self._lock:
+            self._generation += 1
+
+    def _on_connect(self, dbapi_connection: Any, connection_record: Any) -> None:
+        driver_connection = getattr(dbapi_connection, 'driver_connection', dbapi_connection)
+        driver_connection.prepare_threshold = self._prepare_threshold
+        driver_connection.prepared_max = self._prepared_max
+        connection_record.info[self._info_key] = {
+            'generation': self._generation,
+            'counts': OrderedDict(),
+        }
+
+    def _on_checkout(
+        self, dbapi_connection: Any, connection_record: Any, connection_proxy: Any
+    ) -> None:
+        info = connection_record.info.get(self._info_key)
+        if info is not None and info['generation'] != self._generation:
+            raise DisconnectionError('Prepared statements are outdated.')
+
+    def _on_before_cursor_execute(
+        self,
+        conn: Connection,
+        cursor: Any,
+        statement: str,
+        parameters: Any,
+        context: Any,
+        executemany: bool,
+    ) -> None:
+        if executemany or (info := conn.info.get(self._info_key)) is None:
+            return
+
+        self._count(info['counts'], statement, parameters)
+
+    def _on_after_cursor_execute(
+        self,
+        conn: Connection,
+        cursor: Any,
+        statement: str,
+        parameters: Any,
+        context: Any,
+        executemany: bool,
+    ) -> None:
+        if (
+            context is not None
+            and context.isddl
+            and not context.execution_options.get(temporary_ddl_option)
+        ):
+            self.invalidate()
+
+    def _count(self, counts: OrderedDict[str, int], statement: str, parameters: Any) -> None:
+        """Repeat accounting of psycopg for estimation of executions of prepared statements."""
+
+        counts[statement] = counts.get(statement, 0) + 1
+        counts.move_to_end(statement)
+        if len(counts) > self._prepared_max:
+            counts.popitem(last=False)
+
+        with self._lock:
+            self._executions += 1
+            if counts[statement] <= self._prepare_threshold:
+                return
+
+            if (
+                statement in self._prepared_executions
+                or len(self._prepared_executions) < self._max_shapes
+            ):
+                self._prepared_executions[statement] += 1
+                self._parameters[statement] = parameters
+
+    def stats(self) -> dict[str, Any]:
+        """Statistics of executions.
+
+        :return: Count of executions, estimated count of executions of prepared statements and the
+         most executed prepared statements.
+        """
+
+        with self._lock:
+            return {
+                'executions': self._executions,
+                'prepared_executions': self._prepared_executions.total(),
+                'top': self._prepared_executions.most_common(10),
+            }
+
+    def report(self, connection: Connection, top: int = 10) -> dict[str, Any]:
+        """Estimate planning time saved by prepared statements.
+
+        Planning time of the most executed statements is measured by `EXPLAIN` with the last
+        parameters of statement and multiplied by count of executions of prepared statement.
+
+        :param connection: Connection for measuring of planning time.
+        :param top: Count of measured statements.
+        :return: Statistics and saved planning time in milliseconds.
+        """
+
+        with self._lock:
+            shapes = [
+                (statement, count, self._parameters[statement])
+                for statement, count in self._prepared_executions.most_common(top)
+            ]
+
+        saved_ms = 0.0
+        statements = []
+        for statement, count, parameters in shapes:
+            planning_ms = self._measure_planning_time(connection, statement, parameters)
+            saved_ms += planning_ms * count
+            statements.append(
+                {'statement': statement, 'executions': count, 'planning_ms': planning_ms}
+            )
+
+        return {**self.stats(), 'planning_ms_saved': saved_ms, 'statements': statements}
+
+    @staticmethod
+    def _measure_planning_time(connection: Connection, statement: str, parameters: Any) -> float:
+        cursor = connection.connection.cursor()
+        try:
+            cursor.execute(f'EXPLAIN (SUMMARY ON, FORMAT JSON) {statement}', parameters)
+            (plan,) = cursor.fetchone()
+        finally:
+            cursor.close()
+
+        if isinstance(plan, str):
+            plan = json.loads(plan)
+        return plan[0]['Planning Time']
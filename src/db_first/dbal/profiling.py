@@ -0,0 +1,11 @@
+from db_first.profiling import MemoryProfiler
+
+
+class ProfilingMixin:
+    """Profiling of memory of DBAL methods, enabled by setting `_memory_profiler`."""
+
+    _memory_profiler: MemoryProfiler | None = None
+
+    def _memory_checkpoint(self) -> None:
+        if self._memory_profiler is not None:
+            self._memory_profiler.checkpoint()
@@ -0,0 +1,202 @@
+from collections.abc import Callable
+from collections.abc import Iterable
+from datetime import date
+from datetime import datetime
+from decimal import Decimal
+from decimal import InvalidOperation
+from typing import Any
+from uuid import UUID
+
+from db_first.operators import operators
+from marshmallow import ValidationError
+from sqlalchemy import inspect
+
+_true_values = ('true', 'True', '1')
+_false_values = ('false', 'False', '0')
+
+_not_coerced_operators = ('ilike', 'isnull')
+
+default_filter_prefixes = ('lt', 'le', 'eq', 'ne', 'ge', 'gt', 'in', 'between', 'isnull')
+
+
+def _to_bool(value: str) -> bool:
+    if value in _true_values:
+        return True
+    if value in _false_values:
+        return False
+    raise ValueError(f'Value <{value}> is not boolean.')
+
+
+_coercers: dict[type, Callable[[str], Any]] = {
+    bool: _to_bool,
+    int: int,
+    float: float,
+    Decimal: Decimal,
+    UUID: UUID,
+    datetime: datetime.fromisoformat,
+    date: date.fromisoformat,
+}
+
+
+def _make_coercer(column_type: Any) -> Callable[[Any], Any] | None:
+    try:
+        python_type = column_type.python_type
+    except NotImplementedError:
+        return None
+
+    return _coercers.get(python_type)
+
+
+class QueryStringParser:
+    """Parser of parameters of `paginate` compiled for model.
+
+    Coercers are built once from columns of model, every parameter `<prefix>__<column>` is parsed
+    once and its specification is reused. Values are validated and coerced to types of
+    columns, so statement is made by `StatementMaker` without validation.
+
+    :param model: Model of DBAL.
+    :param filter_prefixes: Prefixes of filters, names of operators from registry.
+    :param search_prefixes: Prefixes of search by `ilike`.
+    :param sort_prefixes: Prefixes of sorting.
+    :param sort_values: Allowed directions of sorting.
+    :param max_join_depth: Maximal depth of relationships.
+    """
+
+    def __init__(
+        self,
+        model: type,
+        filter_prefixes: Iterable[str] = default_filter_prefixes,
+        search_prefixes: Iterable[str] = ('contain',),
+        sort_prefixes: Iterable[str] = ('sort',),
+        sort_values: Iterable[str] = ('asc', 'desc'),
+        max_join_depth: int = 2,
+    ) -> None:
+        self._model = model
+        self._filter_prefixes = frozenset(filter_prefixes)
+        self._search_prefixes = frozenset(search_prefixes)
+        self._sort_prefixes = frozenset(sort_prefixes)
+        self._sort_values = frozenset(sort_values)
+        self._max_join_depth = max_join_depth
+        self._coercers: dict[Any, dict[str, Callable[[Any], Any] | None]] = {}
+        self._specs: dict[str, tuple[str, str, str, Callable[[Any], Any] | None]] = {}
+
+    def _get_coercers(self, mapper: Any) -> dict[str, Callable[[Any], Any] | None]:
+        if (coercers := self._coercers.get(mapper)) is None:
+            coercers = {
+                attr.key: _make_coercer(attr.columns[0].type) for attr in mapper.column_attrs
+            }
+            self._coercers[mapper] = coercers
+
+        return coercers
+
+    def _check_depth(self, path: str, depth: int) -> None:
+        if depth > self._max_join_depth:
+            raise ValidationError(
+                f'Depth of relationships <{path}> is greater than <{self._max_join_depth}>.'
+            )
+
+    def _resolve_relationships(self, path: list[str], full_path: str) -> Any:
+        mapper = inspect(self._model)
+        for relationship in path:
+            try:
+                mapper = mapper.relationships[relationship].mapper
+            except KeyError:
+                raise ValidationError(f'Relationship <{relationship}> of <{full_path}> not found.')
+
+        return mapper
+
+    def _resolve_column(self, col: str) -> Callable[[Any], Any] | None:
+        self._check_depth(col, col.count('.'))
+
+        *path, name = col.split('.')
+        mapper = self._resolve_relationships(path, col)
+
+        coercers = self._get_coercers(mapper)
+        if name not in coercers:
+            raise ValidationError(f'Column <{col}> not found.')
+
+        return coercers[name]
+
+    def _compile(self, name: str) -> tuple[str, str, str, Callable[[Any], Any] | None]:
+        prefix, _, col = name.partition('__')
+
+        if prefix in self._filter_prefixes:
+            kind, opr = 'filter', prefix
+        elif prefix in self._sort_prefixes:
+            kind, opr = 'sort', ''
+        elif prefix in self._search_prefixes:
+            kind, opr = 'filter', 'ilike'
+        else:
+            raise NotImplementedError(f'Expression for parameter <{name}> not implemented.')
+
+        if not col:
+            raise ValidationError(f'Column of parameter <{name}> is required.')
+
+        coerce = self._resolve_column(col)
+        if kind == 'sort' or opr in _not_coerced_operators:
+            coerce = None
+
+        return kind, col, opr, coerce
+
+    def _get_spec(self, name: str) -> tuple[str, str, str, Callable[[Any], Any] | None]:
+        spec = self._specs.get(name)
+        if spec is None or spec[2] and spec[2] not in operators:
+            spec = self._specs[name] = self._compile(name)
+
+        return spec
+
+    @staticmethod
+    def _coerce(coerce: Callable[[Any], Any], value: Any) -> Any:
+        if isinstance(value, str):
+            return coerce(value)
+        if isinstance(value, list | tuple):
+            return [coerce(item) if isinstance(item, str) else item for item in value]
+        return value
+
+    def parse(self, params: dict[str, Any]) -> tuple[list[dict[str, Any]], list[dict[str, Any]]]:
+        """Parse parameters in one pass.
+
+        :param params: Filters `<operator>__<column>`, search `contain__<column>` and sorting
+         `sort__<column>`.
+        :return: Sorting and filters in format of `StatementMaker`.
+        """
+
+        order_by = []
+        filters = []
+        for name, value in params.items():
+            kind, col, opr, coerce = self._get_spec(name)
+
+            if kind == 'sort':
+                if value not in self._sort_values:
+                    raise ValidationError(f'Direction of sorting <{value}> not allowed.')
+                order_by.append({'col': col, 'opr': value})
+                continue
+
+            try:
+                if coerce is not None:
+                    value = self._coerce(coerce, value)
+                operators[opr].validate(value)
+            except (TypeError, ValueError, InvalidOperation) as e:
+                raise ValidationError(f'Value of parameter <{name}> is wrong: {e}')
+
+            filters.append({'col': col, 'opr': opr, 'value': value})
+
+        return order_by, filters
+
+    def parse_joins(self, load: list[str]) -> list[dict[str, str]]:
+        """Parse relationships for eager loading `<path>:<strategy>`.
+
+        :param load: Relationships, strategy is `selectin` by default.
+        :return: Joins in format of `StatementMaker`.
+        """
+
+        joins = []
+        for item in load:
+            path, _, strategy = item.partition(':')
+            if strategy not in ('', 'selectin', 'joined'):
+                raise ValidationError(f'Strategy of loading <{strategy}> not allowed.')
+            self._check_depth(path, path.count('.') + 1)
+            self._resolve_relationships(path.split('.'), path)
+            joins.append({'table': path, 'load': strategy or 'selectin'})
+
+        return joins
@@ -0,0 +1,213 @@
+import json
+import re
+from datetime import date
+from datetime import datetime
+from decimal import Decimal
+from pathlib import Path
+from typing import Any
+
+from db_first.dbal.exceptions import DBALPlanRegressionException
+from sqlalchemy import inspect
+from sqlalchemy import Select
+from sqlalchemy import select
+
+_ordered_types = (int, float, Decimal, datetime, date)
+
+_anonymous_alias = re.compile(r'\b(\w+)_\d+\b')
+
+_map_explain = {'sqlite': 'EXPLAIN QUERY PLAN', 'postgresql': 'EXPLAIN (FORMAT JSON)'}
+
+
+def _normalize_sqlite(rows: list[Any]) -> list[str]:
+    depths = {0: -1}
+    plan = []
+    for id_, parent, _, detail in rows:
+        depths[id_] = depths.get(parent, -1) + 1
+        plan.append('  ' * depths[id_] + _anonymous_alias.sub(r'\1', detail))
+    return plan
+
+
+def _normalize_postgresql(node: dict[str, Any], depth: int = 0) -> list[str]:
+    parts = [node['Node Type']]
+    if 'Relation Name' in node:
+        parts.append(f'on {node["Relation Name"]}')
+    if 'Index Name' in node:
+        parts.append(f'using {node["Index Name"]}')
+
+    plan = ['  ' * depth + ' '.join(parts)]
+    for child in node.get('Plans', []):
+        plan.extend(_normalize_postgresql(child, depth + 1))
+    return plan
+
+
+def explain(session: Any, statement: Select) -> list[str]:
+    """Plan of statement without costs, numbers of aliases and values of parameters.
+
+    :return: Lines of plan, nested steps are indented.
+    """
+
+    dialect = session.get_bind().dialect
+    try:
+        prefix = _map_explain[dialect.name]
+    except KeyError:
+        raise NotImplementedError(f'DB <{dialect.name}> not implemented.')
+
+    sql = statement.compile(dialect=dialect, compile_kwargs={'literal_binds': True})
+    result = session.connection().exec_driver_sql(f'{prefix} {sql}')
+
+    if dialect.name == 'postgresql':
+        plan = result.scalar()
+        if isinstance(plan, str):
+            plan = json.loads(plan)
+        return _normalize_postgresql(plan[0]['Plan'])
+
+    return _normalize_sqlite(result.all())
+
+
+def access_paths(plan: list[str]) -> dict[str, str]:
+    """Access of tables in plan: `index` or `full` scan.
+
+    Scan of table in order of index is access by `index`.
+    """
+
+    paths = {}
+    for line in plan:
+        words = line.split()
+        if words[:1] == ['SEARCH'] or words[:1] == ['SCAN'] and 'INDEX' in words:
+            paths[words[1]] = 'index'
+        elif words[:1] == ['SCAN'] and len(words) == 2:
+            paths[words[1]] = 'full'
+        elif 'on' in words and ('Index' in words or words[:2] == ['Bitmap', 'Heap']):
+            paths[words[words.index('on') + 1]] = 'index'
+        elif words[:2] == ['Seq', 'Scan']:
+            paths[words[3]] = 'full'
+    return paths
+
+
+def page_shapes(dbal: Any) -> dict[str, dict[str, Any]]:
+    """Representative parameters of `paginate` for model of DBAL.
+
+    Shapes are filters `eq` of every column, `ge` of ordered columns, sorting by every column and
+    filter `eq` with sorting for pairs of indexed columns. Values of filters are taken from first
+    row of table, columns without values are skipped.
+
+    :return: Parameters of `paginate` by name of shape, e.g. `eq__status&sort__created_at=desc`.
+    """
+
+    model = dbal._model
+    columns = [attr.key for attr in inspect(model).column_attrs]
+    indexed = list(
+        dict.fromkeys(
+            column.key
+            for index in model.__table__.indexes
+            for column in index.columns
+            if column.key in columns
+        )
+    )
+
+    values = {}
+    for col in columns:
+        column = getattr(model, col)
+        value = dbal._session.scalar(select(column).where(column.is_not(None)).limit(1))
+        if value is not None:
+            values[col] = value
+
+    shapes = {}
+    for col in columns:
+        if col in values:
+            shapes[f'eq__{col}'] = {f'eq__{col}': values[col]}
+            if isinstance(values[col], _ordered_types):
+                shapes[f'ge__{col}'] = {f'ge__{col}': values[col]}
+        for direction in ('asc', 'desc'):
+            shapes[f'sort__{col}={direction}'] = {f'sort__{col}': direction}
+
+    for col in indexed:
+        if col not in values:
+            continue
+        for sort_col in indexed:
+            if sort_col != col:
+                shapes[f'eq__{col}&sort__{sort_col}=desc'] = {
+                    f'eq__{col}': values[col],
+                    f'sort__{sort_col}': 'desc',
+                }
+
+    return shapes
+
+
+class PlanSnapshots:
+    """Snapshots of plans of `paginate` statements stored in JSON file.
+
+    Plans are stored per dialect, so the same file keeps plans of SQLite and PostgreSQL.
+
+    :param path: File of snapshots.
+    """
+
+    def __init__(self, path: str | Path) -> None:
+        self.path = Path(path)
+
+    def _load(self) -> dict[str, Any]:
+        if not self.path.exists():
+            return {}
+        return json.loads(self.path.read_text())
+
+    def _save(self, snapshots: dict[str, Any]) -> None:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.path.write_text(json.dumps(snapshots, indent=2, sort_keys=True) + '\n')
+
+    @staticmethod
+    def make_snapshots(dbal: Any, shapes: dict[str, dict[str, Any]]) -> dict[str, Any]:
+        """Plans of shapes made by DBAL, statements are built as in `paginate`."""
+
+        snapshots = {}
+        for name, params in shapes.items():
+            sql_as_json = dbal.query_string_to_sql_json(page=1, per_page=20, **params)
+            plan = explain(dbal._session, dbal._make_page_statement(sql_as_json))
+            snapshots[name] = {'plan': plan, 'access': access_paths(plan)}
+        return snapshots
+
+    def check(
+        self, dbal: Any, shapes: dict[str, dict[str, Any]] | None = None, update: bool = False
+    ) -> dict[str, list[str]]:
+        """Compare plans with snapshots, new shapes are added to snapshots.
+
+        :param dbal: DBAL with session of seeded database.
+        :param shapes: Parameters of `paginate` by name of shape, `page_shapes` by default.
+        :param update: Replace snapshots by current plans, regressions are not raised.
+        :return: Names of `new`, `changed` and `regressed` shapes.
+        :raise DBALPlanRegressionException: Table of shape was read by index and now is read by
+         full scan.
+        """
+
+        dialect = dbal._session.get_bind().dialect.name
+        stored = self._load()
+        snapshots = stored.setdefault(f'{dbal._model.__table__.name}:{dialect}', {})
+        current = self.make_snapshots(dbal, page_shapes(dbal) if shapes is None else shapes)
+
+        report = {'new': [], 'changed': [], 'regressed': []}
+        for name, snapshot in current.items():
+            if (previous := snapshots.get(name)) is None:
+                report['new'].append(name)
+                continue
+
+            if previous['plan'] != snapshot['plan']:
+                report['changed'].append(name)
+
+            for table, access in previous['access'].items():
+                if access == 'index' and snapshot['access'].get(table) == 'full':
+                    report['regressed'].append(name)
+                    break
+
+        if report['regressed'] and not update:
+            details = '; '.join(
+                f'{name}: {" / ".join(current[name]["plan"])}' for name in report['regressed']
+            )
+            raise DBALPlanRegressionException(f'Full scan instead of index in <{details}>.')
+
+        for name, snapshot in current.items():
+            if update or name not in snapshots:
+                snapshots[name] = snapshot
+
+        if update or report['new']:
+            self._save(stored)
+
+        return report
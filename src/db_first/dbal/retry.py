@@ -0,0 +1,167 @@
+import random
+import sqlite3
+from collections import Counter
+from collections.abc import Callable
+from functools import wraps
+from threading import Lock
+from time import monotonic
+from time import sleep
+from typing import Any
+
+from sqlalchemy.exc import DBAPIError
+
+
+class RetryPolicy:
+    """Retry of transactions failed by serialization failure, deadlock or busy database.
+
+    Retryable errors are SQLSTATE `40001` (serialization failure), `40P01` (deadlock detected) of
+    PostgreSQL and `SQLITE_BUSY`, `SQLITE_LOCKED` of SQLite. Delay before retry is chosen randomly
+    from zero to exponential backoff (full jitter).
+
+    :param attempts: Maximal count of attempts including the first one.
+    :param base_delay: Backoff of the first retry in seconds.
+    :param max_delay: Maximal backoff in seconds.
+    :param budget: Maximal time of all attempts in seconds, retry is not made after it.
+    :param on_retry: Callback `on_retry(attempt, error, delay)` called before every retry.
+    """
+
+    retryable_sqlstates = frozenset({'40001', '40P01'})
+    retryable_sqlite_codes = frozenset({sqlite3.SQLITE_BUSY, sqlite3.SQLITE_LOCKED})
+
+    def __init__(
+        self,
+        attempts: int = 3,
+        base_delay: float = 0.05,
+        max_delay: float = 1.0,
+        budget: float = 5.0,
+        on_retry: Callable[[int, BaseException, float], None] | None = None,
+    ) -> None:
+        self._attempts = attempts
+        self._base_delay = base_delay
+        self._max_delay = max_delay
+        self._budget = budget
+        self._on_retry = on_retry
+        self._stats: Counter[str] = Counter()
+        self._lock = Lock()
+
+    @classmethod
+    def error_code(cls, error: BaseException) -> str | None:
+        """Find retryable code of error in chain of exceptions.
+
+        :param error: Exception raised by DBAL or SQLAlchemy.
+        :return: SQLSTATE or name of SQLite error, `None` for not retryable error.
+        """
+
+        seen = set()
+        while error is not None and id(error) not in seen:
+            seen.add(id(error))
+            orig = error.orig if isinstance(error, DBAPIError) else error
+
+            sqlstate = getattr(orig, 'sqlstate', None) or getattr(orig, 'pgcode', None)
+            if sqlstate in cls.retryable_sqlstates:
+                return sqlstate
+
+            sqlite_code = getattr(orig, 'sqlite_errorcode', None)
+            if sqlite_code is not None and sqlite_code & 0xFF in cls.retryable_sqlite_codes:
+                return getattr(orig, 'sqlite_errorname', None) or str(sqlite_code)
+
+            error = error.__cause__ or error.__context__
+
+        return None
+
+    def _delay(self, attempt: int) -> float:
+        return random.uniform(0, min(self._max_delay, self._base_delay * 2 ** (attempt - 1)))
+
+    def run(self, fn: Callable[[], Any], rollback: Callable[[], None] | None = None) -> Any:
+        """Call function and retry it on retryable error.
+
+        :param fn: Function making the whole transaction.
+        :param rollback: Function called after failed attempt before retry.
+        :return: Result of function.
+        """
+
+        started_at = monotonic()
+        attempt = 1
+        while True:
+            try:
+                result = fn()
+            except Exception as e:
+                if (code := self.error_code(e)) is None:
+                    raise
+
+                delay = self._delay(attempt)
+                if attempt >= self._attempts or monotonic() - started_at + delay > self._budget:
+                    self._count('exhausted', code)
+                    raise
+
+                if rollback is not None:
+                    rollback()
+
+                self._count('retries', code)
+                if self._on_retry is not None:
+                    self._on_retry(attempt, e, delay)
+
+                sleep(delay)
+                attempt += 1
+            else:
+                if attempt > 1:
+                    self._count('recovered')
+                return result
+
+    def _count(self, name: str, code: str | None = None) -> None:
+        with self._lock:
+            self._stats[name] += 1
+            if code is not None:
+                self._stats[f'{name}:{code}'] += 1
+
+    def stats(self) -> dict[str, int]:
+        """Counters of retries.
+
+        :return: Counts of `retries`, `recovered` and `exhausted` calls, also per error code as
+         `retries:<code>` and `exhausted:<code>`.
+        """
+
+        with self._lock:
+            return dict(self._stats)
+
+
+def retryable(method: Callable[..., Any]) -> Callable[..., Any]:
+    """Retry DBAL mutator by `_retry_policy` of DBAL.
+
+    Mutator is retried only if it is the whole transaction: outside of `transaction()` and when
+    session has no started transaction, otherwise earlier work of transaction would be lost.
+    """
+
+    @wraps(method)
+    def wrapper(self, *args, **kwargs):
+        if self._retry_policy is None or self._unit_of_work() or self._session.in_transaction():
+            return method(self, *args, **kwargs)
+
+        return self._retry_policy.run(
+            lambda: method(self, *args, **kwargs), rollback=self._session.rollback
+        )
+
+    return wrapper
+
+
+class RetryMixin:
+    """Retry of mutators and units of work by `_retry_policy`."""
+
+    _retry_policy: RetryPolicy | None = None
+
+    def run_transaction[T](self, fn: Callable[[Any], T], deferred_flush: bool = False) -> T:
+        """Run function in `transaction()` and retry the whole transaction on retryable error.
+
+        :param fn: Function with DBAL as argument, it can be called several times.
+        :param deferred_flush: Parameter of `transaction()`.
+        :return: Result of function.
+        """
+
+        def _run() -> T:
+            with self.transaction(deferred_flush=deferred_flush) as dbal:
+                return fn(dbal)
+
+        if self._retry_policy is None or self._unit_of_work():
+            return _run()
+
+        return self._retry_policy.run(_run, rollback=self._session.rollback)
@@ -0,0 +1,194 @@
+import asyncio
+import copy
+import json
+from collections import Counter
+from collections.abc import Awaitable
+from collections.abc import Callable
+from threading import Event
+from threading import Lock
+from typing import Any
+
+from db_first.dbal.cache import dump_result
+from db_first.dbal.exceptions import DBALException
+
+
+def _copy_error(error: BaseException) -> BaseException:
+    """Copy of exception of leader, so callers of other threads do not share one instance."""
+
+    try:
+        copied = copy.copy(error)
+    except Exception:
+        copied = DBALException(error)
+
+    copied.__cause__ = error
+    return copied
+
+
+class _Call:
+    __slots__ = ('done', 'result', 'error')
+
+    def __init__(self) -> None:
+        self.done = Event()
+        self.result: Any = None
+        self.error: BaseException | None = None
+
+
+class SingleFlight:
+    """De-duplication of concurrent identical calls.
+
+    The first caller of key executes function, callers of the same key arrived before it finished
+    wait and get its result or copy of its exception. Result is not kept after call, it is not
+    cache.
+    """
+
+    def __init__(self) -> None:
+        self._calls: dict[Any, _Call] = {}
+        self._async_calls: dict[Any, asyncio.Future] = {}
+        self._stats: Counter[str] = Counter()
+        self._lock = Lock()
+
+    def do(self, key: Any, fn: Callable[[], Any]) -> tuple[Any, bool]:
+        """Call function once for all threads calling it with the same key at the same time.
+
+        :param key: Hashable key of call.
+        :param fn: Function.
+        :return: Result of function and flag, whether result is shared from call of other thread.
+        """
+
+        with self._lock:
+            self._stats['calls'] += 1
+            call = self._calls.get(key)
+            if leader := call is None:
+                call = self._calls[key] = _Call()
+                self._stats['leaders'] += 1
+
+        if not leader:
+            call.done.wait()
+            self._count_shared()
+            if call.error is not None:
+                raise _copy_error(call.error)
+            return call.result, True
+
+        try:
+            call.result = fn()
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+
+        return call.result, False
+
+    async def do_async(self, key: Any, fn: Callable[[], Awaitable[Any]]) -> tuple[Any, bool]:
+        """Asyncio flavour of `do`, calls are shared inside of one event loop.
+
+        If leader is cancelled, waiting tasks call function again.
+
+        :param key: Hashable key of call.
+        :param fn: Coroutine function.
+        :return: Result of function and flag, whether result is shared from other task.
+        """
+
+        loop = asyncio.get_running_loop()
+        loop_key = (id(loop), key)
+
+        with self._lock:
+            self._stats['calls'] += 1
+
+        while True:
+            with self._lock:
+                future = self._async_calls.get(loop_key)
+                if leader := future is None:
+                    future = self._async_calls[loop_key] = loop.create_future()
+                    self._stats['leaders'] += 1
+
+            if leader:
+                break
+
+            try:
+                result = await asyncio.shield(future)
+            except asyncio.CancelledError:
+                if future.cancelled() and not asyncio.current_task().cancelling():
+                    continue
+                raise
+            except Exception as e:
+                self._count_shared()
+                raise _copy_error(e)
+
+            self._count_shared()
+            return result, True
+
+        try:
+            result = await fn()
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except BaseException as e:
+            future.set_exception(e)
+            future.exception()
+            raise
+        else:
+            future.set_result(result)
+        finally:
+            with self._lock:
+                del self._async_calls[loop_key]
+
+        return result, False
+
+    def _count_shared(self) -> None:
+        with self._lock:
+            self._stats['shared'] += 1
+
+    def stats(self) -> dict[str, int]:
+        """Metrics of coalescing.
+
+        :return: Count of `calls`, `leaders` executed function, `shared` got result of other call
+         and `in_flight` calls now.
+        """
+
+        with self._lock:
+            return {
+                'calls': self._stats['calls'],
+                'leaders': self._stats['leaders'],
+                'shared': self._stats['shared'],
+                'in_flight': len(self._calls) + len(self._async_calls),
+            }
+
+
+class SingleFlightMixin:
+    """Single-flight of `read` and `paginate`, enabled by setting `_single_flight`.
+
+    Key of call is model, cache key of statement and its parameters. Leader reads objects in own
+    session, other callers get copies of them merged into their sessions without queries. Calls of
+    sessions with uncommitted changes are not coalesced, they read own state of transaction.
+    """
+
+    _single_flight: SingleFlight | None = None
+
+    def _single_flight_key(self, statement: Any, *extra: Any) -> tuple[Any, ...]:
+        """Key of statement without compiling it, statement without cache key is compiled."""
+
+        extra_key = json.dumps(extra, default=str)
+        if (cache_key := statement._generate_cache_key()) is None:
+            compiled = statement.compile(dialect=self._session.get_bind().dialect)
+            params = json.dumps(compiled.params, sort_keys=True, default=str)
+            return self._cache_name(), str(compiled), params, extra_key
+
+        params = json.dumps([bind.effective_value for bind in cache_key.bindparams], default=str)
+        return self._cache_name(), cache_key.key, params, extra_key
+
+    def _is_single_flight_usable(self) -> bool:
+        return self._single_flight is not None and not self._has_uncommitted_changes()
+
+    def _run_single_flight(self, key: str, fn: Callable[[], dict[str, Any]]) -> dict[str, Any]:
+        def _lead() -> tuple[dict[str, Any], dict[str, Any]]:
+            result = fn()
+            return result, dump_result(result)
+
+        (result, data), shared = self._single_flight.do(key, _lead)
+        if shared:
+            return self._load_result(data)
+
+        return result
@@ -2,17 +2,32 @@ from typing import Any
 from typing import get_args
 from typing import Literal
 
-from db_first.dbal.exceptions import DBALColumnNonExistException
+from db_first.dbal.archive import ArchiveMixin
+from db_first.dbal.bulk import BulkMixin
+from db_first.dbal.cache import CacheMixin
+from db_first.dbal.change_feed import ChangeFeedMixin
+from db_first.dbal.counter_cache import CounterCacheMixin
 from db_first.dbal.exceptions import DBALCreateException
-from db_first.dbal.exceptions import DBALForeignKeyConstraintFailedException
-from db_first.dbal.exceptions import DBALNotNullConstraintFailedException
 from db_first.dbal.exceptions import DBALObjectNotFoundException
 from db_first.dbal.exceptions import DBALUnexpectedValueTypeException
 from db_first.dbal.exceptions import DBALUpdateException
+from db_first.dbal.handlers import compile_error_handler
+from db_first.dbal.handlers import integrity_error_handler
+from db_first.dbal.loader import ReadLoader
 from db_first.dbal.paginate import PageMixin
-from sqlalchemy import delete
+from db_first.dbal.profiling import ProfilingMixin
+from db_first.dbal.retry import retryable
+from db_first.dbal.retry import RetryMixin
+from db_first.dbal.single_flight import SingleFlightMixin
+from db_first.dbal.unit_of_work import UnitOfWorkMixin
+from db_first.dbal.versioning import VersioningMixin
+from db_first.expressions import in_list
+from db_first.profiling import profiled
+from sqlalchemy import func
 from sqlalchemy import insert
 from sqlalchemy import Result
+from sqlalchemy import Row
+from sqlalchemy import Select
 from sqlalchemy import select
 from sqlalchemy import Sequence
 from sqlalchemy import update
@@ -24,29 +39,19 @@ from sqlalchemy.orm import Session
 from sqlalchemy.orm.exc import StaleDataError
 
 
-def compile_error_handler(e: CompileError) -> None:
-    if e.args[0].startswith('Unconsumed column names:'):
-        raise DBALColumnNonExistException(e)
-
-
-def integrity_error_handler(e: IntegrityError, s: Session) -> None:
-    db_type = s.get_bind().name
-
-    if db_type == 'sqlite':
-        if e.orig.sqlite_errorname == 'SQLITE_CONSTRAINT_NOTNULL':
-            raise DBALNotNullConstraintFailedException(e.orig.args[0])
-        if e.orig.sqlite_errorname == 'SQLITE_CONSTRAINT_FOREIGNKEY':
-            raise DBALForeignKeyConstraintFailedException(e.orig.args[0])
-
-    elif db_type == 'postgresql':
-        if 'is not present in table' in e.orig.diag.message_detail:
-            raise DBALForeignKeyConstraintFailedException(e.orig.diag.message_detail)
-
-    else:
-        raise NotImplementedError(f'DB <{db_type}> not implemented.')
-
-
-class SqlaDBAL[M](PageMixin):
+class SqlaDBAL[M](
+    PageMixin,
+    BulkMixin,
+    ArchiveMixin,
+    VersioningMixin,
+    UnitOfWorkMixin,
+    CacheMixin,
+    RetryMixin,
+    ChangeFeedMixin,
+    SingleFlightMixin,
+    ProfilingMixin,
+    CounterCacheMixin,
+):
     """Base SqlaDBAL, implement base CRUD sqlalchemy operations."""
 
     _model: type[M]
@@ -56,7 +61,11 @@ class SqlaDBAL[M](PageMixin):
 
     def __init__(self, session: Session) -> None:
         self._session = session
+        if self._cache_backend is not None or self._single_flight is not None:
+            self._listen_cache_events()
 
+    @profiled(enforce_budget=False)
+    @retryable
     def create(self, **kwargs) -> M:
         try:
             new_obj = self._model(**kwargs)
@@ -66,91 +75,180 @@ class SqlaDBAL[M](PageMixin):
         self._session.add(new_obj)
 
         try:
-            self._session.commit()
+            self._count_created([new_obj])
+            self._commit()
 
         except CompileError as e:
-            self._session.rollback()
+            self._rollback()
             compile_error_handler(e)
             raise DBALCreateException(e)
 
         except IntegrityError as e:
-            self._session.rollback()
+            self._rollback()
             integrity_error_handler(e, self._session)
             raise DBALCreateException(e)
 
         except ProgrammingError as e:
-            self._session.rollback()
+            self._rollback()
             raise DBALUnexpectedValueTypeException(e)
 
         except Exception as e:
             raise DBALCreateException(e)
 
+        self._invalidate_cache()
         return new_obj
 
+    @profiled(enforce_budget=False)
+    @retryable
     def bulk_create(self, data: list[dict]) -> Result[Any]:
+        stmt = insert(self._model)
+        if self._counter_cache is not None:
+            stmt = stmt.returning(self._model.id, *self._counter_returning())
+
         try:
-            new_objects = self._session.execute(insert(self._model), data)
+            new_objects = self._session.execute(stmt, data)
+            if self._counter_cache is not None:
+                frozen = new_objects.freeze()
+                self._change_counters([row._mapping for row in frozen()], 1)
+                new_objects = frozen()
         except (IntegrityError, ProgrammingError) as e:
             raise DBALCreateException(e)
 
+        self._invalidate_cache()
         return new_objects
 
+    @profiled
     def read(self, id: Any) -> M:
-        stmt = select(self._model).where(self._model.id == id)
+        stmt = select(self._model).where(self._model.id == id, *self._live_filters())
+
+        if not self._is_single_flight_usable():
+            return self._read_one(stmt)
+
+        key = self._single_flight_key(stmt)
+        result = self._run_single_flight(key, lambda: {'items': [self._read_one(stmt)]})
+        return result['items'][0]
 
+    def _read_one(self, stmt: Select) -> M:
         try:
             return self._session.scalars(stmt).one()
         except NoResultFound as e:
             raise DBALObjectNotFoundException(e)
 
+    @profiled
     def bulk_read(self, ids: list[Any]) -> Sequence[M]:
-        return self.read_filtered_list(id=ids)
+        return self._read_by_ids(ids, *self._live_filters())
 
+    def loader(self) -> ReadLoader:
+        """Make request-scoped loader for batched reading of objects by id."""
+
+        return ReadLoader(self)
+
+    @profiled
     def read_all(self) -> Sequence[M]:
-        stmt = select(self._model)
+        stmt = select(self._model).where(*self._live_filters())
         return self._session.scalars(stmt).all()
 
+    @profiled
     def read_filtered(self, **kwargs) -> M:
         filters = [getattr(self._model, k) == v for k, v in kwargs.items()]
-        stmt = select(self._model).where(*filters)
+        stmt = select(self._model).where(*filters, *self._live_filters())
 
         try:
             return self._session.scalars(stmt).one()
         except NoResultFound as e:
             raise DBALObjectNotFoundException(e)
 
-    def read_filtered_list(
-        self, sort_order: Literal['asc', 'desc'] = 'asc', sort_field: str | None = None, **kwargs
-    ) -> Sequence[M]:
-        filters = []
+    def _make_filters(self, **kwargs) -> list[Any]:
+        filters = self._live_filters()
         for k, v in kwargs.items():
             if isinstance(v, list):
-                filters.append(getattr(self._model, k).in_(v))
+                filters.append(in_list(getattr(self._model, k), v))
             else:
                 filters.append(getattr(self._model, k) == v)
 
-        stmt = select(self._model).where(*filters)
+        return filters
+
+    def _make_order_column(self, sort_order: Literal['asc', 'desc'], sort_field: str) -> Any:
+        if sort_order == 'desc':
+            return getattr(self._model, sort_field).desc()
+
+        return getattr(self._model, sort_field)
+
+    @profiled
+    def read_filtered_list(
+        self, sort_order: Literal['asc', 'desc'] = 'asc', sort_field: str | None = None, **kwargs
+    ) -> Sequence[M]:
+        stmt = select(self._model).where(*self._make_filters(**kwargs))
 
         if sort_field:
-            if sort_order == 'desc':
-                order_column = getattr(self._model, sort_field).desc()
-            else:
-                order_column = getattr(self._model, sort_field)
-            stmt = stmt.order_by(order_column)
+            stmt = stmt.order_by(self._make_order_column(sort_order, sort_field))
 
         return self._session.scalars(stmt).all()
 
+    def exists(self, **kwargs) -> bool:
+        """Check existence of object by filters of `read_filtered_list`, objects are not read."""
+
+        stmt = select(select(self._model.id).where(*self._make_filters(**kwargs)).exists())
+        return self._session.scalar(stmt)
+
+    def count_filtered(self, **kwargs) -> int:
+        """Count objects by filters of `read_filtered_list`."""
+
+        stmt = select(func.count()).select_from(self._model).where(*self._make_filters(**kwargs))
+        return self._session.scalar(stmt)
+
+    def first_filtered(
+        self,
+        columns: list[str] | None = None,
+        sort_order: Literal['asc', 'desc'] = 'asc',
+        sort_field: str | None = None,
+        **kwargs,
+    ) -> M | Row | None:
+        """Read first object by filters of `read_filtered_list`.
+
+        :param columns: Read only these columns instead of object.
+        :param sort_order: Order of sorting `asc` or `desc`.
+        :param sort_field: Column for sorting.
+        :param kwargs: Filters, list of values is filter `IN`.
+        :return: Object, row of columns or `None` if there is no object.
+        """
+
+        if columns:
+            stmt = select(*[getattr(self._model, column) for column in columns])
+        else:
+            stmt = select(self._model)
+        stmt = stmt.where(*self._make_filters(**kwargs))
+
+        if sort_field:
+            stmt = stmt.order_by(self._make_order_column(sort_order, sort_field))
+
+        result = self._session.execute(stmt.limit(1))
+        return result.first() if columns else result.scalars().first()
+
+    @profiled(enforce_budget=False)
+    @retryable
     def update(self, id: Any, **data) -> M:
-        stmt = update(self._model).where(self._model.id == id).values(**data).returning(self._model)
+        version_filters, expected_version = self._pop_version(data)
+        stmt = (
+            update(self._model)
+            .where(self._model.id == id, *self._live_filters(), *version_filters)
+            .values(**data)
+            .returning(self._model)
+        )
 
         try:
             obj = self._session.scalars(stmt).one()
+        except NoResultFound as e:
+            if expected_version is not None:
+                self._raise_version_conflict(id, expected_version)
+            raise DBALUpdateException(e)
+
         except CompileError as e:
             compile_error_handler(e)
             raise DBALUpdateException(e)
 
         except IntegrityError as e:
-            self._session.rollback()
+            self._rollback()
             integrity_error_handler(e, self._session)
             raise DBALUpdateException(e)
 
@@ -160,20 +258,43 @@ class SqlaDBAL[M](PageMixin):
         except Exception as e:
             raise DBALUpdateException(e)
 
+        self._invalidate_cache()
         return obj
 
+    @profiled(enforce_budget=False)
+    @retryable
     def bulk_update(self, data: list[dict]) -> None:
         try:
-            self._session.execute(update(self._model), data)
+            if self._is_versioned() or self._is_soft_delete():
+                self._bulk_update_checked(data)
+            else:
+                self._session.execute(update(self._model), data)
         except ProgrammingError as e:
             raise DBALUpdateException(e)
         except StaleDataError as e:
             raise DBALObjectNotFoundException(e)
 
-    def delete(self, id: Any) -> None:
-        self._session.execute(delete(self._model).where(self._model.id == id))
-        self._session.commit()
-
+        self._invalidate_cache()
+
+    @profiled(enforce_budget=False)
+    @retryable
+    def delete(self, id: Any) -> bool:
+        stmt = (
+            self._make_delete_stmt()
+            .where(self._model.id == id)
+            .returning(self._model.id, *self._counter_returning())
+        )
+        row = self._session.execute(stmt).first()
+        deleted = row is not None
+        if deleted:
+            self._change_counters([row._mapping], -1)
+        self._commit()
+        self._invalidate_cache()
+        return deleted
+
+    @profiled(enforce_budget=False)
+    @retryable
     def bulk_delete(self, ids: list[Any]) -> None:
-        self._session.execute(delete(self._model).where(self._model.id.in_(ids)))
-        self._session.commit()
+        self._delete_by_ids(ids)
+        self._commit()
+        self._invalidate_cache()
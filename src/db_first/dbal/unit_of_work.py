@@ -0,0 +1,80 @@
+from collections.abc import Iterator
+from contextlib import contextmanager
+from typing import Self
+
+from db_first.dbal.exceptions import DBALTransactionException
+from db_first.dbal.handlers import integrity_error_handler
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm import SessionTransaction
+
+
+class UnitOfWorkMixin:
+    """Unit of work: several calls of DBAL methods are committed once.
+
+    State of transaction is kept in `Session.info`, so all DBAL objects with the same session take
+    part in transaction.
+    """
+
+    _unit_of_work_key = 'db_first_unit_of_work'
+
+    def _unit_of_work(self) -> list[bool]:
+        return self._session.info.setdefault(self._unit_of_work_key, [])
+
+    def _commit(self) -> None:
+        """Commit session, inside of transaction only flush it or do nothing for deferred flush."""
+
+        if not (unit_of_work := self._unit_of_work()):
+            self._session.commit()
+        elif not unit_of_work[-1]:
+            self._session.flush()
+
+    def _rollback(self) -> None:
+        """Rollback session, inside of transaction it is rolled back on exit."""
+
+        if not self._unit_of_work():
+            self._session.rollback()
+
+    @contextmanager
+    def transaction(self, deferred_flush: bool = False) -> Iterator[Self]:
+        """Run DBAL methods in one transaction with one commit on exit.
+
+        Mutators only flush session inside of transaction. Nested transaction is savepoint, error
+        inside of it rolls back only the savepoint.
+
+        :param deferred_flush: Do not flush session in mutators, flush it once on exit. Generated
+         values, e.g. `id`, are not available until exit.
+        :return: Context manager returning this DBAL.
+        """
+
+        unit_of_work = self._unit_of_work()
+        nested = self._session.begin_nested() if unit_of_work else None
+        unit_of_work.append(deferred_flush)
+
+        try:
+            yield self
+            self._end_transaction(nested)
+        except BaseException:
+            if nested is None:
+                self._session.rollback()
+            else:
+                nested.rollback()
+            raise
+        finally:
+            unit_of_work.pop()
+
+    def _end_transaction(self, nested: SessionTransaction | None) -> None:
+        try:
+            if nested is None:
+                self._session.commit()
+            else:
+                nested.commit()
+
+        except IntegrityError as e:
+            integrity_error_handler(e, self._session)
+            raise DBALTransactionException(e)
+
+        except SQLAlchemyError as e:
+            raise DBALTransactionException(e)
+
+        self._invalidate_cache()
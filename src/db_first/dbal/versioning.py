@@ -0,0 +1,109 @@
+from typing import Any
+
+from db_first.base_model import VersionMixin
+from db_first.dbal.exceptions import DBALObjectNotFoundException
+from db_first.dbal.exceptions import DBALUpdateException
+from db_first.dbal.exceptions import DBALVersionConflictException
+from db_first.expressions import in_list
+from sqlalchemy import bindparam
+from sqlalchemy import func
+from sqlalchemy import select
+from sqlalchemy import Update
+from sqlalchemy import update
+from sqlalchemy.orm.util import identity_key
+
+
+class VersioningMixin:
+    """Optimistic concurrency control for models with `VersionMixin`.
+
+    Version is checked and incremented in the same `UPDATE` statement, conflict raises
+    `DBALVersionConflictException`.
+    """
+
+    def _is_versioned(self) -> bool:
+        return issubclass(self._model, VersionMixin)
+
+    def _pop_version(self, data: dict[str, Any]) -> tuple[list[Any], Any]:
+        """Take expected version from data and add increment of version to data.
+
+        :param data: Values for update.
+        :return: Filters for update statement and expected version.
+        """
+
+        if not self._is_versioned():
+            return [], None
+
+        expected_version = data.pop('version', None)
+        data['version'] = self._model.version + 1
+
+        if expected_version is None:
+            return [], None
+
+        return [self._model.version == expected_version], expected_version
+
+    def _raise_version_conflict(self, id: Any, expected_version: Any) -> None:
+        stmt = select(self._model.version).where(self._model.id == id, *self._live_filters())
+        if (actual_version := self._session.scalar(stmt)) is not None:
+            raise DBALVersionConflictException(
+                f'Version <{expected_version}> of object <{id}> is outdated,'
+                f' actual version <{actual_version}>.'
+            )
+
+    def _make_bulk_update_stmt(self, keys: frozenset[str]) -> Update:
+        table = self._model.__table__
+        values = {key: bindparam(f'_{key}') for key in keys - {'id', 'version'}}
+        stmt = update(table).where(table.c.id == bindparam('_id'), *self._live_filters())
+        if self._is_versioned():
+            values['version'] = table.c.version + 1
+            if 'version' in keys:
+                stmt = stmt.where(table.c.version == bindparam('_version'))
+
+        return stmt.values(**values)
+
+    def _bulk_update_checked(self, data: list[dict]) -> None:
+        """Update rows by id with check of count of updated rows.
+
+        Only live rows are updated, version is checked and incremented for versioned models. Rows
+        are updated in savepoint, conflict rolls back only this update.
+        """
+
+        groups: dict[frozenset[str], list[dict]] = {}
+        for row in data:
+            if 'id' not in row:
+                raise DBALUpdateException(f'Object without <id>: <{row}>.')
+            groups.setdefault(frozenset(row), []).append(row)
+
+        with self._session.begin_nested():
+            updated = 0
+            for keys, rows in groups.items():
+                result = self._session.execute(
+                    self._make_bulk_update_stmt(keys),
+                    [{f'_{k}': v for k, v in row.items()} for row in rows],
+                )
+                updated += result.rowcount
+
+            for row in data:
+                obj = self._session.identity_map.get(identity_key(self._model, row['id']))
+                if obj is not None:
+                    self._session.expire(obj)
+
+            if updated != len(data):
+                self._raise_bulk_update_conflict(data, updated)
+
+    def _raise_bulk_update_conflict(self, data: list[dict], updated: int) -> None:
+        table = self._model.__table__
+        ids = [row['id'] for row in data]
+        exist_count = self._session.scalar(
+            select(func.count())
+            .select_from(table)
+            .where(in_list(table.c.id, ids), *self._live_filters())
+        )
+
+        if exist_count != len(set(ids)):
+            raise DBALObjectNotFoundException(
+                f'Objects not found: <{len(set(ids)) - exist_count}>.'
+            )
+
+        raise DBALVersionConflictException(
+            f'Expected to update <{len(data)}> objects, but updated <{updated}>.'
+        )
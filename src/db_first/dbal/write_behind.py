@@ -0,0 +1,305 @@
+import asyncio
+import queue
+from collections.abc import Callable
+from concurrent.futures import Future
+from threading import Condition
+from threading import Lock
+from threading import Thread
+from time import monotonic
+from typing import Any
+from typing import Self
+
+from db_first.dbal.exceptions import DBALCreateException
+from db_first.dbal.exceptions import DBALException
+from db_first.dbal.exceptions import DBALWriteBehindOverflowException
+from sqlalchemy import insert
+from sqlalchemy.orm import Session
+
+_stop = object()
+
+
+class _WriteBehindBase:
+    def __init__(
+        self,
+        dbal: type,
+        session_factory: Callable[[], Session],
+        batch_size: int = 500,
+        max_delay: float = 0.05,
+        max_pending: int = 10_000,
+    ) -> None:
+        self._dbal = dbal
+        self._session_factory = session_factory
+        self._batch_size = batch_size
+        self._max_delay = max_delay
+        self._max_pending = max_pending
+        self._closed = False
+
+    def _check_open(self) -> None:
+        if self._closed:
+            raise DBALCreateException('Buffer of write-behind is closed.')
+
+    def _flush(self, rows: list[dict[str, Any]]) -> list[Any]:
+        """Insert rows by one statement, on error insert them one by one by `create`.
+
+        Counters of `CounterCacheMixin` are changed in the same transaction.
+
+        :param rows: Data of objects.
+        :return: Ids of created objects or exceptions in order of rows.
+        """
+
+        session = self._session_factory()
+        try:
+            dbal = self._dbal(session)
+            model = dbal._model
+            stmt = insert(model).returning(
+                model.id, *dbal._counter_returning(), sort_by_parameter_order=True
+            )
+            try:
+                created = [row._mapping for row in session.execute(stmt, rows).all()]
+                dbal._change_counters(created, 1)
+                results = [row['id'] for row in created]
+                session.commit()
+            except Exception:
+                session.rollback()
+                results = [self._create_one(dbal, session, row) for row in rows]
+
+            dbal._invalidate_cache()
+            return results
+        finally:
+            session.close()
+
+    @staticmethod
+    def _create_one(dbal: Any, session: Session, row: dict[str, Any]) -> Any:
+        try:
+            return dbal.create(**row).id
+        except Exception as e:
+            session.rollback()
+            return e if isinstance(e, DBALException) else DBALCreateException(e)
+
+
+class WriteBehindBuffer(_WriteBehindBase):
+    """Write-behind buffer of `create`, objects of many threads are inserted by one statement.
+
+    Batch is inserted when it has `batch_size` objects or after `max_delay` seconds since the first
+    object of batch. Batch is inserted by Core `INSERT ... RETURNING`, so validators of model are
+    not called, like in `bulk_create`. If batch fails, its objects are created one by one by
+    `create` and every future gets own result.
+
+    :param dbal: Class of DBAL.
+    :param session_factory: Factory of sessions, buffer uses own session for every batch.
+    :param batch_size: Maximal count of objects in batch.
+    :param max_delay: Maximal delay of insertion in seconds.
+    :param max_pending: Maximal count of objects waiting for insertion.
+    """
+
+    def __init__(self, *args, **kwargs) -> None:
+        super().__init__(*args, **kwargs)
+        self._queue: queue.Queue = queue.Queue(maxsize=self._max_pending)
+        self._thread: Thread | None = None
+        self._lock = Lock()
+        self._idle = Condition(self._lock)
+        self._submitting = 0
+
+    def start(self) -> Self:
+        self._thread = Thread(target=self._run, name='db-first-write-behind', daemon=True)
+        self._thread.start()
+        return self
+
+    def close(self, timeout: float | None = None) -> None:
+        """Wait for running `submit`, insert pending objects and stop buffer.
+
+        Objects of buffer which was not started are not inserted, their futures fail.
+        """
+
+        with self._lock:
+            if self._closed:
+                return
+
+            self._closed = True
+            while self._submitting:
+                if self._thread is None:
+                    self._fail_pending()
+                self._idle.wait()
+
+        if self._thread is None:
+            self._fail_pending()
+            return
+
+        self._queue.put(_stop)
+        self._thread.join(timeout)
+
+    def __enter__(self) -> Self:
+        return self.start()
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+    def submit(self, timeout: float | None = None, **data) -> Future:
+        """Add object to buffer, waits for free place if buffer is full.
+
+        :param timeout: Maximal waiting for free place in seconds, `None` waits without limit.
+        :param data: Data of object.
+        :return: Future of id of created object.
+        """
+
+        with self._lock:
+            self._check_open()
+            self._submitting += 1
+
+        future = Future()
+        try:
+            self._queue.put((data, future), timeout=timeout)
+        except queue.Full:
+            raise DBALWriteBehindOverflowException(
+                f'Buffer of write-behind is full: <{self._max_pending}> objects.'
+            )
+        finally:
+            with self._lock:
+                self._submitting -= 1
+                self._idle.notify_all()
+
+        return future
+
+    def create(self, **data) -> Any:
+        return self.submit(**data).result()
+
+    def _run(self) -> None:
+        stopped = False
+        while not stopped:
+            if (item := self._queue.get()) is _stop:
+                break
+
+            batch = [item]
+            deadline = monotonic() + self._max_delay
+            while len(batch) < self._batch_size and (remaining := deadline - monotonic()) > 0:
+                try:
+                    item = self._queue.get(timeout=remaining)
+                except queue.Empty:
+                    break
+                if item is _stop:
+                    stopped = True
+                    break
+                batch.append(item)
+
+            self._write(batch)
+
+        self._fail_pending()
+
+    def _fail_pending(self) -> None:
+        while True:
+            try:
+                item = self._queue.get_nowait()
+            except queue.Empty:
+                return
+            if item is not _stop:
+                item[1].set_exception(DBALCreateException('Buffer of write-behind is closed.'))
+
+    def _write(self, batch: list[tuple[dict[str, Any], Future]]) -> None:
+        try:
+            results = self._flush([data for data, _ in batch])
+        except Exception as e:
+            results = [DBALCreateException(e)] * len(batch)
+
+        for (_, future), result in zip(batch, results):
+            if isinstance(result, Exception):
+                future.set_exception(result)
+            else:
+                future.set_result(result)
+
+
+class AsyncWriteBehindBuffer(_WriteBehindBase):
+    """Asyncio flavour of `WriteBehindBuffer`, batches are inserted in default executor of loop.
+
+    Parameters are the same as in `WriteBehindBuffer`.
+    """
+
+    def __init__(self, *args, **kwargs) -> None:
+        super().__init__(*args, **kwargs)
+        self._queue: asyncio.Queue | None = None
+        self._task: asyncio.Task | None = None
+        self._submitting = 0
+        self._idle: asyncio.Event | None = None
+
+    async def start(self) -> Self:
+        self._queue = asyncio.Queue(maxsize=self._max_pending)
+        self._idle = asyncio.Event()
+        self._idle.set()
+        self._task = asyncio.create_task(self._run())
+        return self
+
+    async def close(self) -> None:
+        """Wait for running `submit`, insert pending objects and stop buffer."""
+
+        if self._closed:
+            return
+
+        self._closed = True
+        await self._idle.wait()
+        await self._queue.put(_stop)
+        await self._task
+
+    async def __aenter__(self) -> Self:
+        return await self.start()
+
+    async def __aexit__(self, *exc_info: Any) -> None:
+        await self.close()
+
+    async def submit(self, timeout: float | None = None, **data) -> asyncio.Future:
+        """Add object to buffer, waits for free place if buffer is full.
+
+        :param timeout: Maximal waiting for free place in seconds, `None` waits without limit.
+        :param data: Data of object.
+        :return: Future of id of created object.
+        """
+
+        self._check_open()
+        future = asyncio.get_running_loop().create_future()
+        self._submitting += 1
+        self._idle.clear()
+        try:
+            await asyncio.wait_for(self._queue.put((data, future)), timeout)
+        except TimeoutError:
+            raise DBALWriteBehindOverflowException(
+                f'Buffer of write-behind is full: <{self._max_pending}> objects.'
+            )
+        finally:
+            self._submitting -= 1
+            if not self._submitting:
+                self._idle.set()
+
+        return future
+
+    async def create(self, **data) -> Any:
+        return await (await self.submit(**data))
+
+    async def _run(self) -> None:
+        loop = asyncio.get_running_loop()
+        stopped = False
+        while not stopped:
+            if (item := await self._queue.get()) is _stop:
+                break
+
+            batch = [item]
+            deadline = loop.time() + self._max_delay
+            while len(batch) < self._batch_size and (remaining := deadline - loop.time()) > 0:
+                try:
+                    item = await asyncio.wait_for(self._queue.get(), remaining)
+                except TimeoutError:
+                    break
+                if item is _stop:
+                    stopped = True
+                    break
+                batch.append(item)
+
+            try:
+                results = await loop.run_in_executor(None, self._flush, [data for data, _ in batch])
+            except Exception as e:
+                results = [DBALCreateException(e)] * len(batch)
+
+            for (_, future), result in zip(batch, results):
+                if future.done():
+                    continue
+                if isinstance(result, Exception):
+                    future.set_exception(result)
+                else:
+                    future.set_result(result)
@@ -1,2 +1,6 @@
 class DBFirstError(Exception):
     """Common exception for errors."""
+
+
+class MemoryBudgetError(DBFirstError):
+    """Exception if call allocated more memory than budget of profiler."""
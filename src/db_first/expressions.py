@@ -0,0 +1,54 @@
+from collections.abc import Iterable
+from typing import Any
+
+from sqlalchemy import any_
+from sqlalchemy import bindparam
+from sqlalchemy import Boolean
+from sqlalchemy.dialects.postgresql import ARRAY
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.sql.elements import ColumnElement
+from sqlalchemy.sql.visitors import InternalTraversal
+
+
+class InList(ColumnElement[bool]):
+    """Expression `column IN (...)` with one bound parameter for any count of values.
+
+    On PostgreSQL it is compiled to `column = ANY(:array)`, so statement has the same text for
+    lists of any length. On other databases it is compiled to expanding `IN`, so count of values is
+    limited by database (SQLite limit is 32766 variables).
+    """
+
+    __visit_name__ = 'in_list'
+    inherit_cache = True
+    _is_implicitly_boolean = True
+    _traverse_internals = [
+        ('column', InternalTraversal.dp_clauseelement),
+        ('values', InternalTraversal.dp_clauseelement),
+    ]
+    type = Boolean()
+
+    def __init__(self, column: Any, values: Iterable[Any]) -> None:
+        self.column = column
+        self.values = bindparam(
+            getattr(column, 'key', None),
+            list(values),
+            type_=column.type,
+            expanding=True,
+            unique=True,
+        )
+
+
+def in_list(column: Any, values: Iterable[Any]) -> InList:
+    return InList(column, values)
+
+
+@compiles(InList)
+def _compile_in_list(element: InList, compiler: Any, **kw: Any) -> str:
+    return compiler.process(element.column.in_(element.values), **kw)
+
+
+@compiles(InList, 'postgresql')
+def _compile_in_list_postgresql(element: InList, compiler: Any, **kw: Any) -> str:
+    values = element.values._with_binary_element_type(ARRAY(element.column.type))
+    values.expanding = False
+    return compiler.process(element.column == any_(values), **kw)
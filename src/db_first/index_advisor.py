@@ -0,0 +1,313 @@
+import hashlib
+from collections.abc import Iterable
+from threading import Lock
+from typing import Any
+from typing import NamedTuple
+
+from db_first.base_model import SoftDeleteMixin
+from db_first.operators import is_true
+from sqlalchemy import Index
+from sqlalchemy import PrimaryKeyConstraint
+from sqlalchemy import text
+from sqlalchemy import UniqueConstraint
+
+equality_operators = frozenset(['eq', 'in', 'isnull', 'notnull'])
+range_operators = frozenset(['lt', 'le', 'ge', 'gt', 'between'])
+
+# Identifiers of PostgreSQL are truncated to 63 bytes.
+max_index_name_length = 63
+
+
+class QueryShape(NamedTuple):
+    """Shape of statement: filters `(column, operator)` and sorting `(column, direction)`."""
+
+    table: str
+    filters: tuple[tuple[str, str], ...]
+    order_by: tuple[tuple[str, str], ...]
+
+
+class _ShapeStats:
+    __slots__ = ('count', 'timed', 'latency_total', 'latency_max')
+
+    def __init__(self) -> None:
+        self.count = 0
+        self.timed = 0
+        self.latency_total = 0.0
+        self.latency_max = 0.0
+
+
+def _collect_filters(where: dict[str, Any]) -> Iterable[tuple[str, str]]:
+    if 'col' in where:
+        opr = where['opr']
+        if opr == 'isnull' and not is_true(where['value']):
+            opr = 'notnull'
+        yield where['col'], opr
+        return
+
+    for expressions in where.values():
+        for expression in expressions:
+            yield from _collect_filters(expression)
+
+
+class ShapeRecorder:
+    """Recorder of shapes of statements of `paginate` and `aggregate`.
+
+    Set `_shape_recorder` of DBAL for recording, e.g. `SqlaDBAL._shape_recorder` for all models.
+    Frequency and latency are added by `paginate` and `aggregate`, or by `record` and `observe`.
+
+    :param max_shapes: Maximal count of recorded shapes, other shapes are counted as `dropped`.
+    """
+
+    def __init__(self, max_shapes: int = 1000) -> None:
+        self._max_shapes = max_shapes
+        self._stats: dict[QueryShape, _ShapeStats] = {}
+        self._dropped = 0
+        self._lock = Lock()
+
+    def record(
+        self,
+        model: Any,
+        where: dict[str, Any] | None,
+        order_by: list[dict[str, Any]] | None,
+    ) -> QueryShape:
+        """Count shape of statement.
+
+        :return: Shape, pass it to `observe` with latency of execution.
+        """
+
+        shape = QueryShape(
+            model.__table__.name,
+            tuple(sorted(set(_collect_filters(where or {})))),
+            tuple((order['col'], order['opr']) for order in order_by or []),
+        )
+        with self._lock:
+            if (stats := self._stats.get(shape)) is None:
+                if len(self._stats) >= self._max_shapes:
+                    self._dropped += 1
+                    return shape
+                stats = self._stats[shape] = _ShapeStats()
+            stats.count += 1
+
+        return shape
+
+    def observe(self, shape: QueryShape, seconds: float) -> None:
+        """Add latency of execution of statement of shape."""
+
+        with self._lock:
+            if (stats := self._stats.get(shape)) is not None:
+                stats.timed += 1
+                stats.latency_total += seconds
+                stats.latency_max = max(stats.latency_max, seconds)
+
+    def shapes(self, table: str | None = None) -> dict[QueryShape, dict[str, float]]:
+        """Recorded shapes, only shapes of `table` if it is set.
+
+        :return: Count of statements, count of `timed` statements, average and maximal latency in
+         seconds and total latency of all statements estimated by average latency.
+        """
+
+        with self._lock:
+            result = {}
+            for shape, stats in self._stats.items():
+                if table is not None and shape.table != table:
+                    continue
+                average = stats.latency_total / stats.timed if stats.timed else 0.0
+                result[shape] = {
+                    'count': stats.count,
+                    'timed': stats.timed,
+                    'latency_avg': average,
+                    'latency_max': stats.latency_max,
+                    'latency_total': average * stats.count,
+                }
+            return result
+
+    def stats(self) -> dict[str, int]:
+        with self._lock:
+            return {'shapes': len(self._stats), 'dropped': self._dropped}
+
+    def reset(self) -> None:
+        with self._lock:
+            self._stats.clear()
+            self._dropped = 0
+
+
+class IndexRecommendation(NamedTuple):
+    """Proposed index.
+
+    `index` is not bound to table, add it to `__table_args__` of model or create it by migration.
+    `definition` is source code of index, `benefit` is total latency of served shapes in seconds.
+    Latency of shapes without observed latency is estimated by average latency of timed shapes of
+    table. If no shape of table is timed, `benefit` is count of statements.
+    """
+
+    index: Index
+    definition: str
+    columns: tuple[str, ...]
+    where: str | None
+    benefit: float
+    count: int
+    shapes: list[QueryShape]
+
+
+class IndexAdvisor:
+    """Advisor of indexes by shapes recorded by `ShapeRecorder`.
+
+    Columns of index follow rule equality, sort, range: columns compared by equality, then columns
+    of sorting, then one column compared by range. Filters `isnull` and soft deletion become
+    condition of partial index. Shapes served by existing index of table are skipped, index which is
+    prefix of other proposed index is merged into it.
+
+    :param recorder: Recorder of shapes.
+    """
+
+    def __init__(self, recorder: ShapeRecorder) -> None:
+        self._recorder = recorder
+
+    @staticmethod
+    def _existing_indexes(table: Any) -> list[tuple[str, ...]]:
+        indexes = [tuple(column.key for column in index.columns) for index in table.indexes]
+        indexes += [
+            tuple(column.key for column in constraint.columns)
+            for constraint in table.constraints
+            if isinstance(constraint, PrimaryKeyConstraint | UniqueConstraint)
+        ]
+        return indexes
+
+    @staticmethod
+    def _make_candidate(
+        shape: QueryShape, columns: set[str], soft_delete: bool
+    ) -> tuple[tuple[str, ...], tuple[str, ...]] | None:
+        conditions = ['deleted_at IS NULL'] if soft_delete else []
+        equality, ranges = [], []
+        for col, opr in shape.filters:
+            if col not in columns:
+                continue
+            if opr == 'isnull':
+                conditions.append(f'{col} IS NULL')
+            elif opr == 'notnull':
+                conditions.append(f'{col} IS NOT NULL')
+            elif opr in equality_operators:
+                equality.append(col)
+            elif opr in range_operators:
+                ranges.append(col)
+
+        candidate = list(dict.fromkeys(equality))
+        directions = {direction for _, direction in shape.order_by}
+        if len(directions) <= 1:
+            for col, _ in shape.order_by:
+                if col not in columns:
+                    break
+                candidate.append(col)
+        candidate.extend(ranges[:1])
+        candidate = list(dict.fromkeys(candidate))
+
+        if not candidate:
+            return None
+
+        return tuple(candidate), tuple(sorted(set(conditions)))
+
+    @staticmethod
+    def _make_index_name(table_name: str, parts: list[str]) -> str:
+        """Name of index, long name is truncated and ended by hash of full name."""
+
+        name = '_'.join(['ix', table_name, *parts])
+        if len(name) <= max_index_name_length:
+            return name
+
+        digest = hashlib.sha1(name.encode(), usedforsecurity=False).hexdigest()[:8]
+        size = max_index_name_length - len(digest) - 1
+        return f'{name[:size]}_{digest}'
+
+    def _make_index(
+        self, table_name: str, columns: tuple[str, ...], conditions: tuple[str, ...]
+    ) -> tuple[Index, str, str | None]:
+        if not conditions:
+            name = self._make_index_name(table_name, list(columns))
+            arguments = ', '.join(repr(col) for col in (name, *columns))
+            return Index(name, *columns), f'Index({arguments})', None
+
+        where = ' AND '.join(conditions)
+        suffix = [
+            condition.replace(' IS NOT NULL', '_notnull').replace(' IS NULL', '_null')
+            for condition in conditions
+        ]
+        name = self._make_index_name(table_name, [*columns, *suffix])
+        arguments = ', '.join(repr(col) for col in (name, *columns))
+        definition = (
+            f'Index({arguments}, postgresql_where=text({where!r}), sqlite_where=text({where!r}))'
+        )
+        return (
+            Index(name, *columns, postgresql_where=text(where), sqlite_where=text(where)),
+            definition,
+            where,
+        )
+
+    def advise(self, model: Any, min_count: int = 1, limit: int = 10) -> list[IndexRecommendation]:
+        """Propose indexes for model.
+
+        :param model: Model.
+        :param min_count: Minimal count of statements of shape.
+        :param limit: Maximal count of proposed indexes.
+        :return: Proposed indexes ranked by estimated benefit.
+        """
+
+        table = model.__table__
+        columns = set(table.columns.keys())
+        existing = self._existing_indexes(table)
+        soft_delete = issubclass(model, SoftDeleteMixin)
+
+        shapes = self._recorder.shapes(table.name)
+        timed = [stats for stats in shapes.values() if stats['timed']]
+        latency_estimate = 1.0
+        if timed:
+            latency_estimate = sum(stats['latency_avg'] * stats['timed'] for stats in timed) / sum(
+                stats['timed'] for stats in timed
+            )
+
+        candidates: dict[tuple[tuple[str, ...], tuple[str, ...]], dict[str, Any]] = {}
+        for shape, stats in shapes.items():
+            if stats['count'] < min_count:
+                continue
+            if (key := self._make_candidate(shape, columns, soft_delete)) is None:
+                continue
+            if any(index[: len(key[0])] == key[0] for index in existing):
+                continue
+
+            candidate = candidates.setdefault(key, {'benefit': 0.0, 'count': 0, 'shapes': []})
+            if stats['timed']:
+                candidate['benefit'] += stats['latency_total']
+            else:
+                candidate['benefit'] += stats['count'] * latency_estimate
+            candidate['count'] += stats['count']
+            candidate['shapes'].append(shape)
+
+        for key in sorted(candidates, key=lambda key: len(key[0])):
+            longer = [
+                other
+                for other in candidates
+                if other != key and other[1] == key[1] and other[0][: len(key[0])] == key[0]
+            ]
+            if longer:
+                target = candidates[max(longer, key=lambda other: candidates[other]['benefit'])]
+                candidate = candidates.pop(key)
+                target['benefit'] += candidate['benefit']
+                target['count'] += candidate['count']
+                target['shapes'].extend(candidate['shapes'])
+
+        recommendations = []
+        for (index_columns, conditions), candidate in candidates.items():
+            index, definition, where = self._make_index(table.name, index_columns, conditions)
+            recommendations.append(
+                IndexRecommendation(
+                    index=index,
+                    definition=definition,
+                    columns=index_columns,
+                    where=where,
+                    benefit=candidate['benefit'],
+                    count=candidate['count'],
+                    shapes=candidate['shapes'],
+                )
+            )
+
+        recommendations.sort(key=lambda recommendation: -recommendation.benefit)
+        return recommendations[:limit]
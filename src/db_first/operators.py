@@ -0,0 +1,136 @@
+from collections.abc import Callable
+from collections.abc import Iterator
+from typing import Any
+
+from db_first.expressions import in_list
+
+_true_values = (True, 1, 'true', 'True', '1')
+_false_values = (False, 0, 'false', 'False', '0')
+
+
+class Operator:
+    """Filter operator used by `StatementMaker`.
+
+    :param name: Name of operator, used as `opr` in filters and as prefix in query string.
+    :param make_expr: Callable `(column, value)` returning SQLAlchemy expression.
+    :param validate: Callable `(value)` raising `ValueError` or `TypeError` for wrong value.
+    """
+
+    __slots__ = ('name', 'make_expr', 'validate')
+
+    def __init__(
+        self,
+        name: str,
+        make_expr: Callable[[Any, Any], Any],
+        validate: Callable[[Any], None] | None = None,
+    ) -> None:
+        self.name = name
+        self.make_expr = make_expr
+        self.validate = validate or _validate_any
+
+    def __repr__(self) -> str:
+        return f'<Operator {self.name}>'
+
+
+class OperatorRegistry:
+    """Registry of filter operators, is single source of operators for filters and pagination."""
+
+    def __init__(self) -> None:
+        self._operators: dict[str, Operator] = {}
+
+    def register(
+        self,
+        name: str,
+        make_expr: Callable[[Any, Any], Any] | None = None,
+        validate: Callable[[Any], None] | None = None,
+    ) -> Any:
+        """Register operator, can be used as decorator if `make_expr` is not passed.
+
+        :param name: Name of operator.
+        :param make_expr: Callable `(column, value)` returning SQLAlchemy expression.
+        :param validate: Callable `(value)` raising `ValueError` or `TypeError` for wrong value.
+        :return: Registered operator or decorator.
+        """
+
+        if '__' in name or not name:
+            raise ValueError(f'Operator name <{name}> must be not empty and without <__>.')
+
+        if make_expr is None:
+
+            def decorator(func: Callable[[Any, Any], Any]) -> Callable[[Any, Any], Any]:
+                self.register(name, func, validate)
+                return func
+
+            return decorator
+
+        operator = Operator(name, make_expr, validate)
+        self._operators[name] = operator
+        return operator
+
+    def unregister(self, name: str) -> None:
+        self._operators.pop(name, None)
+
+    def __getitem__(self, name: str) -> Operator:
+        try:
+            return self._operators[name]
+        except KeyError:
+            raise NotImplementedError(f'Operator <{name}> not implemented.')
+
+    def __contains__(self, name: object) -> bool:
+        return name in self._operators
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._operators)
+
+    def __len__(self) -> int:
+        return len(self._operators)
+
+
+def _validate_any(value: Any) -> None:
+    pass
+
+
+def _validate_sequence(value: Any) -> None:
+    if not isinstance(value, list | tuple | set):
+        raise TypeError(f'Value <{value}> must be list.')
+
+
+def _validate_pair(value: Any) -> None:
+    _validate_sequence(value)
+    if len(value) != 2:
+        raise ValueError(f'Value <{value}> must contain two items.')
+
+
+def _validate_string(value: Any) -> None:
+    if not isinstance(value, str):
+        raise TypeError(f'Value <{value}> must be string.')
+
+
+def is_true(value: Any) -> bool:
+    """Value of boolean filter is true, e.g. `True`, `1` or `'true'`."""
+
+    return value in _true_values
+
+
+def _validate_bool(value: Any) -> None:
+    if value not in _true_values and value not in _false_values:
+        raise ValueError(f'Value <{value}> must be boolean.')
+
+
+def _make_isnull(column: Any, value: Any) -> Any:
+    return column.is_(None) if is_true(value) else column.is_not(None)
+
+
+operators = OperatorRegistry()
+register_operator = operators.register
+
+register_operator('lt', lambda column, value: column < value)
+register_operator('le', lambda column, value: column <= value)
+register_operator('eq', lambda column, value: column == value)
+register_operator('ne', lambda column, value: column != value)
+register_operator('ge', lambda column, value: column >= value)
+register_operator('gt', lambda column, value: column > value)
+register_operator('in', in_list, _validate_sequence)
+register_operator('ilike', lambda column, value: column.ilike(f'%{value}%'), _validate_string)
+register_operator('between', lambda column, value: column.between(*value), _validate_pair)
+register_operator('isnull', _make_isnull, _validate_bool)
@@ -0,0 +1,249 @@
+import sys
+import tracemalloc
+from collections import Counter
+from collections.abc import Callable
+from collections.abc import Iterator
+from contextlib import contextmanager
+from functools import partial
+from functools import wraps
+from threading import local
+from threading import Lock
+from typing import Any
+from typing import Self
+
+from db_first.exc import MemoryBudgetError
+
+
+class _Frame:
+    __slots__ = ('name', 'start', 'peak', 'blocks', 'snapshot')
+
+    def __init__(self, name: str, start: int, blocks: int) -> None:
+        self.name = name
+        self.start = start
+        self.peak = start
+        self.blocks = blocks
+        self.snapshot: tracemalloc.Snapshot | None = None
+
+
+class _Stats:
+    __slots__ = ('calls', 'peak_total', 'peak_max', 'blocks_total', 'over_budget')
+
+    def __init__(self) -> None:
+        self.calls = 0
+        self.peak_total = 0
+        self.peak_max = 0
+        self.blocks_total = 0
+        self.over_budget = 0
+
+
+def _size_bucket(value: Any) -> str:
+    """Size of collection rounded up to power of two, so close sizes have one shape."""
+
+    if isinstance(value, list | tuple | set | frozenset):
+        return f'[{1 << max(len(value) - 1, 0).bit_length()}]'
+    return ''
+
+
+def call_shape(args: tuple[Any, ...], kwargs: dict[str, Any]) -> str:
+    """Shape of call: names of keyword arguments and sizes of collections without values."""
+
+    parts = [f'#{number}{_size_bucket(value)}' for number, value in enumerate(args)]
+    parts += [f'{name}{_size_bucket(value)}' for name, value in sorted(kwargs.items())]
+    return ','.join(parts)
+
+
+class MemoryProfiler:
+    """Profiler of memory of calls by `tracemalloc`.
+
+    Peak of traced memory and count of allocated blocks are recorded per method and shape of call.
+    Nested calls are recorded separately and included in peak of outer call. Memory is traced for
+    whole process, so calls made by other threads at the same time are included in peak.
+
+    Tracing is started by the first profiled call, `stop` or exit of profiler used as context
+    manager stops it, if it was not running before.
+
+    :param budget: Maximal peak of call in bytes, `MemoryBudgetError` is raised at the end
+     of call or at checkpoint inside of call, when it is exceeded. Calls of writing methods raise it
+     only at checkpoints before commit, at the end they are only counted as `over_budget`.
+    :param top_sites: Collect this count of top allocation sites of outermost calls, snapshots of
+     memory are taken before and after call, it is slow.
+    :param frames: Count of frames of traceback of allocation site.
+    """
+
+    def __init__(self, budget: int | None = None, top_sites: int = 0, frames: int = 1) -> None:
+        self.budget = budget
+        self._top_sites = top_sites
+        self._frames = frames
+        self._stats: dict[tuple[str, str], _Stats] = {}
+        self._sites: Counter[str] = Counter()
+        self._site_counts: Counter[str] = Counter()
+        self._local = local()
+        self._lock = Lock()
+        self._started_tracing = False
+
+    def start(self) -> Self:
+        """Start tracing of memory if it is not running."""
+
+        with self._lock:
+            if not tracemalloc.is_tracing():
+                tracemalloc.start(self._frames)
+                self._started_tracing = True
+        return self
+
+    def stop(self) -> None:
+        """Stop tracing of memory if it was started by profiler."""
+
+        with self._lock:
+            if self._started_tracing:
+                tracemalloc.stop()
+                self._started_tracing = False
+
+    def __enter__(self) -> Self:
+        return self.start()
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.stop()
+
+    def _stack(self) -> list[_Frame]:
+        if (stack := getattr(self._local, 'stack', None)) is None:
+            stack = self._local.stack = []
+        return stack
+
+    @staticmethod
+    def _update_peaks(stack: list[_Frame]) -> int:
+        current, peak = tracemalloc.get_traced_memory()
+        for frame in stack:
+            frame.peak = max(frame.peak, peak)
+        return current
+
+    def checkpoint(self) -> None:
+        """Check budget of running calls of thread, long calls check it between batches."""
+
+        stack = self._stack()
+        if self.budget is None or not stack or not tracemalloc.is_tracing():
+            return
+
+        self._update_peaks(stack)
+        for frame in stack:
+            if frame.peak - frame.start > self.budget:
+                raise MemoryBudgetError(
+                    f'Call <{frame.name}> allocated <{frame.peak - frame.start}> bytes over'
+                    f' budget <{self.budget}>.'
+                )
+
+    @contextmanager
+    def profile(self, name: str, shape: str = '', enforce_budget: bool = True) -> Iterator[None]:
+        """Record peak memory and allocated blocks of code in context.
+
+        :param name: Name of call, e.g. `ItemsDBAL.paginate`.
+        :param shape: Shape of call, see `call_shape`.
+        :param enforce_budget: Check budget at the end of call, disable it for code with side
+         effects, e.g. commit.
+        """
+
+        if not tracemalloc.is_tracing():
+            self.start()
+
+        stack = self._stack()
+        self._update_peaks(stack)
+        tracemalloc.reset_peak()
+
+        frame = _Frame(name, tracemalloc.get_traced_memory()[0], sys.getallocatedblocks())
+        if self._top_sites and not stack:
+            frame.snapshot = tracemalloc.take_snapshot()
+        stack.append(frame)
+
+        try:
+            yield
+            if enforce_budget:
+                self.checkpoint()
+        finally:
+            self._update_peaks(stack)
+            stack.pop()
+            self._record(frame, shape)
+
+    def _record(self, frame: _Frame, shape: str) -> None:
+        peak = frame.peak - frame.start
+        blocks = sys.getallocatedblocks() - frame.blocks
+
+        differences = []
+        if frame.snapshot is not None:
+            differences = tracemalloc.take_snapshot().compare_to(frame.snapshot, 'traceback')
+
+        with self._lock:
+            stats = self._stats.setdefault((frame.name, shape), _Stats())
+            stats.calls += 1
+            stats.peak_total += peak
+            stats.peak_max = max(stats.peak_max, peak)
+            stats.blocks_total += blocks
+            stats.over_budget += self.budget is not None and peak > self.budget
+
+            for difference in differences:
+                if difference.size_diff > 0 and not self._is_own(difference.traceback):
+                    site = str(difference.traceback[-1])
+                    self._sites[site] += difference.size_diff
+                    self._site_counts[site] += difference.count_diff
+
+    @staticmethod
+    def _is_own(traceback: tracemalloc.Traceback) -> bool:
+        return any(frame.filename in (__file__, tracemalloc.__file__) for frame in traceback)
+
+    def stats(self) -> dict[str, dict[str, Any]]:
+        """Statistics of calls.
+
+        :return: Key is `<name>(<shape>)`, value is count of `calls`, average and maximal peak of
+         memory in bytes, average count of allocated blocks remained after call and count of calls
+         over budget.
+        """
+
+        with self._lock:
+            return {
+                f'{name}({shape})': {
+                    'calls': stats.calls,
+                    'peak_avg': stats.peak_total / stats.calls,
+                    'peak_max': stats.peak_max,
+                    'blocks_avg': stats.blocks_total / stats.calls,
+                    'over_budget': stats.over_budget,
+                }
+                for (name, shape), stats in self._stats.items()
+            }
+
+    def top(self, limit: int | None = None) -> list[dict[str, Any]]:
+        """Top allocation sites of profiled calls by allocated bytes, `top_sites` by default."""
+
+        with self._lock:
+            return [
+                {'site': site, 'size': size, 'count': self._site_counts[site]}
+                for site, size in self._sites.most_common(limit or self._top_sites)
+            ]
+
+    def reset(self) -> None:
+        with self._lock:
+            self._stats.clear()
+            self._sites.clear()
+            self._site_counts.clear()
+
+
+def profiled(
+    method: Callable[..., Any] | None = None, *, enforce_budget: bool = True
+) -> Callable[..., Any]:
+    """Profile memory of method by `_memory_profiler` of its object.
+
+    :param enforce_budget: Raise `MemoryBudgetError` at the end of call, set `False` for
+     methods committing changes, so written changes are not reported as failure.
+    """
+
+    if method is None:
+        return partial(profiled, enforce_budget=enforce_budget)
+
+    @wraps(method)
+    def wrapper(self, *args, **kwargs):
+        if self._memory_profiler is None:
+            return method(self, *args, **kwargs)
+
+        name = f'{type(self).__name__}.{method.__name__}'
+        shape = call_shape(args, kwargs)
+        with self._memory_profiler.profile(name, shape, enforce_budget):
+            return method(self, *args, **kwargs)
+
+    return wrapper
@@ -2,6 +2,8 @@ from datetime import datetime
 from datetime import timezone
 from typing import Any
 
+from db_first.profiling import MemoryProfiler
+from db_first.profiling import profiled
 from marshmallow import post_dump
 from marshmallow import RAISE
 from marshmallow import Schema
@@ -11,10 +13,17 @@ from marshmallow import validates_schema
 class BaseSchema(Schema):
     _empty_values = ('', None, ..., [], {}, (), set())
     _skipped_keys = ()
+    _memory_profiler: MemoryProfiler | None = None
 
     class Meta:
         unknown = RAISE
 
+    @profiled
+    def dump(self, obj: Any, *, many: bool | None = None) -> Any:
+        """Serialize object, memory of call is profiled if `_memory_profiler` is set."""
+
+        return super().dump(obj, many=many)
+
     @post_dump()
     def _delete_keys_with_empty_value(self, data: Any, many: bool = False) -> Any:
         """Clearing hierarchical structures from empty values.
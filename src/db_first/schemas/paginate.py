@@ -1,5 +1,6 @@
 from typing import Any
 
+from db_first.operators import operators
 from db_first.schemas import BaseSchema
 from marshmallow import fields
 from marshmallow import INCLUDE
@@ -16,21 +17,26 @@ class PaginateSchema(BaseSchema):
     page = fields.Integer(validate=[validate.Range(min=0)])
     per_page = fields.Integer(validate=[validate.Range(min=0)])
     include_metadata = fields.String(validate=validate.OneOf(['enable']))
+    load = fields.List(fields.String)
+    select = fields.List(fields.String)
+    group_by = fields.List(fields.String)
     fields = fields.List(fields.String)
 
+    _prefixes = frozenset(['sort', 'contain', 'having'])
+    _keys = frozenset(
+        ['ids', 'include_metadata', 'fields', 'load', 'select', 'group_by', 'page', 'per_page']
+    )
+
     @pre_load
     def extract_fields(self, data: dict[str, Any], many, **kwargs):
-        prefixes = ['lt', 'le', 'eq', 'ne', 'ge', 'gt', 'in', 'sort', 'contain']
-
-        for key, _ in data.items():
-            if key in ['ids', 'include_metadata', 'fields', 'page', 'per_page']:
+        for key in data:
+            if key in self._keys:
                 continue
-            else:
-                prefix, *_ = key.split('__')
-                if prefix in prefixes:
-                    continue
-                else:
-                    raise ValidationError(f'Prefix <{prefix}> not allowed.')
+
+            prefix = key.partition('__')[0]
+            if prefix not in self._prefixes and prefix not in operators:
+                raise ValidationError(f'Prefix <{prefix}> not allowed.')
+
         return data
 
 
@@ -1,32 +1,53 @@
+from collections.abc import Callable
+from functools import cache
 from typing import Any
 from typing import Literal
 
+from db_first.operators import operators
 from db_first.schemas import BaseSchema
 from marshmallow import fields
 from marshmallow import validate
 from marshmallow import validates_schema
+from marshmallow import ValidationError
 from sqlalchemy import and_
+from sqlalchemy import distinct
+from sqlalchemy import func
+from sqlalchemy import inspect
 from sqlalchemy import or_
 from sqlalchemy import Select
 from sqlalchemy import select
+from sqlalchemy.orm import aliased
+from sqlalchemy.orm import joinedload
+from sqlalchemy.orm import RelationshipProperty
+from sqlalchemy.orm import selectinload
+
+
+def validate_operator(name: str) -> None:
+    if name not in operators:
+        raise ValidationError(f'Operator <{name}> not registered.')
 
 
 class JoinSchema(BaseSchema):
     table = fields.String(required=True, validate=[validate.Length(min=1)])
+    load = fields.String(validate=[validate.OneOf(['selectin', 'joined'])])
 
 
 class FilterSchema(BaseSchema):
     col = fields.String(required=True, validate=[validate.Length(min=1)])
-    opr = fields.String(
-        required=True,
-        validate=[validate.OneOf(['lt', 'le', 'eq', 'ne', 'ge', 'gt', 'in', 'ilike'])],
-    )
+    opr = fields.String(required=True, validate=[validate_operator])
     value = fields.Raw(required=True)
 
     @validates_schema
     def validate_datetime_fields(self, data: dict, **kwargs) -> None:
         pass
 
+    @validates_schema
+    def validate_value(self, data: dict, **kwargs) -> None:
+        try:
+            operators[data['opr']].validate(data['value'])
+        except (TypeError, ValueError) as e:
+            raise ValidationError(str(e), field_name='value')
+
 
 class OrderBySchema(BaseSchema):
     col = fields.String(required=True, validate=[validate.Length(min=1)])
@@ -37,30 +58,73 @@ class WhereSchema(BaseSchema):
     and_ = fields.List(fields.Nested(FilterSchema), data_key='and')
 
 
+class AggregateSchema(BaseSchema):
+    func = fields.String(
+        required=True,
+        validate=[validate.OneOf(['count', 'count_distinct', 'sum', 'avg', 'min', 'max'])],
+    )
+    col = fields.String(required=True, validate=[validate.Length(min=1)])
+    label = fields.String(validate=[validate.Length(min=1)])
+
+
 class SQLJSONSchema(BaseSchema):
+    select = fields.Nested(AggregateSchema, many=True)
+    join = fields.Nested(JoinSchema, many=True)
     where = fields.Nested(WhereSchema)
+    group_by = fields.List(fields.String(validate=[validate.Length(min=1)]))
+    having = fields.Nested(WhereSchema)
     order_by = fields.Nested(OrderBySchema, many=True)
-    limit = fields.Integer(validate=[validate.Range(min=0)])
+    limit = fields.Integer(allow_none=True, validate=[validate.Range(min=0)])
     offset = fields.Integer(validate=[validate.Range(min=0)])
 
 
+@cache
+def _sql_json_schema() -> SQLJSONSchema:
+    """Schema is built on first use and reused, building of marshmallow schema is expensive."""
+
+    return SQLJSONSchema()
+
+
 class StatementMaker:
     """The class builds a SQL statement as a SQLAlchemy object.
 
     The class works only with one table, is set during initialization in the `model` argument.
 
     The request is executed outside of this class
+
+    Related models are available through relationships: columns of related models are set as
+    `relationship.column` in filters and sorting, relationships in `join` are loaded eagerly.
+    Depth of relationships is limited by `max_join_depth`.
+
+    If `select` or `group_by` is set, the statement selects columns from `group_by` and aggregates
+    from `select` instead of objects. Aggregate is labeled as `<func>__<col>` by default, labels are
+    used as columns in `having` and `order_by`.
     """
 
     _map_conjunction = {'and': and_, 'or': or_}
+    _map_loader = {'selectin': selectinload, 'joined': joinedload}
+    _map_aggregate = {
+        'count': func.count,
+        'count_distinct': lambda column: func.count(distinct(column)),
+        'sum': func.sum,
+        'avg': func.avg,
+        'min': func.min,
+        'max': func.max,
+    }
 
     def __init__(
         self,
         model,
         where: dict['str':Any] | None = None,
         order_by: dict['str':Any] | None = None,
-        limit: int = 1000,
+        limit: int | None = 1000,
         offset: int = 0,
+        join: list[dict[str, Any]] | None = None,
+        max_join_depth: int = 2,
+        select: list[dict[str, str]] | None = None,
+        group_by: list[str] | None = None,
+        having: dict[str, Any] | None = None,
+        validate: bool = True,
     ):
         self._model = model
         self._select = select
@@ -68,8 +132,15 @@ class StatementMaker:
         self._order_by = order_by
         self._limit = limit
         self._offset = offset
+        self._join = join
+        self._max_join_depth = max_join_depth
+        self._outer_joins = {}
+        self._group_by = group_by
+        self._having = having
+        self._aggregates = {}
 
-        self._validate()
+        if validate:
+            self._validate()
 
     def _validate(self):
         data = {'limit': self._limit, 'offset': self._offset}
@@ -80,27 +151,106 @@ class StatementMaker:
         if self._order_by is not None:
             data['order_by'] = self._order_by
 
-        SQLJSONSchema().load(data)
-
-    def _make_expr(self, col: str, opr: Literal['eq', 'in'], value: Any) -> bool | Any:
-        if opr == 'lt':
-            return getattr(self._model, col) < value
-        if opr == 'le':
-            return getattr(self._model, col) <= value
-        elif opr == 'eq':
-            return getattr(self._model, col) == value
-        elif opr == 'ne':
-            return getattr(self._model, col) != value
-        elif opr == 'ge':
-            return getattr(self._model, col) >= value
-        elif opr == 'gt':
-            return getattr(self._model, col) > value
-        elif opr == 'in':
-            return getattr(self._model, col).in_(value)
-        elif opr == 'ilike':
-            return getattr(self._model, col).ilike(f'%{value}%')
-        else:
-            raise NotImplementedError(f'Operator <{opr}> not implemented.')
+        if self._join is not None:
+            data['join'] = self._join
+
+        if self._select is not None:
+            data['select'] = self._select
+
+        if self._group_by is not None:
+            data['group_by'] = self._group_by
+
+        if self._having is not None:
+            data['having'] = self._having
+
+        _sql_json_schema().load(data)
+
+        self._validate_join_depth()
+        self._validate_joins()
+
+    def _validate_join_depth(self) -> None:
+        paths = [join['table'] + '.' for join in self._join or []]
+        paths += [order['col'] for order in self._order_by or []]
+        paths += self._collect_columns(self._where or {})
+
+        for path in paths:
+            if path.count('.') > self._max_join_depth:
+                raise ValidationError(
+                    f'Depth of relationships <{path.rstrip(".")}> is greater than'
+                    f' <{self._max_join_depth}>.'
+                )
+
+    def _validate_joins(self) -> None:
+        for join in self._join or []:
+            mapper = inspect(self._model)
+            for name in join['table'].split('.'):
+                try:
+                    mapper = mapper.relationships[name].mapper
+                except KeyError:
+                    raise ValidationError(f'Relationship <{name}> of <{join["table"]}> not found.')
+
+    def _collect_columns(self, expressions: dict[str, Any]) -> list[str]:
+        if 'col' in expressions:
+            return [expressions['col']]
+
+        return [
+            col for exprs in expressions.values() for e in exprs for col in self._collect_columns(e)
+        ]
+
+    @staticmethod
+    def _get_relationship(entity: Any, name: str) -> Any:
+        attr = getattr(entity, name)
+        if not isinstance(getattr(attr, 'property', None), RelationshipProperty):
+            raise ValueError(f'Attribute <{name}> of <{entity}> is not relationship.')
+
+        return attr
+
+    def _make_expr(self, col: str, opr: str, value: Any) -> bool | Any:
+        if '.' not in col:
+            return operators[opr].make_expr(getattr(self._model, col), value)
+
+        *path, name = col.split('.')
+        return self._make_related_expr(self._model, path, name, opr, value)
+
+    def _make_related_expr(
+        self, entity: Any, path: list[str], name: str, opr: str, value: Any
+    ) -> bool | Any:
+        if not path:
+            return operators[opr].make_expr(getattr(entity, name), value)
+
+        attr = self._get_relationship(entity, path[0])
+        expr = self._make_related_expr(attr.property.mapper.class_, path[1:], name, opr, value)
+
+        return attr.any(expr) if attr.property.uselist else attr.has(expr)
+
+    def _get_sort_column(self, col: str) -> Any:
+        if col in self._aggregates:
+            return self._aggregates[col]
+
+        if '.' not in col:
+            return getattr(self._model, col)
+
+        *path, name = col.split('.')
+        entity = self._model
+        for number in range(len(path)):
+            key = '.'.join(path[: number + 1])
+            if key not in self._outer_joins:
+                attr = self._get_relationship(entity, path[number])
+                if attr.property.uselist:
+                    raise NotImplementedError(f'Sorting by to-many relationship <{col}>.')
+                target = aliased(attr.property.mapper.class_)
+                self._outer_joins[key] = (target, attr.of_type(target))
+            entity = self._outer_joins[key][0]
+
+        return getattr(entity, name)
+
+    def _make_having_expr(self, col: str, opr: str, value: Any) -> bool | Any:
+        try:
+            aggregate = self._aggregates[col]
+        except KeyError:
+            raise NotImplementedError(f'Aggregate <{col}> is not selected.')
+
+        return operators[opr].make_expr(aggregate, value)
 
     def _make_where_expression(
         self,
@@ -108,17 +258,18 @@ class StatementMaker:
             dict[Literal['and', 'or'], list[dict[Any, Any]]]
             | dict[Literal['col', 'opr', 'value'], Any]
         ),
+        make_expr: Callable[..., Any] | None = None,
     ):
         if 'and' in expressions:
             and_exprs = expressions['and']
             return self._map_conjunction['and'](
-                *[self._make_where_expression(expr) for expr in and_exprs]
+                *[self._make_where_expression(expr, make_expr) for expr in and_exprs]
             )
 
         if 'or' in expressions:
             raise NotImplementedError('or')
 
-        return self._make_expr(**expressions)
+        return (make_expr or self._make_expr)(**expressions)
 
     def make_where(self, where_: dict[str, list[dict[Any, Any]]]) -> Select:
         if len(where_) != 1:
@@ -126,24 +277,79 @@ class StatementMaker:
 
         return self._make_where_expression(where_)
 
+    def make_having(self, having_: dict[str, list[dict[Any, Any]]]) -> Any:
+        if len(having_) != 1:
+            raise NotImplementedError('Only one key "and" or "or" to top level.')
+
+        return self._make_where_expression(having_, self._make_having_expr)
+
+    def make_aggregates(self, select_: list[dict[str, str]]) -> list[Any]:
+        aggregates = []
+        for aggregate in select_:
+            if '.' in aggregate['col']:
+                raise NotImplementedError(f'Aggregate of related column <{aggregate["col"]}>.')
+
+            label = aggregate.get('label') or f'{aggregate["func"]}__{aggregate["col"]}'
+            expr = self._map_aggregate[aggregate['func']](getattr(self._model, aggregate['col']))
+            self._aggregates[label] = expr
+            aggregates.append(expr.label(label))
+
+        return aggregates
+
     def make_order_by(self, order_by_: list[dict[str, Any]]) -> list[Any]:
         order_by_expressions = []
         for order in order_by_:
             if order['opr'] == 'asc':
-                order_by_expressions.append(getattr(self._model, order['col']).asc())
+                order_by_expressions.append(self._get_sort_column(order['col']).asc())
             else:
-                order_by_expressions.append(getattr(self._model, order['col']).desc())
+                order_by_expressions.append(self._get_sort_column(order['col']).desc())
 
         return order_by_expressions
 
+    def make_options(self, join_: list[dict[str, Any]]) -> list[Any]:
+        options = []
+        for join in join_:
+            make_loader = self._map_loader[join.get('load', 'selectin')]
+
+            entity = self._model
+            loader = None
+            for name in join['table'].split('.'):
+                attr = self._get_relationship(entity, name)
+                if loader is None:
+                    loader = make_loader(attr)
+                else:
+                    loader = getattr(loader, make_loader.__name__)(attr)
+                entity = attr.property.mapper.class_
+
+            options.append(loader)
+
+        return options
+
     def make_stmt(self) -> Select:
-        stmt = select(self._model)
+        if self._select or self._group_by:
+            group_by_columns = [getattr(self._model, col) for col in self._group_by or []]
+            aggregates = self.make_aggregates(self._select or [])
+            stmt = select(*group_by_columns, *aggregates).select_from(self._model)
+        else:
+            stmt = select(self._model)
 
         if self._where:
             stmt = stmt.where(self.make_where(self._where))
 
         if self._order_by:
-            stmt = stmt.order_by(*self.make_order_by(self._order_by))
+            order_by_expressions = self.make_order_by(self._order_by)
+            for _, relationship in self._outer_joins.values():
+                stmt = stmt.outerjoin(relationship)
+            stmt = stmt.order_by(*order_by_expressions)
+
+        if self._join:
+            stmt = stmt.options(*self.make_options(self._join))
+
+        if self._group_by:
+            stmt = stmt.group_by(*group_by_columns)
+
+        if self._having:
+            stmt = stmt.having(self.make_having(self._having))
 
         stmt = stmt.limit(self._limit).offset(self._offset)
         return stmt
@@ -3,6 +3,9 @@ from uuid import UUID
 
 import pytest
 from db_first import ModelMixin
+from db_first import SoftDeleteMixin
+from db_first import VersionMixin
+from db_first.base_model import make_uuid7
 from db_first.dbal import SqlaDBAL
 from db_first.statement_maker import StatementMaker
 from sqlalchemy import create_engine
@@ -74,6 +77,62 @@ def fx_db(fx_db_connection):
     return session, Parents, Children, Fathers
 
 
+@pytest.fixture(scope='session')
+def fx_soft_db(fx_db_connection):
+    Base, engine, session = fx_db_connection
+
+    class Documents(Base, ModelMixin, SoftDeleteMixin):
+        __tablename__ = 'documents'
+        __table_args__ = (SoftDeleteMixin.live_index('ix_documents_title', 'title'),)
+
+        title: Mapped[str] = mapped_column()
+
+    class ArchivedDocuments(Base, ModelMixin, SoftDeleteMixin):
+        __tablename__ = 'archived_documents'
+
+        title: Mapped[str] = mapped_column()
+
+    Base.metadata.create_all(engine)
+
+    return session, Documents, ArchivedDocuments
+
+
+@pytest.fixture(scope='session')
+def fx_document_dbal(fx_soft_db):
+    _, documents_model, _ = fx_soft_db
+
+    class DocumentsDBAL(SqlaDBAL[documents_model]):
+        """DBAL for Documents."""
+
+    return DocumentsDBAL
+
+
+@pytest.fixture(scope='session')
+def fx_events_db(fx_db_connection):
+    Base, engine, session = fx_db_connection
+
+    class Events(Base, ModelMixin, VersionMixin):
+        __tablename__ = 'events'
+        __table_args__ = (ModelMixin.change_feed_index('ix_events_changed_at'),)
+        _id_generator = make_uuid7
+
+        name: Mapped[str] = mapped_column()
+
+    Base.metadata.create_all(engine)
+
+    return session, Events
+
+
+@pytest.fixture(scope='session')
+def fx_event_dbal(fx_events_db):
+    _, events_model = fx_events_db
+
+    class EventsDBAL(SqlaDBAL[events_model]):
+        """DBAL for Events."""
+
+    return EventsDBAL
+
+
 @pytest.fixture(scope='session')
 def fx_parent_dbal(fx_db):
     session_db, parents_model, _, _ = fx_db
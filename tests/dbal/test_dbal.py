@@ -1,5 +1,14 @@
+from uuid import uuid4
+
 import pytest
+from db_first.dbal.archive import ArchiveMixin
+from db_first.dbal.cache import CacheMixin
+from db_first.dbal.counter_cache import CounterCacheMixin
 from db_first.dbal.exceptions import DBALObjectNotFoundException
+from db_first.dbal.paginate import PageMixin
+from db_first.dbal.profiling import ProfilingMixin
+from db_first.dbal.single_flight import SingleFlightMixin
+from sqlalchemy import event
 
 from tests.conftest import UNIQUE_STRING
 
@@ -95,7 +104,8 @@ def test_dbal__delete(fx_db, fx_parent_dbal):
     new_1 = fx_parent_dbal(session_db).create(**{'first': next(UNIQUE_STRING)})
     new_2 = fx_parent_dbal(session_db).create(**{'first': next(UNIQUE_STRING)})
 
-    fx_parent_dbal(session_db).delete(new_2.id)
+    assert fx_parent_dbal(session_db).delete(new_2.id) is True
+    assert fx_parent_dbal(session_db).delete(new_2.id) is False
 
     with pytest.raises(DBALObjectNotFoundException):
         fx_parent_dbal(session_db).read(new_2.id)
@@ -119,6 +129,51 @@ def test_dbal__bulk_delete(fx_db, fx_parent_dbal):
     assert result
 
 
+@pytest.mark.parametrize('batch_size, batches', [(2, 3), (10, 1)])
+def test_dbal__delete_chunked__ids(fx_db, fx_parent_dbal, batch_size, batches):
+    session_db, _, _, _ = fx_db
+
+    new = [fx_parent_dbal(session_db).create(first=next(UNIQUE_STRING)) for _ in range(5)]
+    ids = [obj.id for obj in new]
+    commits = []
+
+    def _count(connection):
+        commits.append(connection)
+
+    event.listen(session_db.get_bind(), 'commit', _count)
+    try:
+        result = fx_parent_dbal(session_db).delete_chunked(
+            ids=[*ids, uuid4(), ids[0]], batch_size=batch_size
+        )
+    finally:
+        event.remove(session_db.get_bind(), 'commit', _count)
+
+    assert result == {'ids': ids, 'count': 5, 'batches': batches}
+    assert len(commits) == batches
+    assert fx_parent_dbal(session_db).bulk_read(ids) == []
+
+
+def test_dbal__delete_chunked__where(fx_db, fx_parent_dbal):
+    session_db, _, _, _ = fx_db
+
+    first = next(UNIQUE_STRING)
+    ids = [fx_parent_dbal(session_db).create(first=first).id for _ in range(5)]
+    other = fx_parent_dbal(session_db).create(first=next(UNIQUE_STRING))
+
+    result = fx_parent_dbal(session_db).delete_chunked(
+        where={'and': [{'col': 'first', 'opr': 'eq', 'value': first}]},
+        batch_size=2,
+        return_ids=False,
+    )
+
+    assert result == {'ids': [], 'count': 5, 'batches': 3}
+    assert fx_parent_dbal(session_db).bulk_read(ids) == []
+    assert fx_parent_dbal(session_db).read(other.id) == other
+
+    with pytest.raises(ValueError):
+        fx_parent_dbal(session_db).delete_chunked()
+
+
 def test_dbal__read_one_filtered(fx_db, fx_parent_dbal):
     session_db, parents_model, _, _ = fx_db
 
@@ -180,3 +235,102 @@ def test_dbal__read_filtered_list_with_sort(fx_db, fx_parent_dbal):
     )
 
     assert result == [new_2, new_1]
+
+
+def test_dbal__exists(fx_db, fx_parent_dbal):
+    session_db, _, _, _ = fx_db
+
+    new_1 = fx_parent_dbal(session_db).create(**{'first': next(UNIQUE_STRING)})
+
+    assert fx_parent_dbal(session_db).exists(first=new_1.first) is True
+    assert fx_parent_dbal(session_db).exists(first=[new_1.first, 'missing']) is True
+    assert fx_parent_dbal(session_db).exists(first=new_1.first, second='missing') is False
+
+
+def test_dbal__count_filtered(fx_db, fx_parent_dbal):
+    session_db, _, _, _ = fx_db
+
+    new_1 = fx_parent_dbal(session_db).create(**{'first': next(UNIQUE_STRING)})
+    fx_parent_dbal(session_db).create(**{'first': new_1.first, 'second': 'Not None'})
+
+    assert fx_parent_dbal(session_db).count_filtered(first=new_1.first) == 2
+    assert fx_parent_dbal(session_db).count_filtered(first=new_1.first, second=None) == 1
+    assert fx_parent_dbal(session_db).count_filtered(first='missing') == 0
+
+
+def test_dbal__first_filtered(fx_db, fx_parent_dbal):
+    session_db, _, _, _ = fx_db
+
+    new_1 = fx_parent_dbal(session_db).create(**{'first': next(UNIQUE_STRING), 'second': 'a'})
+    new_2 = fx_parent_dbal(session_db).create(**{'first': new_1.first, 'second': 'b'})
+    dbal = fx_parent_dbal(session_db)
+
+    assert dbal.first_filtered(first=new_1.first, sort_field='second') == new_1
+    assert dbal.first_filtered(first=new_1.first, sort_field='second', sort_order='desc') == new_2
+
+    row = dbal.first_filtered(columns=['id', 'second'], first=new_1.first, sort_field='second')
+    assert tuple(row) == (new_1.id, 'a')
+
+    assert dbal.first_filtered(first='missing') is None
+    assert dbal.first_filtered(columns=['id'], first='missing') is None
+
+
+@pytest.mark.parametrize(('batch_size', 'threshold'), [(500, 10_000), (2, 10_000), (2, 3)])
+def test_dbal__bulk_read__large_ids(fx_db, fx_parent_dbal, batch_size, threshold):
+    session_db, parents_model, _, _ = fx_db
+
+    class ParentsDBAL(fx_parent_dbal):
+        _in_batch_size = batch_size
+        _in_temp_table_threshold = threshold
+
+    new = [ParentsDBAL(session_db).create(first=next(UNIQUE_STRING)) for _ in range(5)]
+    ids = [new[3].id, new[0].id, uuid4(), new[4].id, new[0].id, new[2].id, new[1].id]
+
+    result = ParentsDBAL(session_db).bulk_read(ids)
+
+    assert result == [new[3], new[0], new[4], new[2], new[1]]
+
+
+@pytest.mark.parametrize(('batch_size', 'threshold'), [(2, 10_000), (2, 3)])
+def test_dbal__bulk_delete__large_ids(fx_db, fx_parent_dbal, batch_size, threshold):
+    session_db, parents_model, _, _ = fx_db
+
+    class ParentsDBAL(fx_parent_dbal):
+        _in_batch_size = batch_size
+        _in_temp_table_threshold = threshold
+
+    new = [ParentsDBAL(session_db).create(first=next(UNIQUE_STRING)) for _ in range(6)]
+
+    ParentsDBAL(session_db).bulk_delete([obj.id for obj in new[:5]])
+
+    assert ParentsDBAL(session_db).bulk_read([obj.id for obj in new]) == [new[5]]
+
+
+def test_page_mixin__required_mixins(fx_db):
+    session_db, Parents, _, _ = fx_db
+    first = next(UNIQUE_STRING)
+    new = Parents(first=first)
+    session_db.add(new)
+    session_db.flush()
+
+    class Pages(
+        PageMixin, ArchiveMixin, CacheMixin, SingleFlightMixin, ProfilingMixin, CounterCacheMixin
+    ):
+        _model = Parents
+
+        def __init__(self, session):
+            self._session = session
+
+    class PagesWithoutMixins(PageMixin):
+        _model = Parents
+
+        def __init__(self, session):
+            self._session = session
+
+    result = Pages(session_db).paginate(eq__first=first, include_metadata=True)
+    assert result['items'] == [new]
+    assert result['_metadata']['pagination']['total'] == 1
+
+    with pytest.raises(AttributeError):
+        PagesWithoutMixins(session_db).paginate(eq__first=first)
+    session_db.rollback()
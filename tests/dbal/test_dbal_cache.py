@@ -0,0 +1,165 @@
+import pytest
+from db_first.dbal.cache import _on_after_flush
+from db_first.dbal.cache import FileCacheBackend
+from db_first.dbal.cache import LRUCacheBackend
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from tests.conftest import UNIQUE_STRING
+
+
+@pytest.fixture
+def fx_statements(fx_db):
+    session_db, _, _, _ = fx_db
+    engine = session_db.get_bind()
+    statements = []
+
+    def _collect(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    event.listen(engine, 'before_cursor_execute', _collect)
+    yield statements
+    event.remove(engine, 'before_cursor_execute', _collect)
+
+
+@pytest.fixture(params=['lru', 'file'])
+def fx_cache_backend(request, tmp_path):
+    if request.param == 'lru':
+        return LRUCacheBackend(max_size=8)
+    return FileCacheBackend(tmp_path)
+
+
+@pytest.fixture
+def fx_cached_parent_dbal(fx_parent_dbal, fx_cache_backend):
+    class CachedParentsDBAL(fx_parent_dbal):
+        """DBAL for Parents with cache."""
+
+        _cache_backend = fx_cache_backend
+
+    return CachedParentsDBAL
+
+
+def test_dbal__cache(fx_db, fx_cached_parent_dbal, fx_statements):
+    session_db, _, _, _ = fx_db
+    dbal = fx_cached_parent_dbal(session_db)
+
+    first = next(UNIQUE_STRING)
+    new = dbal.create(first=first)
+    child = fx_cached_parent_dbal(session_db).create(first=next(UNIQUE_STRING))
+    params = {'eq__first': first, 'include_metadata': True, 'load': ['children']}
+
+    result = dbal.paginate(**params)
+    fx_statements.clear()
+
+    cached = dbal.paginate(**params)
+    assert fx_statements == []
+    assert cached['items'] == [new]
+    assert cached['items'][0] in session_db
+    assert cached['items'][0].children == []
+    assert cached['_metadata'] == result['_metadata']
+    assert fx_statements == []
+
+    dbal.update(child.id, first=first)
+    assert {obj.id for obj in dbal.paginate(**params)['items']} == {new.id, child.id}
+    assert fx_statements
+
+
+def test_dbal__cache__ttl(fx_db, fx_cached_parent_dbal, fx_statements):
+    session_db, _, _, _ = fx_db
+    fx_cached_parent_dbal._cache_ttl = -1
+    dbal = fx_cached_parent_dbal(session_db)
+
+    first = next(UNIQUE_STRING)
+    dbal.create(first=first)
+    dbal.paginate(eq__first=first)
+    fx_statements.clear()
+
+    dbal.paginate(eq__first=first)
+    assert fx_statements
+
+
+def test_dbal__cache__lru_eviction():
+    backend = LRUCacheBackend(max_size=2)
+    backend.set('a', b'1', 60)
+    backend.set('b', b'2', 60)
+    backend.get('a')
+    backend.set('c', b'3', 60)
+
+    assert backend.get('a') == b'1'
+    assert backend.get('b') is None
+    assert backend.get('c') == b'3'
+
+
+def test_dbal__cache__generation(fx_cache_backend):
+    generation = fx_cache_backend.get_generation('model')
+    fx_cache_backend.bump_generation('model')
+
+    assert fx_cache_backend.get_generation('model') != generation
+
+
+def test_dbal__cache__uncommitted(fx_db, fx_cached_parent_dbal, fx_statements):
+    session_db, _, _, _ = fx_db
+    dbal = fx_cached_parent_dbal(session_db)
+
+    first = next(UNIQUE_STRING)
+    new = dbal.create(first=first)
+    dbal.update(new.id, second='uncommitted')
+
+    assert dbal.paginate(eq__first=first)['items'][0].second == 'uncommitted'
+    session_db.rollback()
+
+    assert dbal.paginate(eq__first=first)['items'][0].second is None
+    fx_statements.clear()
+
+    assert dbal.paginate(eq__first=first)['items'][0].second is None
+    assert fx_statements == []
+
+
+def test_dbal__cache__flush_before_mutation(fx_db, fx_cached_parent_dbal):
+    session_db, Parents, _, _ = fx_db
+    first = next(UNIQUE_STRING)
+    dbal = fx_cached_parent_dbal(session_db)
+    dbal.create(first=first)
+    session_db.commit()
+    assert len(dbal.paginate(eq__first=first)['items']) == 1
+
+    session_db.add(Parents(first=first))
+    session_db.flush()
+
+    assert len(fx_cached_parent_dbal(session_db).paginate(eq__first=first)['items']) == 2
+    session_db.rollback()
+
+
+def test_dbal__cache__disabled_without_listeners(fx_db, fx_parent_dbal, fx_cached_parent_dbal):
+    session_db, _, _, _ = fx_db
+    session = Session(session_db.get_bind())
+
+    fx_parent_dbal(session)._invalidate_cache()
+    assert not event.contains(session, 'after_flush', _on_after_flush)
+    assert session.info == {}
+
+    fx_cached_parent_dbal(session)
+    assert event.contains(session, 'after_flush', _on_after_flush)
+
+
+def test_dbal__cache__bump_after_commit(fx_db, fx_cached_parent_dbal, fx_cache_backend):
+    session_db, _, _, _ = fx_db
+    dbal = fx_cached_parent_dbal(session_db)
+    new = dbal.create(first=next(UNIQUE_STRING))
+
+    generation = fx_cache_backend.get_generation(dbal._cache_name())
+    dbal.update(new.id, second=next(UNIQUE_STRING))
+    assert fx_cache_backend.get_generation(dbal._cache_name()) == generation
+
+    session_db.commit()
+    assert fx_cache_backend.get_generation(dbal._cache_name()) != generation
+
+
+def test_dbal__cache__file_backend_private(tmp_path):
+    directory = tmp_path / 'cache'
+    FileCacheBackend(directory)
+    assert directory.stat().st_mode & 0o777 == 0o700
+
+    directory.chmod(0o755)
+    with pytest.raises(PermissionError):
+        FileCacheBackend(directory)
@@ -0,0 +1,55 @@
+from datetime import timedelta
+
+from db_first.dbal.change_feed import Watermark
+from sqlalchemy import event
+
+from tests.conftest import UNIQUE_STRING
+
+
+def test_dbal__change_feed(fx_events_db, fx_event_dbal):
+    session_db, _ = fx_events_db
+    dbal = fx_event_dbal(session_db)
+
+    since = None
+    for _, watermark in dbal.iter_changes(batch_size=100):
+        since = watermark
+
+    events = [dbal.create(name=next(UNIQUE_STRING)) for _ in range(5)]
+    ids = [event.id for event in events]
+
+    batches = list(dbal.iter_changes(since, batch_size=2))
+    assert [[obj.id for obj in objects] for objects, _ in batches] == [ids[:2], ids[2:4], ids[4:]]
+    watermark = batches[-1][1]
+    assert isinstance(watermark, Watermark)
+    assert watermark.id == ids[-1]
+
+    assert dbal.read_changes(watermark) == ([], watermark)
+
+    dbal.update(ids[1], name=next(UNIQUE_STRING))
+    objects, next_watermark = dbal.read_changes(watermark)
+    assert [obj.id for obj in objects] == [ids[1]]
+    assert next_watermark.timestamp > watermark.timestamp
+
+    assert dbal.read_changes(watermark, lag=timedelta(hours=1)) == ([], watermark)
+
+
+def test_dbal__change_feed__index(fx_events_db, fx_event_dbal):
+    session_db, _ = fx_events_db
+    dbal = fx_event_dbal(session_db)
+    engine = session_db.get_bind()
+    statements = []
+
+    def _collect(conn, cursor, statement, parameters, context, executemany):
+        statements.append((statement, parameters))
+
+    _, watermark = dbal.read_changes(batch_size=1)
+    event.listen(engine, 'before_cursor_execute', _collect)
+    try:
+        dbal.read_changes(watermark, batch_size=10)
+    finally:
+        event.remove(engine, 'before_cursor_execute', _collect)
+
+    (statement, parameters), *_ = statements
+    plan = session_db.connection().exec_driver_sql(f'EXPLAIN QUERY PLAN {statement}', parameters)
+
+    assert 'ix_events_changed_at' in ' '.join(row[-1] for row in plan)
@@ -0,0 +1,180 @@
+import pytest
+from db_first import ModelMixin
+from db_first.dbal import SqlaDBAL
+from db_first.dbal.counter_cache import CounterCache
+from db_first.dbal.exceptions import DBALCreateException
+from sqlalchemy import create_engine
+from sqlalchemy import event
+from sqlalchemy import insert
+from sqlalchemy import update
+from sqlalchemy.orm import declarative_base
+from sqlalchemy.orm import Mapped
+from sqlalchemy.orm import mapped_column
+from sqlalchemy.orm import Session
+
+
+@pytest.fixture
+def fx_tickets(tmp_path):
+    engine = create_engine(f'sqlite:///{tmp_path / "tickets.db"}')
+    Base = declarative_base()
+    counter_cache = CounterCache(Base.metadata)
+
+    class Tickets(Base, ModelMixin):
+        __tablename__ = 'tickets'
+
+        status: Mapped[str] = mapped_column(default='new')
+
+    class TicketsDBAL(SqlaDBAL[Tickets]):
+        """DBAL for Tickets."""
+
+        _counter_cache = counter_cache
+        _counter_columns = ('status',)
+
+    Base.metadata.create_all(engine)
+    counts = []
+
+    def _collect(conn, cursor, statement, parameters, context, executemany):
+        if statement.startswith('SELECT count('):
+            counts.append(statement)
+
+    event.listen(engine, 'before_cursor_execute', _collect)
+    with Session(engine) as session:
+        yield TicketsDBAL(session), counter_cache, counts
+    engine.dispose()
+
+
+def _counters(dbal, counter_cache):
+    table = counter_cache.table
+    rows = dbal._session.execute(table.select().where(table.c.name == dbal._counter_name())).all()
+    return {row.key: row.count for row in rows if row.count}
+
+
+def test_counter_cache__mutators(fx_tickets):
+    dbal, counter_cache, _ = fx_tickets
+
+    first = dbal.create(status='open')
+    second = dbal.create()
+    dbal.bulk_create([{'status': 'open'}, {'status': 'closed'}, {}])
+    dbal._session.commit()
+
+    assert _counters(dbal, counter_cache) == {
+        '': 5,
+        'status=open': 2,
+        'status=new': 2,
+        'status=closed': 1,
+    }
+
+    assert dbal.delete(first.id) is True
+    assert dbal.delete(first.id) is False
+    dbal.bulk_delete([second.id])
+
+    assert _counters(dbal, counter_cache) == {
+        '': 3,
+        'status=open': 1,
+        'status=new': 1,
+        'status=closed': 1,
+    }
+
+    result = dbal.delete_chunked(where={'and': [{'col': 'status', 'opr': 'eq', 'value': 'open'}]})
+
+    assert result['count'] == 1
+    assert _counters(dbal, counter_cache) == {'': 2, 'status=new': 1, 'status=closed': 1}
+
+
+def test_counter_cache__rollback(fx_tickets):
+    dbal, counter_cache, _ = fx_tickets
+    id_ = dbal.create(status='open').id
+    dbal._session.expunge_all()
+
+    with pytest.raises(DBALCreateException):
+        dbal.create(id=id_, status='open')
+
+    assert _counters(dbal, counter_cache) == {'': 1, 'status=open': 1}
+
+
+def test_counter_cache__paginate(fx_tickets):
+    dbal, _, counts = fx_tickets
+    dbal.bulk_create([{'status': 'open'}] * 3 + [{'status': 'closed'}] * 2)
+    dbal._session.commit()
+
+    total = dbal.paginate(include_metadata=True)['_metadata']['pagination']['total']
+    opened = dbal.paginate(include_metadata=True, eq__status='open')
+    assert (total, len(opened['items'])) == (5, 3)
+    assert opened['_metadata']['pagination']['total'] == 3
+    assert counts == []
+
+    result = dbal.paginate(include_metadata=True, eq__status='open', sort__created_at='asc')
+    assert result['_metadata']['pagination']['total'] == 3
+    assert counts == []
+
+    result = dbal.paginate(include_metadata=True, ne__status='open')
+    assert result['_metadata']['pagination']['total'] == 2
+    assert len(counts) == 1
+
+    result = dbal.paginate(include_metadata=True, eq__status='unknown')
+    assert result['_metadata']['pagination']['total'] == 0
+    assert len(counts) == 2
+
+
+def test_counter_cache__reconcile(fx_tickets):
+    dbal, counter_cache, _ = fx_tickets
+    ticket = dbal.create(status='open')
+    dbal.create(status='open')
+
+    model = dbal._model
+    dbal._session.execute(update(model).where(model.id == ticket.id).values(status='closed'))
+    dbal._session.execute(insert(model).values(status='new'))
+    dbal._session.commit()
+
+    assert dbal.reconcile_counters() == {
+        '': 1,
+        'status=open': -1,
+        'status=closed': 1,
+        'status=new': 1,
+    }
+    assert _counters(dbal, counter_cache) == {
+        '': 3,
+        'status=open': 1,
+        'status=closed': 1,
+        'status=new': 1,
+    }
+    assert dbal.reconcile_counters() == {}
+
+
+def test_counter_cache__stored_values(tmp_path):
+    engine = create_engine(f'sqlite:///{tmp_path / "tasks.db"}')
+    Base = declarative_base()
+    counter_cache = CounterCache(Base.metadata)
+
+    class Tasks(Base, ModelMixin):
+        __tablename__ = 'tasks'
+
+        done: Mapped[bool] = mapped_column(default=False)
+        kind: Mapped[str] = mapped_column(default=lambda: 'task')
+        priority: Mapped[str] = mapped_column(server_default='low')
+
+    class TasksDBAL(SqlaDBAL[Tasks]):
+        """DBAL for Tasks."""
+
+        _counter_cache = counter_cache
+        _counter_columns = ('done', 'kind', 'priority')
+
+    Base.metadata.create_all(engine)
+    with Session(engine) as session:
+        dbal = TasksDBAL(session)
+        dbal.bulk_create([{'done': 1}, {'done': 0}, {}])
+        dbal.create(done=True)
+        session.commit()
+
+        assert _counters(dbal, counter_cache) == {
+            '': 4,
+            'done=True': 2,
+            'done=False': 2,
+            'kind=task': 4,
+            'priority=low': 4,
+        }
+
+        result = dbal.paginate(eq__done=True, include_metadata=True)
+        assert result['_metadata']['pagination']['total'] == len(result['items']) == 2
+        assert dbal.reconcile_counters() == {}
+    engine.dispose()
@@ -0,0 +1,122 @@
+from concurrent.futures import ThreadPoolExecutor
+from threading import Barrier
+from threading import get_ident
+
+import pytest
+from db_first import ModelMixin
+from db_first.dbal import SqlaDBAL
+from db_first.dbal.factory import DBALFactory
+from sqlalchemy import text
+from sqlalchemy.exc import TimeoutError
+from sqlalchemy.orm import declarative_base
+from sqlalchemy.orm import Mapped
+from sqlalchemy.orm import mapped_column
+from sqlalchemy.pool import QueuePool
+
+THREADS = 4
+
+
+@pytest.fixture
+def fx_factory(tmp_path):
+    Base = declarative_base()
+
+    class Parcels(Base, ModelMixin):
+        __tablename__ = 'parcels'
+
+        name: Mapped[str] = mapped_column()
+
+    class ParcelsDBAL(SqlaDBAL[Parcels]):
+        """DBAL for Parcels."""
+
+    factory = DBALFactory(
+        f'sqlite:///{tmp_path / "parcels.db"}', pool_size=2, max_overflow=1, pool_timeout=0.2
+    )
+    Base.metadata.create_all(factory.engine)
+    yield factory, ParcelsDBAL
+    factory.dispose()
+
+
+def test_factory__session_per_thread(fx_factory):
+    factory, ParcelsDBAL = fx_factory
+    barrier = Barrier(THREADS)
+
+    def _work(number):
+        with factory.scope():
+            dbal = factory(ParcelsDBAL)
+            assert dbal._session is factory(ParcelsDBAL)._session
+            barrier.wait()
+            id_ = dbal.create(name=f'parcel-{number}').id
+            return get_ident(), id(dbal._session), dbal.read(id=id_).name
+
+    with ThreadPoolExecutor(THREADS) as executor:
+        results = list(executor.map(_work, range(THREADS)))
+
+    assert len({session for _, session, _ in results}) == THREADS
+    assert sorted(name for *_, name in results) == [f'parcel-{n}' for n in range(THREADS)]
+
+    metrics = factory.metrics()
+    assert metrics['checked_out'] == 0
+    assert metrics['saturation'] == 0
+    assert metrics['checkout_wait']['count'] >= THREADS
+
+
+def test_factory__saturation_and_timeout(fx_factory):
+    factory, _ = fx_factory
+    connections = [factory.engine.connect() for _ in range(3)]
+
+    metrics = factory.metrics()
+    assert metrics['checked_out'] == 3
+    assert metrics['overflow'] == 1
+    assert metrics['saturation'] == 1
+
+    with pytest.raises(TimeoutError):
+        factory.engine.connect()
+
+    metrics = factory.metrics()
+    assert metrics['checkout_timeouts'] == 1
+    assert metrics['checkout_wait']['max'] >= 0.2
+
+    for connection in connections:
+        connection.close()
+
+    assert factory.metrics()['saturation'] == 0
+
+
+def test_factory__connection_lifetime(fx_factory):
+    factory, ParcelsDBAL = fx_factory
+
+    with factory.scope():
+        factory(ParcelsDBAL).create(name='parcel')
+
+    assert factory.metrics()['connection_lifetime']['count'] == 0
+
+    factory.dispose()
+
+    lifetime = factory.metrics()['connection_lifetime']
+    assert lifetime['count'] >= 1
+    assert lifetime['max'] > 0
+
+
+def test_factory__sqlite_memory():
+    factory = DBALFactory('sqlite://', pool_size=2)
+    try:
+        assert not isinstance(factory.engine.pool, QueuePool)
+        with factory.scope() as session:
+            assert session.execute(text('SELECT 1')).scalar() == 1
+        assert factory.metrics()['checkout_wait']['count'] == 0
+    finally:
+        factory.dispose()
+
+
+def test_factory__checkout_error(monkeypatch, fx_factory):
+    factory, _ = fx_factory
+    factory.dispose()
+
+    def _fail(*args, **kwargs):
+        raise OSError('refused')
+
+    monkeypatch.setattr(factory.engine.dialect, 'connect', _fail)
+    with pytest.raises(OSError):
+        factory.engine.connect()
+
+    assert factory.metrics()['checkout_timeouts'] == 0
@@ -0,0 +1,76 @@
+import asyncio
+from uuid import uuid4
+
+import pytest
+from db_first.dbal.exceptions import DBALObjectNotFoundException
+from sqlalchemy import event
+
+from tests.conftest import UNIQUE_STRING
+
+
+@pytest.fixture
+def fx_statements(fx_db):
+    session_db, _, _, _ = fx_db
+    engine = session_db.get_bind()
+    statements = []
+
+    def _collect(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    event.listen(engine, 'before_cursor_execute', _collect)
+    yield statements
+    event.remove(engine, 'before_cursor_execute', _collect)
+
+
+def test_dbal__loader(fx_db, fx_parent_dbal, fx_statements):
+    session_db, _, _, _ = fx_db
+
+    new = [fx_parent_dbal(session_db).create(first=next(UNIQUE_STRING)) for _ in range(3)]
+    ids = [obj.id for obj in new]
+    fx_statements.clear()
+
+    loader = fx_parent_dbal(session_db).loader()
+    with loader.batch():
+        future_1 = loader.load(ids[2])
+        with loader.batch():
+            futures = loader.load_many([ids[1], ids[2], ids[0]])
+        missing = loader.load(uuid4())
+
+        assert not future_1.done()
+
+    assert len(fx_statements) == 1
+    assert future_1.result() == new[2]
+    assert [future.result() for future in futures] == [new[1], new[2], new[0]]
+    with pytest.raises(DBALObjectNotFoundException):
+        missing.result()
+
+    assert loader.load(ids[0]).result() == new[0]
+    assert len(fx_statements) == 1
+
+
+def test_dbal__loader_async(fx_db, fx_parent_dbal, fx_statements):
+    session_db, _, _, _ = fx_db
+
+    new = [fx_parent_dbal(session_db).create(first=next(UNIQUE_STRING)) for _ in range(3)]
+    ids = [obj.id for obj in new]
+    fx_statements.clear()
+
+    loader = fx_parent_dbal(session_db).loader()
+
+    async def _handler(id_):
+        return await loader.load_async(id_)
+
+    async def _main():
+        return await asyncio.gather(
+            _handler(ids[1]),
+            loader.load_many_async([ids[0], ids[1]]),
+            _handler(ids[2]),
+            _handler(uuid4()),
+            return_exceptions=True,
+        )
+
+    result = asyncio.run(_main())
+
+    assert len(fx_statements) == 1
+    assert result[:3] == [new[1], [new[0], new[1]], new[2]]
+    assert isinstance(result[3], DBALObjectNotFoundException)
@@ -0,0 +1,72 @@
+from collections import OrderedDict
+from types import SimpleNamespace
+from uuid import uuid4
+
+import pytest
+from db_first.dbal.prepared import PreparedStatements
+from sqlalchemy import Column
+from sqlalchemy import create_engine
+from sqlalchemy import event
+from sqlalchemy import Integer
+from sqlalchemy import MetaData
+from sqlalchemy import Table
+from sqlalchemy.exc import DisconnectionError
+
+
+def test_prepared_statements__not_postgresql():
+    with pytest.raises(NotImplementedError, match=r'DB <sqlite\+pysqlite> not implemented.'):
+        PreparedStatements().install(create_engine('sqlite://'))
+
+
+def test_prepared_statements__accounting():
+    prepared = PreparedStatements(prepare_threshold=2, prepared_max=2)
+    counts = OrderedDict()
+
+    for statement in ['a', 'a', 'a', 'b', 'a', 'c', 'b', 'b', 'b']:
+        prepared._count(counts, statement, {})
+
+    stats = prepared.stats()
+    assert stats['executions'] == 9
+    assert stats['prepared_executions'] == 3
+    assert stats['top'] == [('a', 2), ('b', 1)]
+    assert list(counts) == ['c', 'b']
+
+
+def test_prepared_statements__invalidation():
+    prepared = PreparedStatements()
+    connection = SimpleNamespace(prepare_threshold=None, prepared_max=None)
+    record = SimpleNamespace(info={})
+
+    prepared._on_connect(connection, record)
+    prepared._on_checkout(connection, record, None)
+    assert connection.prepare_threshold == 2
+    assert connection.prepared_max == 100
+
+    prepared._on_after_cursor_execute(
+        None, None, 'CREATE', {}, SimpleNamespace(isddl=True, execution_options={}), False
+    )
+    with pytest.raises(DisconnectionError):
+        prepared._on_checkout(connection, record, None)
+
+    prepared._on_connect(connection, record)
+    prepared._on_checkout(connection, record, None)
+
+
+def test_prepared_statements__temporary_ddl(fx_db, fx_parent_dbal):
+    session_db, _, _, _ = fx_db
+    engine = session_db.get_bind()
+    prepared = PreparedStatements()
+
+    event.listen(engine, 'after_cursor_execute', prepared._on_after_cursor_execute)
+    try:
+        with fx_parent_dbal(session_db)._ids_temp_table([uuid4()]):
+            pass
+        assert prepared._generation == 0
+
+        table = Table('prepared_ddl', MetaData(), Column('id', Integer))
+        table.create(session_db.connection())
+        table.drop(session_db.connection())
+        assert prepared._generation == 2
+    finally:
+        event.remove(engine, 'after_cursor_execute', prepared._on_after_cursor_execute)
+        session_db.rollback()
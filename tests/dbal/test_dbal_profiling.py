@@ -0,0 +1,114 @@
+import tracemalloc
+
+import pytest
+from db_first.exc import MemoryBudgetError
+from db_first.profiling import call_shape
+from db_first.profiling import MemoryProfiler
+from db_first.schemas import BaseSchema
+
+from tests.conftest import UNIQUE_STRING
+from tests.contrib.schemas import ParentPaginationSchema
+
+
+@pytest.fixture
+def fx_parents(fx_db):
+    session_db, parents_model, _, _ = fx_db
+    objects = [parents_model(first=next(UNIQUE_STRING)) for _ in range(20)]
+    session_db.add_all(objects)
+    session_db.commit()
+    return [obj.id for obj in objects]
+
+
+def test_call_shape():
+    assert call_shape((), {'per_page': 20, 'eq__first': 'a'}) == 'eq__first,per_page'
+    assert call_shape(([1] * 3,), {}) == '#0[4]'
+    assert call_shape(([1] * 4,), {}) == call_shape(([1] * 3,), {})
+    assert call_shape((), {'ids': []}) == 'ids[1]'
+
+
+def test_profiler__stats_per_method_and_shape(fx_db, fx_parent_dbal, fx_parents):
+    session_db, _, _, _ = fx_db
+
+    class ProfiledParentsDBAL(fx_parent_dbal):
+        """DBAL for Parents with profiling of memory."""
+
+        _memory_profiler = MemoryProfiler(top_sites=5)
+
+    dbal = ProfiledParentsDBAL(session_db)
+    with ProfiledParentsDBAL._memory_profiler:
+        dbal.bulk_read(fx_parents[:2])
+        dbal.bulk_read(fx_parents)
+        dbal.paginate(ids=fx_parents, per_page=20)
+        dbal.paginate(ids=fx_parents, per_page=10)
+
+    assert not tracemalloc.is_tracing()
+
+    stats = ProfiledParentsDBAL._memory_profiler.stats()
+    assert set(stats) == {
+        'ProfiledParentsDBAL.bulk_read(#0[2])',
+        'ProfiledParentsDBAL.bulk_read(#0[32])',
+        'ProfiledParentsDBAL.paginate(ids[32],per_page)',
+    }
+    paginate = stats['ProfiledParentsDBAL.paginate(ids[32],per_page)']
+    assert paginate['calls'] == 2
+    assert 0 < paginate['peak_avg'] <= paginate['peak_max']
+    assert paginate['over_budget'] == 0
+    assert stats['ProfiledParentsDBAL.bulk_read(#0[32])']['peak_max'] > 0
+
+    top = ProfiledParentsDBAL._memory_profiler.top()
+    assert 0 < len(top) <= 5
+    assert all(site['size'] > 0 for site in top)
+    assert all('profiling.py' not in site['site'] for site in top)
+
+
+def test_profiler__budget(fx_db, fx_parent_dbal, fx_parents):
+    session_db, _, _, _ = fx_db
+
+    class ProfiledParentsDBAL(fx_parent_dbal):
+        """DBAL for Parents with budget of memory."""
+
+        _memory_profiler = MemoryProfiler(budget=1024)
+
+    dbal = ProfiledParentsDBAL(session_db)
+    with ProfiledParentsDBAL._memory_profiler:
+        with pytest.raises(MemoryBudgetError, match='ProfiledParentsDBAL.bulk_read'):
+            dbal.bulk_read(fx_parents)
+
+        first = next(UNIQUE_STRING)
+        dbal.bulk_create([{'first': first} for _ in range(50)])
+        session_db.rollback()
+
+    stats = ProfiledParentsDBAL._memory_profiler.stats()
+    assert stats['ProfiledParentsDBAL.bulk_read(#0[32])']['over_budget'] == 1
+    assert stats['ProfiledParentsDBAL.bulk_create(#0[64])']['over_budget'] == 1
+
+
+def test_profiler__stop_restores_tracing():
+    profiler = MemoryProfiler()
+    with profiler.profile('call'):
+        pass
+    profiler.stop()
+    assert not tracemalloc.is_tracing()
+
+    tracemalloc.start()
+    try:
+        with profiler:
+            pass
+        assert tracemalloc.is_tracing()
+    finally:
+        tracemalloc.stop()
+
+
+def test_profiler__schema_dump_nested_in_call(fx_db, fx_parent_dbal, fx_parents, monkeypatch):
+    session_db, _, _, _ = fx_db
+    profiler = MemoryProfiler()
+    monkeypatch.setattr(BaseSchema, '_memory_profiler', profiler)
+
+    with profiler, profiler.profile('request'):
+        result = fx_parent_dbal(session_db).paginate(ids=fx_parents, per_page=20)
+        ParentPaginationSchema().dump(result)
+
+    stats = profiler.stats()
+    assert stats['ParentPaginationSchema.dump(#0)']['calls'] == 1
+    assert stats['ParentSchema.dump(#0[32],many)']['calls'] == 1
+    assert stats['request()']['peak_max'] >= stats['ParentPaginationSchema.dump(#0)']['peak_max']
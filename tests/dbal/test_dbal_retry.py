@@ -0,0 +1,114 @@
+import sqlite3
+
+import pytest
+from db_first.dbal.exceptions import DBALCreateException
+from db_first.dbal.retry import RetryPolicy
+from sqlalchemy import event
+
+from tests.conftest import UNIQUE_STRING
+
+
+def _make_busy_error() -> sqlite3.OperationalError:
+    error = sqlite3.OperationalError('database is locked')
+    error.sqlite_errorcode = sqlite3.SQLITE_BUSY
+    error.sqlite_errorname = 'SQLITE_BUSY'
+    return error
+
+
+@pytest.fixture
+def fx_busy_inserts(fx_db):
+    session_db, _, _, _ = fx_db
+    engine = session_db.get_bind()
+    failures = {'count': 0}
+
+    def _fail(conn, cursor, statement, parameters, context, executemany):
+        if statement.startswith('INSERT INTO parents') and failures['count']:
+            failures['count'] -= 1
+            raise _make_busy_error()
+
+    event.listen(engine, 'before_cursor_execute', _fail)
+    yield failures
+    event.remove(engine, 'before_cursor_execute', _fail)
+
+
+@pytest.fixture
+def fx_retry_parent_dbal(fx_parent_dbal):
+    class RetryParentsDBAL(fx_parent_dbal):
+        """DBAL for Parents with retries."""
+
+        _retry_policy = RetryPolicy(attempts=3, base_delay=0)
+
+    return RetryParentsDBAL
+
+
+def test_dbal__retry(fx_db, fx_retry_parent_dbal, fx_busy_inserts):
+    session_db, _, _, _ = fx_db
+    session_db.commit()
+    retries = []
+    fx_retry_parent_dbal._retry_policy._on_retry = lambda *args: retries.append(args)
+
+    fx_busy_inserts['count'] = 2
+    new = fx_retry_parent_dbal(session_db).create(first=next(UNIQUE_STRING))
+
+    assert fx_retry_parent_dbal(session_db).read(new.id) == new
+    assert [attempt for attempt, _, _ in retries] == [1, 2]
+    assert fx_retry_parent_dbal._retry_policy.stats() == {
+        'retries': 2,
+        'retries:SQLITE_BUSY': 2,
+        'recovered': 1,
+    }
+
+    session_db.commit()
+    fx_busy_inserts['count'] = 3
+    with pytest.raises(DBALCreateException):
+        fx_retry_parent_dbal(session_db).create(first=next(UNIQUE_STRING))
+    session_db.rollback()
+
+    assert fx_retry_parent_dbal._retry_policy.stats()['exhausted:SQLITE_BUSY'] == 1
+
+
+def test_dbal__retry__not_whole_transaction(fx_db, fx_retry_parent_dbal, fx_busy_inserts):
+    session_db, _, _, _ = fx_db
+    fx_retry_parent_dbal(session_db).read_all()
+
+    fx_busy_inserts['count'] = 1
+    with pytest.raises(DBALCreateException):
+        fx_retry_parent_dbal(session_db).create(first=next(UNIQUE_STRING))
+    session_db.rollback()
+
+    assert fx_retry_parent_dbal._retry_policy.stats() == {}
+
+
+def test_dbal__run_transaction(fx_db, fx_retry_parent_dbal, fx_busy_inserts):
+    session_db, _, _, _ = fx_db
+    session_db.commit()
+    calls = []
+
+    def _create(dbal):
+        calls.append(dbal)
+        return [dbal.create(first=first) for first in firsts]
+
+    firsts = [next(UNIQUE_STRING) for _ in range(3)]
+    fx_busy_inserts['count'] = 1
+    new = fx_retry_parent_dbal(session_db).run_transaction(_create)
+
+    assert len(calls) == 2
+    assert fx_retry_parent_dbal(session_db).read_filtered_list(first=firsts) == new
+
+
+@pytest.mark.parametrize(
+    'sqlstate, code', [('40001', '40001'), ('40P01', '40P01'), ('23505', None)]
+)
+def test_retry_policy__error_code(sqlstate, code):
+    class PgError(Exception):
+        pass
+
+    error = PgError()
+    error.sqlstate = sqlstate
+    try:
+        try:
+            raise error
+        except PgError as e:
+            raise DBALCreateException(e)
+    except DBALCreateException as e:
+        assert RetryPolicy.error_code(e) == code
@@ -0,0 +1,210 @@
+import asyncio
+import time
+from concurrent.futures import ThreadPoolExecutor
+from threading import Barrier
+from uuid import uuid4
+
+import pytest
+from db_first import ModelMixin
+from db_first.dbal import SqlaDBAL
+from db_first.dbal.exceptions import DBALObjectNotFoundException
+from db_first.dbal.single_flight import SingleFlight
+from sqlalchemy import create_engine
+from sqlalchemy import event
+from sqlalchemy import Select
+from sqlalchemy import select
+from sqlalchemy.orm import declarative_base
+from sqlalchemy.orm import Mapped
+from sqlalchemy.orm import mapped_column
+from sqlalchemy.orm import sessionmaker
+
+THREADS = 5
+
+
+@pytest.fixture
+def fx_flights(tmp_path):
+    engine = create_engine(f'sqlite:///{tmp_path / "flights.db"}')
+    Base = declarative_base()
+
+    class Flights(Base, ModelMixin):
+        __tablename__ = 'flights'
+
+        name: Mapped[str] = mapped_column()
+
+    class FlightsDBAL(SqlaDBAL[Flights]):
+        """DBAL for Flights."""
+
+        _single_flight = SingleFlight()
+
+    Base.metadata.create_all(engine)
+    selects = []
+
+    def _slow_select(conn, cursor, statement, parameters, context, executemany):
+        if statement.startswith('SELECT'):
+            selects.append(statement)
+            time.sleep(0.2)
+
+    event.listen(engine, 'before_cursor_execute', _slow_select)
+    yield FlightsDBAL, sessionmaker(engine), selects
+    engine.dispose()
+
+
+def _call_concurrently(fn):
+    barrier = Barrier(THREADS)
+
+    def _call(_):
+        barrier.wait()
+        try:
+            return fn()
+        except Exception as e:
+            return e
+
+    with ThreadPoolExecutor(THREADS) as executor:
+        return list(executor.map(_call, range(THREADS)))
+
+
+def test_dbal__single_flight__read(fx_flights):
+    dbal, session_factory, selects = fx_flights
+    session = session_factory()
+    new_id = dbal(session).create(name='flight').id
+    selects.clear()
+
+    sessions = []
+
+    def _read():
+        session = session_factory()
+        sessions.append(session)
+        obj = dbal(session).read(new_id)
+        return obj, obj in session, obj.name
+
+    results = _call_concurrently(_read)
+
+    assert len(selects) == 1
+    assert all(result[1:] == (True, 'flight') for result in results)
+    assert len({id(result[0]) for result in results}) == THREADS
+    assert dbal._single_flight.stats() == {
+        'calls': THREADS,
+        'leaders': 1,
+        'shared': THREADS - 1,
+        'in_flight': 0,
+    }
+
+    missing_id = uuid4()
+    results = _call_concurrently(lambda: dbal(session_factory()).read(missing_id))
+    assert all(isinstance(result, DBALObjectNotFoundException) for result in results)
+    assert len({id(result) for result in results}) == THREADS
+
+
+def test_dbal__single_flight__key(fx_flights, monkeypatch):
+    dbal, session_factory, _ = fx_flights
+    flights = dbal(session_factory())
+    first, second = uuid4(), uuid4()
+
+    def _make_stmt(id_):
+        return select(dbal._model).where(dbal._model.id == id_)
+
+    monkeypatch.setattr(Select, 'compile', None)
+
+    assert flights._single_flight_key(_make_stmt(first)) == flights._single_flight_key(
+        _make_stmt(first)
+    )
+    assert flights._single_flight_key(_make_stmt(first)) != flights._single_flight_key(
+        _make_stmt(second)
+    )
+
+
+def test_dbal__single_flight__paginate(fx_flights):
+    dbal, session_factory, selects = fx_flights
+    session = session_factory()
+    dbal(session).bulk_create([{'name': f'flight_{i}'} for i in range(3)])
+    session.commit()
+    selects.clear()
+
+    results = _call_concurrently(
+        lambda: dbal(session_factory()).paginate(sort__name='asc', include_metadata=True)
+    )
+
+    assert len(selects) == 2
+    assert all(
+        [obj.name for obj in result['items']] == ['flight_0', 'flight_1', 'flight_2']
+        for result in results
+    )
+    assert all(result['_metadata']['pagination']['total'] == 3 for result in results)
+
+
+def test_dbal__single_flight__uncommitted(fx_flights):
+    dbal, session_factory, _ = fx_flights
+    session = session_factory()
+    new_id = dbal(session).create(name='flight').id
+    dbal(session).update(new_id, name='uncommitted')
+    stats = dbal._single_flight.stats()
+
+    assert dbal(session).read(new_id).name == 'uncommitted'
+    assert dbal(session).paginate()['items'][0].name == 'uncommitted'
+    assert dbal._single_flight.stats() == stats
+
+    session.rollback()
+    assert dbal(session).read(new_id).name == 'flight'
+    assert dbal._single_flight.stats()['calls'] == stats['calls'] + 1
+
+
+def test_single_flight__async():
+    flight = SingleFlight()
+    calls = []
+
+    async def _read():
+        calls.append(1)
+        await asyncio.sleep(0.05)
+        return 'result'
+
+    async def _main():
+        return await asyncio.gather(*[flight.do_async('key', _read) for _ in range(3)])
+
+    results = asyncio.run(_main())
+
+    assert calls == [1]
+    assert sorted(results) == [('result', False), ('result', True), ('result', True)]
+
+
+def test_single_flight__async_cancelled_leader():
+    flight = SingleFlight()
+    calls = []
+
+    async def _read():
+        calls.append(1)
+        await asyncio.sleep(0.05)
+        return 'result'
+
+    async def _main():
+        leader = asyncio.create_task(flight.do_async('key', _read))
+        await asyncio.sleep(0)
+        followers = [asyncio.create_task(flight.do_async('key', _read)) for _ in range(2)]
+        await asyncio.sleep(0.01)
+        leader.cancel()
+
+        with pytest.raises(asyncio.CancelledError):
+            await leader
+        return await asyncio.gather(*followers)
+
+    results = asyncio.run(_main())
+
+    assert calls == [1, 1]
+    assert sorted(results) == [('result', False), ('result', True)]
+    assert flight.stats()['calls'] == 3
+
+
+def test_single_flight__async_error():
+    flight = SingleFlight()
+
+    async def _read():
+        await asyncio.sleep(0.05)
+        raise ValueError('wrong')
+
+    async def _main():
+        tasks = [flight.do_async('key', _read) for _ in range(3)]
+        return await asyncio.gather(*tasks, return_exceptions=True)
+
+    errors = asyncio.run(_main())
+
+    assert all(isinstance(error, ValueError) and str(error) == 'wrong' for error in errors)
+    assert len({id(error) for error in errors}) == 3
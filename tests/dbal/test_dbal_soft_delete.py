@@ -0,0 +1,99 @@
+from datetime import datetime
+from datetime import timezone
+
+import pytest
+from db_first.dbal.exceptions import DBALObjectNotFoundException
+from sqlalchemy import select
+
+from tests.conftest import UNIQUE_STRING
+
+
+def test_dbal__soft_delete(fx_soft_db, fx_document_dbal):
+    session_db, documents_model, _ = fx_soft_db
+
+    new_1 = fx_document_dbal(session_db).create(title=next(UNIQUE_STRING))
+    new_2 = fx_document_dbal(session_db).create(title=next(UNIQUE_STRING))
+
+    fx_document_dbal(session_db).delete(new_2.id)
+
+    with pytest.raises(DBALObjectNotFoundException):
+        fx_document_dbal(session_db).read(new_2.id)
+
+    with pytest.raises(DBALObjectNotFoundException):
+        fx_document_dbal(session_db).read_filtered(title=new_2.title)
+
+    assert fx_document_dbal(session_db).bulk_read([new_1.id, new_2.id]) == [new_1]
+    assert new_2 not in fx_document_dbal(session_db).read_all()
+    assert fx_document_dbal(session_db).read_filtered_list(id=[new_1.id, new_2.id]) == [new_1]
+
+    deleted = session_db.scalars(select(documents_model).where(documents_model.id == new_2.id))
+    assert deleted.one().deleted_at is not None
+
+
+def test_dbal__soft_bulk_delete__paginate(fx_soft_db, fx_document_dbal):
+    session_db, _, _ = fx_soft_db
+
+    new = [fx_document_dbal(session_db).create(title=next(UNIQUE_STRING)) for _ in range(3)]
+
+    fx_document_dbal(session_db).bulk_delete([new[0].id, new[1].id])
+
+    result = fx_document_dbal(session_db).paginate(
+        ids=[obj.id for obj in new], include_metadata=True
+    )
+
+    assert result['items'] == [new[2]]
+    assert result['_metadata']['pagination']['total'] == 1
+
+
+def test_dbal__purge(fx_soft_db, fx_document_dbal):
+    session_db, documents_model, archive_model = fx_soft_db
+
+    new = [fx_document_dbal(session_db).create(title=next(UNIQUE_STRING)) for _ in range(5)]
+    ids = [obj.id for obj in new]
+    fx_document_dbal(session_db).bulk_delete(ids[:4])
+
+    assert fx_document_dbal(session_db).purge(older_than=datetime(2000, 1, 1)) == 0
+
+    purged = fx_document_dbal(session_db).purge(batch_size=3, archive_model=archive_model)
+
+    assert purged >= 4
+    rows = session_db.scalars(select(documents_model.id)).all()
+    assert set(rows) & set(ids) == {ids[4]}
+
+    archived = session_db.scalars(select(archive_model)).all()
+    assert set(ids[:4]) <= {obj.id for obj in archived}
+    assert all(obj.deleted_at for obj in archived)
+
+
+def test_dbal__purge__without_soft_delete(fx_db, fx_parent_dbal):
+    session_db, _, _, _ = fx_db
+
+    with pytest.raises(NotImplementedError):
+        fx_parent_dbal(session_db).purge()
+
+
+def test_model_mixin__validate_deleted_at(fx_soft_db):
+    _, documents_model, _ = fx_soft_db
+
+    with pytest.raises(ValueError, match=r'.* <deleted_at> .*'):
+        documents_model(title='title', deleted_at=datetime.now())
+
+    assert documents_model(title='title', deleted_at=datetime.now(timezone.utc)).deleted_at
+
+
+def test_dbal__soft_bulk_update(fx_soft_db, fx_document_dbal):
+    session_db, documents_model, _ = fx_soft_db
+
+    new = [fx_document_dbal(session_db).create(title=next(UNIQUE_STRING)) for _ in range(2)]
+    fx_document_dbal(session_db).delete(new[1].id)
+
+    with pytest.raises(DBALObjectNotFoundException):
+        fx_document_dbal(session_db).bulk_update(
+            [{'id': obj.id, 'title': 'updated'} for obj in new]
+        )
+    session_db.rollback()
+
+    titles = session_db.scalars(
+        select(documents_model.title).where(documents_model.id == new[1].id)
+    )
+    assert titles.one() != 'updated'
@@ -0,0 +1,93 @@
+from uuid import uuid4
+
+import pytest
+from db_first.dbal.exceptions import DBALForeignKeyConstraintFailedException
+from sqlalchemy import event
+
+from tests.conftest import UNIQUE_STRING
+
+
+@pytest.fixture
+def fx_commit_counter(fx_db):
+    session_db, _, _, _ = fx_db
+    engine = session_db.get_bind()
+    commits = []
+
+    def _count(connection):
+        commits.append(connection)
+
+    event.listen(engine, 'commit', _count)
+    yield commits
+    event.remove(engine, 'commit', _count)
+
+
+@pytest.mark.parametrize('deferred_flush', [False, True])
+def test_dbal__transaction(fx_db, fx_parent_dbal, fx_commit_counter, deferred_flush):
+    session_db, _, _, _ = fx_db
+
+    firsts = [next(UNIQUE_STRING) for _ in range(10)]
+    with fx_parent_dbal(session_db).transaction(deferred_flush=deferred_flush) as dbal:
+        new = [dbal.create(first=first) for first in firsts]
+
+    assert len(fx_commit_counter) == 1
+    assert fx_parent_dbal(session_db).read_filtered_list(first=firsts) == new
+
+
+def test_dbal__transaction__delete(fx_db, fx_parent_dbal, fx_commit_counter):
+    session_db, _, _, _ = fx_db
+
+    new = [fx_parent_dbal(session_db).create(first=next(UNIQUE_STRING)) for _ in range(3)]
+    ids = [obj.id for obj in new]
+    fx_commit_counter.clear()
+
+    with fx_parent_dbal(session_db).transaction() as dbal:
+        dbal.delete(ids[0])
+        dbal.bulk_delete(ids[1:])
+
+    assert len(fx_commit_counter) == 1
+    assert fx_parent_dbal(session_db).bulk_read(ids) == []
+
+
+def test_dbal__transaction__rollback(fx_db, fx_parent_dbal, fx_commit_counter):
+    session_db, _, _, _ = fx_db
+
+    first = next(UNIQUE_STRING)
+    with pytest.raises(DBALForeignKeyConstraintFailedException):
+        with fx_parent_dbal(session_db).transaction() as dbal:
+            dbal.create(first=first)
+            dbal.create(first=next(UNIQUE_STRING), father_id=uuid4())
+
+    assert not fx_commit_counter
+    assert fx_parent_dbal(session_db).read_filtered_list(first=first) == []
+
+
+def test_dbal__transaction__deferred_flush_error(fx_db, fx_parent_dbal):
+    session_db, _, _, _ = fx_db
+
+    first = next(UNIQUE_STRING)
+    with pytest.raises(DBALForeignKeyConstraintFailedException):
+        with fx_parent_dbal(session_db).transaction(deferred_flush=True) as dbal:
+            dbal.create(first=first)
+            dbal.create(first=next(UNIQUE_STRING), father_id=uuid4())
+
+    assert fx_parent_dbal(session_db).read_filtered_list(first=first) == []
+
+
+def test_dbal__transaction__nested(fx_db, fx_parent_dbal, fx_commit_counter):
+    session_db, _, _, _ = fx_db
+
+    first_1, first_2, first_3 = next(UNIQUE_STRING), next(UNIQUE_STRING), next(UNIQUE_STRING)
+    with fx_parent_dbal(session_db).transaction() as dbal:
+        dbal.create(first=first_1)
+
+        with pytest.raises(DBALForeignKeyConstraintFailedException):
+            with dbal.transaction():
+                dbal.create(first=first_2)
+                dbal.create(first=next(UNIQUE_STRING), father_id=uuid4())
+
+        with dbal.transaction():
+            dbal.create(first=first_3)
+
+    assert len(fx_commit_counter) == 1
+    result = fx_parent_dbal(session_db).read_filtered_list(first=[first_1, first_2, first_3])
+    assert [obj.first for obj in result] == [first_1, first_3]
@@ -0,0 +1,111 @@
+from uuid import uuid4
+
+import pytest
+from db_first.dbal.exceptions import DBALObjectNotFoundException
+from db_first.dbal.exceptions import DBALUpdateException
+from db_first.dbal.exceptions import DBALVersionConflictException
+
+from tests.conftest import UNIQUE_STRING
+
+
+def test_dbal__update__version(fx_events_db, fx_event_dbal):
+    session_db, _ = fx_events_db
+
+    new = fx_event_dbal(session_db).create(name=next(UNIQUE_STRING))
+    assert new.version == 1
+
+    updated = fx_event_dbal(session_db).update(new.id, name=next(UNIQUE_STRING))
+    assert updated.version == 2
+
+    updated = fx_event_dbal(session_db).update(new.id, version=2, name=next(UNIQUE_STRING))
+    assert updated.version == 3
+
+
+def test_dbal__update__version_conflict(fx_events_db, fx_event_dbal):
+    session_db, _ = fx_events_db
+
+    new = fx_event_dbal(session_db).create(name=next(UNIQUE_STRING))
+    fx_event_dbal(session_db).update(new.id, version=1, name=next(UNIQUE_STRING))
+
+    with pytest.raises(DBALVersionConflictException) as e:
+        fx_event_dbal(session_db).update(new.id, version=1, name=next(UNIQUE_STRING))
+
+    assert e.value.args[0] == (f'Version <1> of object <{new.id}> is outdated, actual version <2>.')
+
+    with pytest.raises(DBALUpdateException) as e:
+        fx_event_dbal(session_db).update(uuid4(), version=1, name=next(UNIQUE_STRING))
+
+    assert not isinstance(e.value, DBALVersionConflictException)
+
+
+def test_dbal__bulk_update__version(fx_events_db, fx_event_dbal):
+    session_db, _ = fx_events_db
+
+    new_1 = fx_event_dbal(session_db).create(name=next(UNIQUE_STRING))
+    new_2 = fx_event_dbal(session_db).create(name=next(UNIQUE_STRING))
+
+    data = [
+        {'id': new_1.id, 'version': 1, 'name': next(UNIQUE_STRING)},
+        {'id': new_2.id, 'version': 1, 'name': next(UNIQUE_STRING)},
+    ]
+    fx_event_dbal(session_db).bulk_update(data)
+    session_db.commit()
+
+    assert fx_event_dbal(session_db).read(new_1.id).version == 2
+    assert fx_event_dbal(session_db).read(new_2.id).name == data[1]['name']
+
+    data = [
+        {'id': new_1.id, 'version': 2, 'name': next(UNIQUE_STRING)},
+        {'id': new_2.id, 'version': 1, 'name': next(UNIQUE_STRING)},
+    ]
+    with pytest.raises(DBALVersionConflictException):
+        fx_event_dbal(session_db).bulk_update(data)
+    session_db.commit()
+
+    assert fx_event_dbal(session_db).read(new_1.id).version == 2
+
+
+def test_dbal__bulk_update__version_non_exist_id(fx_events_db, fx_event_dbal):
+    session_db, _ = fx_events_db
+
+    new = fx_event_dbal(session_db).create(name=next(UNIQUE_STRING))
+
+    data = [
+        {'id': new.id, 'version': 1, 'name': next(UNIQUE_STRING)},
+        {'id': uuid4(), 'version': 1, 'name': next(UNIQUE_STRING)},
+    ]
+    with pytest.raises(DBALObjectNotFoundException):
+        fx_event_dbal(session_db).bulk_update(data)
+
+
+def test_dbal__bulk_update__conflict_keeps_pending(fx_events_db, fx_event_dbal):
+    session_db, _ = fx_events_db
+
+    new = fx_event_dbal(session_db).create(name=next(UNIQUE_STRING))
+    pending = fx_event_dbal(session_db).create(name=next(UNIQUE_STRING))
+    pending.name = 'pending'
+    session_db.flush()
+
+    with pytest.raises(DBALVersionConflictException):
+        fx_event_dbal(session_db).bulk_update([{'id': new.id, 'version': 5, 'name': 'x'}])
+    session_db.commit()
+
+    assert fx_event_dbal(session_db).read(pending.id).name == 'pending'
+
+
+def test_dbal__bulk_update__different_keys(fx_events_db, fx_event_dbal):
+    session_db, _ = fx_events_db
+
+    new_1 = fx_event_dbal(session_db).create(name=next(UNIQUE_STRING))
+    new_2 = fx_event_dbal(session_db).create(name=next(UNIQUE_STRING))
+
+    fx_event_dbal(session_db).bulk_update(
+        [{'id': new_1.id, 'version': 1, 'name': 'first'}, {'id': new_2.id, 'name': 'second'}]
+    )
+    session_db.commit()
+
+    assert fx_event_dbal(session_db).read(new_1.id).name == 'first'
+    assert fx_event_dbal(session_db).read(new_2.id).version == 2
+
+    with pytest.raises(DBALUpdateException):
+        fx_event_dbal(session_db).bulk_update([{'name': 'without id'}])
@@ -0,0 +1,193 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from threading import Event
+from time import sleep
+
+import pytest
+from db_first import ModelMixin
+from db_first.dbal import SqlaDBAL
+from db_first.dbal.counter_cache import CounterCache
+from db_first.dbal.exceptions import DBALCreateException
+from db_first.dbal.exceptions import DBALNotNullConstraintFailedException
+from db_first.dbal.exceptions import DBALUnexpectedValueTypeException
+from db_first.dbal.exceptions import DBALWriteBehindOverflowException
+from db_first.dbal.write_behind import _stop
+from db_first.dbal.write_behind import AsyncWriteBehindBuffer
+from db_first.dbal.write_behind import WriteBehindBuffer
+from sqlalchemy import create_engine
+from sqlalchemy import event
+from sqlalchemy.orm import declarative_base
+from sqlalchemy.orm import Mapped
+from sqlalchemy.orm import mapped_column
+from sqlalchemy.orm import sessionmaker
+
+
+@pytest.fixture
+def fx_ingest(tmp_path):
+    engine = create_engine(f'sqlite:///{tmp_path / "ingest.db"}')
+    Base = declarative_base()
+
+    class Ingests(Base, ModelMixin):
+        __tablename__ = 'ingests'
+
+        name: Mapped[str] = mapped_column()
+
+    class IngestsDBAL(SqlaDBAL[Ingests]):
+        """DBAL for Ingests."""
+
+    Base.metadata.create_all(engine)
+    inserts = []
+
+    def _collect(conn, cursor, statement, parameters, context, executemany):
+        if statement.startswith('INSERT'):
+            inserts.append(statement)
+
+    event.listen(engine, 'before_cursor_execute', _collect)
+    yield IngestsDBAL, sessionmaker(engine), inserts
+    engine.dispose()
+
+
+def test_write_behind(fx_ingest):
+    dbal, session_factory, inserts = fx_ingest
+
+    with WriteBehindBuffer(dbal, session_factory, batch_size=20, max_delay=0.05) as buffer:
+        with ThreadPoolExecutor(5) as executor:
+            futures = list(executor.map(lambda i: buffer.submit(name=f'name_{i}'), range(50)))
+        ids = [future.result(timeout=5) for future in futures]
+
+    assert len(set(ids)) == 50
+    assert len(inserts) < 50
+
+    objects = dbal(session_factory()).bulk_read(ids)
+    assert [obj.name for obj in objects] == [f'name_{i}' for i in range(50)]
+
+
+def test_write_behind__counter_cache(tmp_path):
+    engine = create_engine(f'sqlite:///{tmp_path / "counted.db"}')
+    Base = declarative_base()
+    counter_cache = CounterCache(Base.metadata)
+
+    class Counted(Base, ModelMixin):
+        __tablename__ = 'counted'
+
+        status: Mapped[str] = mapped_column(default='a')
+
+    class CountedDBAL(SqlaDBAL[Counted]):
+        """DBAL for Counted."""
+
+        _counter_cache = counter_cache
+        _counter_columns = ('status',)
+
+    Base.metadata.create_all(engine)
+    session_factory = sessionmaker(engine)
+
+    with WriteBehindBuffer(CountedDBAL, session_factory, batch_size=5, max_delay=1) as buffer:
+        futures = [buffer.submit(status='a') for _ in range(5)]
+    [future.result(timeout=5) for future in futures]
+
+    with session_factory() as session:
+        dbal = CountedDBAL(session)
+        assert dbal._read_counter('status=a') == 5
+        assert dbal.reconcile_counters() == {}
+    engine.dispose()
+
+
+def test_write_behind__errors(fx_ingest):
+    dbal, session_factory, _ = fx_ingest
+
+    with WriteBehindBuffer(dbal, session_factory, batch_size=3, max_delay=1) as buffer:
+        futures = [buffer.submit(name='ok'), buffer.submit(name=None), buffer.submit(wrong='x')]
+
+    assert dbal(session_factory()).read(futures[0].result()).name == 'ok'
+    with pytest.raises(DBALNotNullConstraintFailedException):
+        futures[1].result()
+    with pytest.raises(DBALUnexpectedValueTypeException):
+        futures[2].result()
+
+
+def test_write_behind__backpressure(fx_ingest):
+    dbal, session_factory, _ = fx_ingest
+    buffer = WriteBehindBuffer(dbal, session_factory, max_pending=1)
+
+    buffer.submit(name='first')
+    with pytest.raises(DBALWriteBehindOverflowException):
+        buffer.submit(timeout=0, name='second')
+
+
+def test_write_behind__close_not_started(fx_ingest):
+    dbal, session_factory, _ = fx_ingest
+    buffer = WriteBehindBuffer(dbal, session_factory, max_pending=1)
+
+    first = buffer.submit(name='first')
+    with ThreadPoolExecutor(1) as executor:
+        blocked = executor.submit(buffer.submit, name='second')
+        sleep(0.05)
+        buffer.close()
+
+    with pytest.raises(DBALCreateException, match='Buffer of write-behind is closed.'):
+        first.result(timeout=1)
+    with pytest.raises(DBALCreateException, match='Buffer of write-behind is closed.'):
+        blocked.result(timeout=1).result(timeout=1)
+    with pytest.raises(DBALCreateException, match='Buffer of write-behind is closed.'):
+        buffer.submit(name='third')
+
+
+def test_write_behind__fail_after_stop(fx_ingest):
+    dbal, session_factory, _ = fx_ingest
+    buffer = WriteBehindBuffer(dbal, session_factory)
+
+    buffer._queue.put(_stop)
+    late = buffer.submit(name='late')
+    buffer.start()
+
+    with pytest.raises(DBALCreateException, match='Buffer of write-behind is closed.'):
+        late.result(timeout=5)
+    buffer.close()
+
+
+def test_write_behind__async(fx_ingest):
+    dbal, session_factory, inserts = fx_ingest
+
+    async def _ingest():
+        async with AsyncWriteBehindBuffer(dbal, session_factory, batch_size=10) as buffer:
+            return await asyncio.gather(*[buffer.create(name=f'name_{i}') for i in range(30)])
+
+    ids = asyncio.run(_ingest())
+
+    assert len(set(ids)) == 30
+    assert len(inserts) == 3
+    assert len(dbal(session_factory()).bulk_read(ids)) == 30
+
+
+def test_write_behind__async_backpressure(fx_ingest):
+    dbal, session_factory, _ = fx_ingest
+    released = Event()
+
+    def _stalled_session_factory():
+        released.wait(5)
+        return session_factory()
+
+    async def _ingest():
+        buffer = AsyncWriteBehindBuffer(
+            dbal, _stalled_session_factory, batch_size=1, max_delay=0, max_pending=1
+        )
+        await buffer.start()
+        first = await buffer.submit(name='first')
+        await asyncio.sleep(0.01)
+        second = await buffer.submit(name='second')
+
+        with pytest.raises(DBALWriteBehindOverflowException):
+            await buffer.submit(timeout=0.01, name='third')
+
+        third = asyncio.create_task(buffer.create(name='third'))
+        await asyncio.sleep(0.01)
+        closing = asyncio.create_task(buffer.close())
+        await asyncio.sleep(0.01)
+        released.set()
+        await closing
+        return [await first, await second, await third]
+
+    ids = asyncio.run(_ingest())
+
+    objects = dbal(session_factory()).bulk_read(ids)
+    assert [obj.name for obj in objects] == ['first', 'second', 'third']
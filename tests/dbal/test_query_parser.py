@@ -0,0 +1,164 @@
+from datetime import datetime
+from datetime import timezone
+from decimal import Decimal
+from uuid import uuid4
+
+import pytest
+from db_first import ModelMixin
+from db_first.dbal.query_parser import QueryStringParser
+from db_first.operators import operators
+from db_first.operators import register_operator
+from marshmallow import ValidationError
+from sqlalchemy import Numeric
+from sqlalchemy.orm import declarative_base
+from sqlalchemy.orm import Mapped
+from sqlalchemy.orm import mapped_column
+
+from tests.conftest import UNIQUE_STRING
+
+
+def test_query_parser__parse(fx_db):
+    _, Parents, _, _ = fx_db
+    parser = QueryStringParser(Parents)
+    ids = [uuid4(), uuid4()]
+
+    order_by, filters = parser.parse(
+        {
+            'in__id': [str(ids[0]), ids[1]],
+            'ge__created_at': '2024-01-02T03:04:05+00:00',
+            'contain__first': 'name',
+            'isnull__second': 'true',
+            'eq__children.first': 'child',
+            'sort__father.first': 'desc',
+        }
+    )
+
+    assert order_by == [{'col': 'father.first', 'opr': 'desc'}]
+    assert filters == [
+        {'col': 'id', 'opr': 'in', 'value': ids},
+        {
+            'col': 'created_at',
+            'opr': 'ge',
+            'value': datetime(2024, 1, 2, 3, 4, 5, tzinfo=timezone.utc),
+        },
+        {'col': 'first', 'opr': 'ilike', 'value': 'name'},
+        {'col': 'second', 'opr': 'isnull', 'value': 'true'},
+        {'col': 'children.first', 'opr': 'eq', 'value': 'child'},
+    ]
+    assert set(parser._specs) == {
+        'in__id',
+        'ge__created_at',
+        'contain__first',
+        'isnull__second',
+        'eq__children.first',
+        'sort__father.first',
+    }
+
+
+@pytest.mark.parametrize(
+    'params, exception, message',
+    [
+        ({'eq__missing': 'x'}, ValidationError, 'Column <missing> not found.'),
+        ({'eq__missing.first': 'x'}, ValidationError, 'Relationship <missing> of'),
+        ({'eq__id': 'not-uuid'}, ValidationError, 'Value of parameter <eq__id> is wrong'),
+        ({'between__created_at': ['2024-01-01']}, ValidationError, 'Value of parameter'),
+        ({'sort__first': 'up'}, ValidationError, 'Direction of sorting <up> not allowed.'),
+        ({'eq__children.parent.father.first': 'x'}, ValidationError, 'is greater than <2>.'),
+        ({'unknown__first': 'x'}, NotImplementedError, 'Expression for parameter'),
+    ],
+)
+def test_query_parser__parse__wrong(fx_db, params, exception, message):
+    _, Parents, _, _ = fx_db
+
+    with pytest.raises(exception, match=message):
+        QueryStringParser(Parents).parse(params)
+
+
+def test_query_parser__parse__decimal():
+    Base = declarative_base()
+
+    class Prices(Base, ModelMixin):
+        __tablename__ = 'parser_prices'
+
+        amount: Mapped[Decimal] = mapped_column(Numeric(10, 2))
+
+    parser = QueryStringParser(Prices)
+
+    assert parser.parse({'ge__amount': '1.50'})[1][0]['value'] == Decimal('1.50')
+    with pytest.raises(ValidationError, match='Value of parameter <ge__amount> is wrong'):
+        parser.parse({'ge__amount': 'abc'})
+
+
+def test_query_parser__parse_joins(fx_db):
+    _, Parents, _, _ = fx_db
+    parser = QueryStringParser(Parents)
+
+    assert parser.parse_joins(['father', 'children.parent:joined']) == [
+        {'table': 'father', 'load': 'selectin'},
+        {'table': 'children.parent', 'load': 'joined'},
+    ]
+
+    with pytest.raises(ValidationError, match='Strategy of loading <lazy> not allowed.'):
+        parser.parse_joins(['father:lazy'])
+
+    with pytest.raises(ValidationError, match='is greater than <2>.'):
+        parser.parse_joins(['children.parent.father'])
+
+
+@pytest.mark.parametrize(
+    'load, message',
+    [
+        (['nope'], 'Relationship <nope> of <nope> not found.'),
+        (['first'], 'Relationship <first> of <first> not found.'),
+        (['children.nope:joined'], 'Relationship <nope> of <children.nope> not found.'),
+    ],
+)
+def test_query_parser__parse_joins__not_relationship(fx_db, fx_parent_dbal, load, message):
+    session_db, Parents, _, _ = fx_db
+
+    with pytest.raises(ValidationError, match=message):
+        QueryStringParser(Parents).parse_joins(load)
+
+    with pytest.raises(ValidationError, match=message):
+        fx_parent_dbal(session_db).paginate(load=load)
+
+
+def test_query_parser__paginate(fx_db, fx_parent_dbal):
+    session_db, _, _, _ = fx_db
+
+    new = fx_parent_dbal(session_db).create(first=next(UNIQUE_STRING))
+
+    result = fx_parent_dbal(session_db).paginate(eq__id=str(new.id), include_metadata=True)
+
+    assert result['items'] == [new]
+    assert fx_parent_dbal._get_query_parser() is fx_parent_dbal._get_query_parser()
+
+
+def test_query_parser__filter_prefixes(fx_db, fx_parent_dbal):
+    session_db, _, _, _ = fx_db
+    first = next(UNIQUE_STRING)
+    new = fx_parent_dbal(session_db).create(first=first)
+
+    class EqualityParentsDBAL(fx_parent_dbal):
+        """DBAL for Parents with filters of equality only."""
+
+        _filter_prefixes = ['eq']
+
+    class StartsWithParentsDBAL(fx_parent_dbal):
+        """DBAL for Parents with custom operator."""
+
+        _filter_prefixes = [*fx_parent_dbal._filter_prefixes, 'startswith']
+
+    assert EqualityParentsDBAL(session_db).paginate(eq__first=first)['items'] == [new]
+    with pytest.raises(NotImplementedError, match='<lt__first> not implemented.'):
+        EqualityParentsDBAL(session_db).paginate(lt__first=first)
+
+    register_operator('startswith', lambda column, value: column.startswith(value))
+    try:
+        with pytest.raises(NotImplementedError, match='<startswith__first> not implemented.'):
+            fx_parent_dbal(session_db).paginate(startswith__first=first)
+
+        result = StartsWithParentsDBAL(session_db).paginate(startswith__first=first)
+        assert result['items'] == [new]
+    finally:
+        operators.unregister('startswith')
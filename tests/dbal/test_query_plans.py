@@ -0,0 +1,95 @@
+import json
+
+import pytest
+from db_first import ModelMixin
+from db_first.dbal import SqlaDBAL
+from db_first.dbal.exceptions import DBALPlanRegressionException
+from db_first.dbal.query_plans import access_paths
+from db_first.dbal.query_plans import page_shapes
+from db_first.dbal.query_plans import PlanSnapshots
+from sqlalchemy import create_engine
+from sqlalchemy import Index
+from sqlalchemy.orm import declarative_base
+from sqlalchemy.orm import Mapped
+from sqlalchemy.orm import mapped_column
+from sqlalchemy.orm import Session
+
+
+@pytest.fixture
+def fx_orders(tmp_path):
+    engine = create_engine(f'sqlite:///{tmp_path / "orders.db"}')
+    Base = declarative_base()
+
+    class Orders(Base, ModelMixin):
+        __tablename__ = 'orders'
+        __table_args__ = (Index('ix_orders_status_amount', 'status', 'amount'),)
+
+        status: Mapped[str] = mapped_column()
+        amount: Mapped[int] = mapped_column()
+
+    class OrdersDBAL(SqlaDBAL[Orders]):
+        """DBAL for Orders."""
+
+    Base.metadata.create_all(engine)
+    with Session(engine) as session:
+        OrdersDBAL(session).bulk_create(
+            [{'status': f'status-{n % 5}', 'amount': n} for n in range(100)]
+        )
+        session.commit()
+        yield OrdersDBAL(session), Orders
+    engine.dispose()
+
+
+def test_page_shapes(fx_orders):
+    dbal, _ = fx_orders
+    shapes = page_shapes(dbal)
+
+    assert shapes['eq__status'] == {'eq__status': 'status-0'}
+    assert shapes['ge__amount'] == {'ge__amount': 0}
+    assert shapes['sort__amount=desc'] == {'sort__amount': 'desc'}
+    assert shapes['eq__status&sort__amount=desc'] == {
+        'eq__status': 'status-0',
+        'sort__amount': 'desc',
+    }
+    assert 'ge__status' not in shapes
+    assert 'eq__updated_at' not in shapes
+
+
+def test_plan_snapshots(fx_orders, tmp_path):
+    dbal, model = fx_orders
+    path = tmp_path / 'plans.json'
+    snapshots = PlanSnapshots(path)
+
+    report = snapshots.check(dbal)
+
+    assert 'eq__status' in report['new']
+    assert report['changed'] == report['regressed'] == []
+    stored = json.loads(path.read_text())['orders:sqlite']
+    assert stored['eq__status']['access'] == {'orders': 'index'}
+    assert stored['eq__status']['plan'] == [
+        'SEARCH orders USING INDEX ix_orders_status_amount (status=?)'
+    ]
+
+    assert snapshots.check(dbal) == {'new': [], 'changed': [], 'regressed': []}
+
+    model.__table__.indexes.pop().drop(dbal._session.connection())
+    dbal._session.commit()
+    dbal._session.get_bind().dispose()
+
+    with pytest.raises(DBALPlanRegressionException, match='eq__status'):
+        snapshots.check(dbal)
+
+    report = snapshots.check(dbal, update=True)
+
+    assert 'eq__status' in report['regressed']
+    assert snapshots.check(dbal)['regressed'] == []
+
+
+def test_access_paths():
+    assert access_paths(['SCAN orders', 'USE TEMP B-TREE FOR ORDER BY']) == {'orders': 'full'}
+    assert access_paths(['SCAN orders USING COVERING INDEX ix']) == {'orders': 'index'}
+    assert access_paths(['Limit', '  Seq Scan on orders']) == {'orders': 'full'}
+    assert access_paths(['Limit', '  Index Scan on orders using ix']) == {'orders': 'index'}
+    assert access_paths(['Bitmap Heap Scan on orders', '  Bitmap Index Scan using ix']) == {
+        'orders': 'index'
+    }
@@ -0,0 +1,59 @@
+import json
+import subprocess
+import sys
+
+import pytest
+
+
+def _run(code: str) -> dict[str, list[str]]:
+    script = (
+        'import json, sys\n'
+        'before = set(sys.modules)\n'
+        f'{code}\n'
+        'new = set(sys.modules) - before\n'
+        'print(json.dumps({"modules": sorted(sys.modules), "new": sorted(new)}))'
+    )
+    result = subprocess.run(
+        [sys.executable, '-c', script], capture_output=True, text=True, check=True
+    )
+    return json.loads(result.stdout)
+
+
+@pytest.mark.parametrize(
+    'code, not_imported',
+    [
+        ('import db_first', ['sqlalchemy', 'marshmallow', 'db_first.dbal']),
+        ('from db_first import ModelMixin', ['marshmallow', 'db_first.dbal']),
+        ('import db_first.dbal', ['sqlalchemy', 'db_first.dbal.sqla']),
+        ('import db_first.schemas', ['db_first.dbal']),
+    ],
+)
+def test_imports__lazy(code, not_imported):
+    result = _run(code)
+
+    assert not set(not_imported) & set(result['modules'])
+
+
+def test_imports__only_standard_library():
+    result = _run('import db_first')
+
+    packages = {name.partition('.')[0] for name in result['new']} - sys.stdlib_module_names
+    assert packages == {'db_first'}
+    assert {name for name in result['new'] if name.startswith('db_first')} == {
+        'db_first',
+        'db_first._lazy',
+    }
+
+
+def test_imports__public_names():
+    import db_first
+    import db_first.dbal
+    from db_first.dbal.sqla import SqlaDBAL
+
+    assert db_first.SqlaDBAL is SqlaDBAL
+    assert db_first.dbal.SqlaDBAL is SqlaDBAL
+    assert set(db_first.__all__) <= set(dir(db_first))
+    assert set(db_first.dbal.__all__) <= set(dir(db_first.dbal))
+
+    with pytest.raises(AttributeError):
+        db_first.missing
@@ -0,0 +1,182 @@
+from datetime import datetime
+
+import pytest
+from db_first import ModelMixin
+from db_first import SoftDeleteMixin
+from db_first.index_advisor import IndexAdvisor
+from db_first.index_advisor import QueryShape
+from db_first.index_advisor import ShapeRecorder
+from sqlalchemy import Index
+from sqlalchemy import text
+from sqlalchemy.orm import declarative_base
+from sqlalchemy.orm import Mapped
+from sqlalchemy.orm import mapped_column
+
+Base = declarative_base()
+
+
+class Invoices(Base, ModelMixin):
+    __tablename__ = 'advisor_invoices'
+    __table_args__ = (Index('ix_advisor_invoices_status', 'status'),)
+
+    status: Mapped[str] = mapped_column()
+    owner: Mapped[str] = mapped_column()
+    amount: Mapped[int] = mapped_column()
+    paid_at: Mapped[datetime | None] = mapped_column()
+
+
+class Notes(Base, ModelMixin, SoftDeleteMixin):
+    __tablename__ = 'advisor_notes'
+
+    owner: Mapped[str] = mapped_column()
+
+
+class Shipments(Base, ModelMixin, SoftDeleteMixin):
+    __tablename__ = 'advisor_international_shipments'
+
+    destination_country_code: Mapped[str] = mapped_column()
+    expected_delivery_date: Mapped[datetime] = mapped_column()
+
+
+@pytest.fixture
+def fx_recorder():
+    return ShapeRecorder()
+
+
+def _make(recorder, model, *filters, order_by=None, times=1):
+    where = {'and': [{'col': c, 'opr': o, 'value': v} for c, o, v in filters]} if filters else None
+    for _ in range(times):
+        shape = recorder.record(model, where, order_by)
+    return shape
+
+
+def test_shape_recorder(fx_recorder):
+    shape = _make(
+        fx_recorder,
+        Invoices,
+        ('status', 'eq', 'new'),
+        ('paid_at', 'isnull', False),
+        order_by=[{'col': 'amount', 'opr': 'desc'}],
+        times=2,
+    )
+    _make(
+        fx_recorder,
+        Invoices,
+        ('paid_at', 'isnull', 'false'),
+        ('status', 'eq', 'paid'),
+        order_by=[{'col': 'amount', 'opr': 'desc'}],
+    )
+
+    assert shape == QueryShape(
+        'advisor_invoices', (('paid_at', 'notnull'), ('status', 'eq')), (('amount', 'desc'),)
+    )
+    fx_recorder.observe(shape, 0.5)
+
+    assert fx_recorder.shapes() == {
+        shape: {
+            'count': 3,
+            'timed': 1,
+            'latency_avg': 0.5,
+            'latency_max': 0.5,
+            'latency_total': 1.5,
+        }
+    }
+    assert fx_recorder.stats() == {'shapes': 1, 'dropped': 0}
+
+
+def test_shape_recorder__max_shapes():
+    recorder = ShapeRecorder(max_shapes=1)
+
+    _make(recorder, Invoices, ('status', 'eq', 'new'))
+    _make(recorder, Invoices, ('owner', 'eq', 'alice'))
+
+    assert recorder.stats() == {'shapes': 1, 'dropped': 1}
+
+
+def test_index_advisor(fx_recorder):
+    sorted_shape = _make(
+        fx_recorder,
+        Invoices,
+        ('status', 'eq', 'new'),
+        order_by=[{'col': 'created_at', 'opr': 'desc'}],
+        times=5,
+    )
+    _make(fx_recorder, Invoices, ('status', 'eq', 'new'), times=20)
+    range_shape = _make(fx_recorder, Invoices, ('owner', 'eq', 'a'), ('amount', 'ge', 10), times=2)
+    _make(fx_recorder, Invoices, ('owner', 'eq', 'a'), times=300)
+    _make(
+        fx_recorder,
+        Invoices,
+        ('paid_at', 'isnull', True),
+        ('owner', 'in', ['a']),
+        ('amount', 'lt', 5),
+    )
+    _make(fx_recorder, Invoices, ('id', 'eq', 'a'), times=10)
+    _make(fx_recorder, Invoices, times=10)
+    fx_recorder.observe(sorted_shape, 0.2)
+    fx_recorder.observe(range_shape, 0.01)
+
+    recommendations = IndexAdvisor(fx_recorder).advise(Invoices)
+
+    assert [(r.columns, r.where, r.count) for r in recommendations] == [
+        (('owner', 'amount'), None, 302),
+        (('status', 'created_at'), None, 5),
+        (('owner', 'amount'), 'paid_at IS NULL', 1),
+    ]
+    assert recommendations[0].benefit == pytest.approx(0.02 + 300 * 0.105)
+    assert recommendations[1].benefit == pytest.approx(1.0)
+    assert recommendations[2].benefit == pytest.approx(0.105)
+    assert recommendations[1].definition == (
+        "Index('ix_advisor_invoices_status_created_at', 'status', 'created_at')"
+    )
+    assert recommendations[2].definition == (
+        "Index('ix_advisor_invoices_owner_amount_paid_at_null', 'owner', 'amount',"
+        " postgresql_where=text('paid_at IS NULL'), sqlite_where=text('paid_at IS NULL'))"
+    )
+    assert recommendations[2].index.dialect_options['sqlite']['where'].text == 'paid_at IS NULL'
+    assert recommendations[1].index.table is None
+
+    assert len(IndexAdvisor(fx_recorder).advise(Invoices, min_count=4, limit=1)) == 1
+
+
+def test_index_advisor__soft_delete(fx_recorder):
+    _make(fx_recorder, Notes, ('owner', 'eq', 'a'), order_by=[{'col': 'created_at', 'opr': 'asc'}])
+
+    (recommendation,) = IndexAdvisor(fx_recorder).advise(Notes)
+
+    assert recommendation.columns == ('owner', 'created_at')
+    assert recommendation.benefit == 1
+    assert recommendation.where == 'deleted_at IS NULL'
+    assert str(recommendation.index.dialect_options['postgresql']['where']) == str(
+        text('deleted_at IS NULL')
+    )
+
+
+def test_index_advisor__long_name(fx_recorder):
+    _make(
+        fx_recorder,
+        Shipments,
+        ('destination_country_code', 'eq', 'PL'),
+        ('expected_delivery_date', 'ge', '2024-01-01'),
+    )
+
+    (recommendation,) = IndexAdvisor(fx_recorder).advise(Shipments)
+
+    name = recommendation.index.name
+    assert len(name) == 63
+    assert name.startswith('ix_advisor_international_shipments_destination_country_')
+    assert recommendation.definition.startswith(f'Index({name!r}, ')
+    assert IndexAdvisor(fx_recorder).advise(Shipments)[0].index.name == name
+
+
+def test_index_advisor__paginate_latency(fx_recorder, fx_db, fx_parent_dbal, monkeypatch):
+    session_db, _, _, _ = fx_db
+    monkeypatch.setattr(fx_parent_dbal, '_shape_recorder', fx_recorder)
+
+    fx_parent_dbal(session_db).paginate(eq__first='first', sort__second='asc')
+    fx_parent_dbal(session_db).query_string_to_sql_json(page=1, per_page=20, eq__second='x')
+
+    ((shape, stats),) = fx_recorder.shapes('parents').items()
+    assert shape.filters == (('first', 'eq'),)
+    assert stats['count'] == 1
+    assert stats['latency_avg'] > 0
@@ -1,6 +1,13 @@
 from datetime import datetime
+from datetime import timedelta
+from datetime import timezone
+from uuid import RFC_4122
+from uuid import uuid4
 
 import pytest
+from db_first.base_model import make_uuid7
+from db_first.base_model import uuid7_from_datetime
+from db_first.base_model import uuid7_to_datetime
 
 
 @pytest.mark.parametrize('date_time', ['', None, 'not_date_time', datetime.now()])
@@ -13,3 +20,44 @@ def test_model_mixin__validate_timezone(fx_db, date_time):
     assert e.value.args[0] == (
         'Field <created_at> must be datetime with UTC timezone, but received timezone: <None>'
     )
+
+
+def test_model_mixin__make_uuid7():
+    ids = [make_uuid7() for _ in range(10_000)]
+
+    assert ids == sorted(ids)
+    assert len(set(ids)) == len(ids)
+    assert all(value.version == 7 and value.variant == RFC_4122 for value in ids)
+
+
+def test_model_mixin__uuid7_datetime():
+    now = datetime.now(timezone.utc)
+    value = make_uuid7()
+
+    assert abs(uuid7_to_datetime(value) - now) < timedelta(seconds=1)
+    assert uuid7_from_datetime(now - timedelta(seconds=1)) < value
+    assert uuid7_from_datetime(now + timedelta(seconds=1)) > value
+    assert uuid7_to_datetime(uuid7_from_datetime(now)) == now.replace(
+        microsecond=now.microsecond // 1000 * 1000
+    )
+
+    with pytest.raises(ValueError, match=r'.* must be version 7.'):
+        uuid7_to_datetime(uuid4())
+
+
+def test_model_mixin__id_generator(fx_events_db, fx_event_dbal):
+    session, Events = fx_events_db
+
+    started_at = datetime.now(timezone.utc)
+    events = [fx_event_dbal(session).create(name=f'event_{number}') for number in range(5)]
+
+    assert all(event.id.version == 7 for event in events)
+
+    since = uuid7_from_datetime(started_at - timedelta(milliseconds=1))
+    assert fx_event_dbal(session).paginate(ge__id=since)['items'] == events
+
+    first_page = fx_event_dbal(session).paginate(per_page=2, sort__id='asc', ge__id=since)
+    second_page = fx_event_dbal(session).paginate(
+        per_page=2, sort__id='asc', gt__id=first_page['items'][-1].id
+    )
+    assert first_page['items'] + second_page['items'] == events[:4]
@@ -4,8 +4,11 @@ from uuid import UUID
 
 import pytest
 from db_first.dbal.exceptions import DBALPaginateException
+from marshmallow import ValidationError
+from sqlalchemy import event
 
 from tests.conftest import UNIQUE_STRING
+from tests.contrib.schemas import ParentPaginationSchema
 
 
 def test_pagination__pagination(fx_parent__create, fx_parent__paginate):
@@ -209,3 +212,126 @@ def test_pagination__pagination__nullable(fx_parent__create, fx_parent__paginate
     data = {'page': 0, 'per_page': 0, 'include_metadata': 'enable'}
     with pytest.raises(DBALPaginateException):
         fx_parent__paginate(data)
+
+
+def test_pagination__custom_operator(fx_parent__create, fx_parent__paginate):
+    item_1 = fx_parent__create({'first': next(UNIQUE_STRING), 'second': 'second'})
+    item_2 = fx_parent__create({'first': next(UNIQUE_STRING)})
+
+    data = {'ids': [item_1.id, item_2.id], 'isnull__second': 'true'}
+    items = fx_parent__paginate(data)
+
+    assert [item['id'] for item in items['items']] == [str(item_2.id)]
+
+
+def test_pagination__filtrating_by_relationship(fx_parents__non_deletion, fx_parent__paginate):
+    parent_1 = fx_parents__non_deletion()
+    parent_2 = fx_parents__non_deletion()
+
+    data = {'ids': [parent_1.id, parent_2.id], 'eq__father.first': parent_2.father.first}
+    items = fx_parent__paginate(data)
+
+    assert [item['id'] for item in items['items']] == [str(parent_2.id)]
+
+    data = {'ids': [parent_1.id, parent_2.id], 'eq__children.first': parent_1.children[0].first}
+    items = fx_parent__paginate(data)
+
+    assert [item['id'] for item in items['items']] == [str(parent_1.id)]
+
+
+def test_pagination__sorting_by_relationship(fx_parents__non_deletion, fx_parent__paginate):
+    parents = [fx_parents__non_deletion() for _ in range(3)]
+    ids = [parent.id for parent in parents]
+
+    data = {'ids': ids, 'sort__father.first': 'desc', 'include_metadata': 'enable'}
+    items = fx_parent__paginate(data)
+
+    expected = sorted(parents, key=lambda parent: parent.father.first, reverse=True)
+    assert [item['id'] for item in items['items']] == [str(parent.id) for parent in expected]
+    assert items['_metadata']['pagination']['total'] == 3
+
+
+@pytest.mark.parametrize(
+    ('load', 'count'),
+    [
+        (['father', 'children'], 3),
+        (['father:joined', 'children.parent'], 3),
+        (['father', 'children:joined'], 2),
+    ],
+)
+def test_pagination__eager_loading(fx_db, fx_parent_dbal, fx_parents__non_deletion, load, count):
+    session_db, _, _, _ = fx_db
+    ids = [fx_parents__non_deletion().id for _ in range(5)]
+    session_db.expire_all()
+
+    statements = []
+
+    def _count(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    event.listen(session_db.get_bind(), 'before_cursor_execute', _count)
+    try:
+        result = fx_parent_dbal(session_db).paginate(ids=ids, load=load)
+        items = ParentPaginationSchema().dump(result)['items']
+    finally:
+        event.remove(session_db.get_bind(), 'before_cursor_execute', _count)
+
+    assert len(items) == 5
+    assert all(item['father'] and item['children'] for item in items)
+    assert len(statements) == count
+
+
+def test_pagination__join_depth(fx_db, fx_parent_dbal):
+    session_db, _, _, _ = fx_db
+
+    with pytest.raises(ValidationError, match=r'.* is greater than <2>.'):
+        fx_parent_dbal(session_db).paginate(**{'eq__children.parent.father.first': 'first'})
+
+    with pytest.raises(ValidationError, match=r'.* is greater than <2>.'):
+        fx_parent_dbal(session_db).paginate(load=['children.parent.father'])
+
+
+def test_pagination__aggregate(fx_events_db, fx_event_dbal):
+    session_db, _ = fx_events_db
+    dbal = fx_event_dbal(session_db)
+
+    names = [next(UNIQUE_STRING), next(UNIQUE_STRING)]
+    events = [dbal.create(name=names[0]) for _ in range(3)] + [dbal.create(name=names[1])]
+    dbal.update(events[0].id, version=1)
+    ids = [event.id for event in events]
+
+    result = dbal.aggregate(
+        select=['count__id', 'max__version'], group_by=['name'], ids=ids, sort__count__id='desc'
+    )
+    assert result == [
+        {'name': names[0], 'count__id': 3, 'max__version': 2},
+        {'name': names[1], 'count__id': 1, 'max__version': 1},
+    ]
+
+    result = dbal.aggregate(
+        select=['count__id'], group_by=['name'], ids=ids, having__gt__count__id=1
+    )
+    assert result == [{'name': names[0], 'count__id': 3}]
+
+    result = dbal.aggregate(select=['count_distinct__name', 'sum__version'], ids=ids)
+    assert result == [{'count_distinct__name': 2, 'sum__version': 5}]
+
+    with pytest.raises(DBALPaginateException):
+        dbal.aggregate(ids=ids)
+
+
+def test_pagination__aggregate__many_groups(fx_events_db, fx_event_dbal):
+    session_db, _ = fx_events_db
+    dbal = fx_event_dbal(session_db)
+
+    prefix = next(UNIQUE_STRING)
+    dbal.bulk_create([{'name': f'{prefix}-{number}'} for number in range(1001)])
+    session_db.commit()
+
+    result = dbal.aggregate(select=['count__id'], group_by=['name'], contain__name=prefix)
+    assert len(result) == 1001
+
+    result = dbal.aggregate(
+        group_by=['name'], contain__name=prefix, sort__name='asc', limit=2, offset=1
+    )
+    assert result == [{'name': f'{prefix}-1'}, {'name': f'{prefix}-10'}]
@@ -1,5 +1,12 @@
+from uuid import uuid4
+
+import pytest
+from db_first.operators import operators
+from db_first.operators import register_operator
 from db_first.statement_maker import StatementMaker
+from marshmallow import ValidationError
 from sqlalchemy import select
+from sqlalchemy.dialects import postgresql
 
 from tests.conftest import UNIQUE_STRING
 
@@ -199,3 +206,160 @@ def test_statement_maker__sort(fx_db, fx_make_stmt):
     )
 
     assert compiled_stmt in compiled_control_stmt
+
+
+def test_statement_maker__filter__between(fx_db, fx_make_stmt, fx_parents__non_deletion):
+    _, Parents, _, _ = fx_db
+
+    parent_1 = fx_parents__non_deletion()
+
+    statement_maker = fx_make_stmt(
+        Parents,
+        where={
+            'and': [
+                {
+                    'col': 'created_at',
+                    'opr': 'between',
+                    'value': [parent_1.created_at, parent_1.created_at],
+                }
+            ]
+        },
+    )
+    compiled_stmt = statement_maker.compile().string
+
+    compiled_control_stmt = (
+        select(Parents)
+        .where(Parents.created_at.between(parent_1.created_at, parent_1.created_at))
+        .limit(0)
+        .offset(1)
+        .compile()
+        .string
+    )
+
+    assert compiled_stmt in compiled_control_stmt
+
+
+@pytest.mark.parametrize(
+    ('value', 'expr'), [(True, 'parents.second IS NULL'), ('false', 'parents.second IS NOT NULL')]
+)
+def test_statement_maker__filter__isnull(fx_db, fx_make_stmt, value, expr):
+    _, Parents, _, _ = fx_db
+
+    statement_maker = fx_make_stmt(
+        Parents, where={'and': [{'col': 'second', 'opr': 'isnull', 'value': value}]}
+    )
+
+    assert expr in statement_maker.compile().string
+
+
+@pytest.mark.parametrize(
+    ('opr', 'value'), [('unknown', 1), ('in', 1), ('between', [1]), ('isnull', 'maybe')]
+)
+def test_statement_maker__filter__wrong(fx_db, opr, value):
+    _, Parents, _, _ = fx_db
+
+    with pytest.raises(ValidationError):
+        StatementMaker(Parents, where={'and': [{'col': 'first', 'opr': opr, 'value': value}]})
+
+
+def test_statement_maker__custom_operator(fx_db, fx_make_stmt, fx_parents__non_deletion):
+    _, Parents, _, _ = fx_db
+
+    parent_1 = fx_parents__non_deletion()
+
+    register_operator('startswith', lambda column, value: column.startswith(value))
+    try:
+        statement_maker = fx_make_stmt(
+            Parents,
+            where={'and': [{'col': 'first', 'opr': 'startswith', 'value': parent_1.first}]},
+        )
+    finally:
+        operators.unregister('startswith')
+
+    compiled_control_stmt = (
+        select(Parents)
+        .where(Parents.first.startswith(parent_1.first))
+        .limit(0)
+        .offset(1)
+        .compile()
+        .string
+    )
+
+    assert statement_maker.compile().string in compiled_control_stmt
+    assert 'startswith' not in operators
+
+
+def test_statement_maker__filter_in__postgresql(fx_db, fx_make_stmt):
+    _, Parents, _, _ = fx_db
+
+    ids = [uuid4(), uuid4()]
+    stmt = fx_make_stmt(Parents, where={'and': [{'col': 'id', 'opr': 'in', 'value': ids}]})
+    compiled_stmt = stmt.compile(dialect=postgresql.dialect())
+
+    assert 'parents.id = ANY (%(id_1)s::UUID[])' in compiled_stmt.string
+    assert compiled_stmt.params['id_1'] == ids
+
+
+def test_statement_maker__aggregate(fx_db):
+    _, Parents, _, _ = fx_db
+
+    stmt = StatementMaker(
+        Parents,
+        select=[{'func': 'count', 'col': 'id'}, {'func': 'count_distinct', 'col': 'second'}],
+        group_by=['first'],
+        having={'and': [{'col': 'count__id', 'opr': 'gt', 'value': 1}]},
+        order_by=[{'col': 'count__id', 'opr': 'desc'}],
+    ).make_stmt()
+
+    compiled_stmt = stmt.compile().string
+    assert 'count(parents.id) AS count__id' in compiled_stmt
+    assert 'count(DISTINCT parents.second) AS count_distinct__second' in compiled_stmt
+    assert 'GROUP BY parents.first' in compiled_stmt
+    assert 'HAVING count(parents.id) >' in compiled_stmt
+    assert 'ORDER BY count(parents.id) DESC' in compiled_stmt
+
+
+@pytest.mark.parametrize(
+    'select_, having',
+    [
+        ([{'func': 'median', 'col': 'id'}], None),
+        (
+            [{'func': 'count', 'col': 'id'}],
+            {'and': [{'col': 'count__id', 'opr': 'xx', 'value': 1}]},
+        ),
+    ],
+)
+def test_statement_maker__aggregate__wrong(fx_db, select_, having):
+    _, Parents, _, _ = fx_db
+
+    with pytest.raises(ValidationError):
+        StatementMaker(Parents, select=select_, having=having)
+
+
+def test_statement_maker__aggregate__having_not_selected(fx_db):
+    _, Parents, _, _ = fx_db
+
+    with pytest.raises(NotImplementedError, match='Aggregate <sum__id> is not selected.'):
+        StatementMaker(
+            Parents,
+            select=[{'func': 'count', 'col': 'id'}],
+            having={'and': [{'col': 'sum__id', 'opr': 'gt', 'value': 1}]},
+        ).make_stmt()
+
+
+@pytest.mark.parametrize('table', ['nope', 'first', 'children.nope'])
+def test_statement_maker__join__not_relationship(fx_db, table):
+    _, Parents, _, _ = fx_db
+
+    with pytest.raises(ValidationError, match=f'of <{table}> not found.'):
+        StatementMaker(Parents, join=[{'table': table}])
+
+
+def test_statement_maker__without_validation(fx_db):
+    _, Parents, _, _ = fx_db
+    where = {'and': [{'col': 'first', 'opr': 'eq', 'value': 'x'}]}
+
+    with pytest.raises(ValidationError):
+        StatementMaker(Parents, where=where, limit=-1)
+
+    assert StatementMaker(Parents, where=where, limit=-1, validate=False).make_stmt() is not None